@@ -0,0 +1,161 @@
+"""
+Latency of token authorization while large locations are received.
+
+Writers send `PUT` of locations with many EVSEs while clients authorize
+tokens. Latency percentiles of the authorization requests are compared
+with bodies validated on the event loop, in a thread and in processes.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_body_validation.py [seconds] [evses]
+"""
+import asyncio
+import copy
+import logging
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.authentication.authenticator import Authenticator
+from py_ocpi.core.config import logger, settings
+from py_ocpi.core.crud import Crud
+from py_ocpi.core.validation import validation_pool
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from py_ocpi.modules.tokens.v_2_2_1.enums import AllowedType
+from py_ocpi.modules.tokens.v_2_2_1.schemas import AuthorizationInfo, Token
+
+from tests.test_modules.test_v_2_2_1.test_tokens.utils import TOKENS
+from tests.test_push import LOCATIONS
+
+HEADERS = {"Authorization": "Token dG9rZW4="}
+WRITERS = 2
+CLIENTS = 10
+
+
+class BenchAuthenticator(Authenticator):
+    @classmethod
+    async def get_valid_token_c(cls):
+        return ["token"]
+
+    @classmethod
+    async def get_valid_token_a(cls):
+        return []
+
+
+class MemoryCrud(Crud):
+    storage: dict = {}
+
+    @classmethod
+    async def get(cls, module, role, id, *args, **kwargs):
+        if module == enums.ModuleID.tokens:
+            return TOKENS[0]
+        return cls.storage.get(id)
+
+    @classmethod
+    async def create(cls, module, role, data, *args, **kwargs):
+        cls.storage[data["id"]] = data
+        return data
+
+    @classmethod
+    async def update(cls, module, role, data, id, *args, **kwargs):
+        cls.storage[id] = data
+        return data
+
+    @classmethod
+    async def do(cls, module, role, action, *args, data=None, **kwargs):
+        return AuthorizationInfo(
+            allowed=AllowedType.allowed, token=Token(**TOKENS[0])
+        ).dict()
+
+
+def get_location(evses: int) -> dict:
+    location = copy.deepcopy(LOCATIONS[0])
+    evse = location["evses"][0]
+    location["evses"] = []
+    for i in range(evses):
+        evse = copy.deepcopy(evse)
+        evse["uid"] = f"EVSE{i}"
+        location["evses"].append(evse)
+    return location
+
+
+def build_app(offload_validation: bool) -> FastAPI:
+    return get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.emsp],
+        crud=MemoryCrud,
+        authenticator=BenchAuthenticator,
+        modules=[enums.ModuleID.locations, enums.ModuleID.tokens],
+        fast_json_response=True,
+        offload_validation=offload_validation,
+    )
+
+
+async def measure(app: FastAPI, location: dict, duration: float) -> tuple:
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    latencies = []
+    writes = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+
+        async def write():
+            nonlocal writes
+            while time.perf_counter() < deadline:
+                response = await client.put(
+                    "/ocpi/emsp/2.2.1/locations/us/AAA/LOC1",
+                    json=location,
+                    headers=HEADERS,
+                )
+                assert response.status_code == 200
+                writes += 1
+
+        async def authorize():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/ocpi/emsp/2.2.1/tokens/TOKEN/authorize",
+                    headers=HEADERS,
+                )
+                assert response.status_code == 200
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+
+        await asyncio.gather(
+            *(write() for _ in range(WRITERS)),
+            *(authorize() for _ in range(CLIENTS)),
+        )
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return quantiles[49] * 1000, quantiles[98] * 1000, writes / duration
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    evses = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    logger.setLevel(logging.WARNING)
+    location = get_location(evses)
+    settings.VALIDATION_OFFLOAD_MIN_SIZE = 65536
+    modes = [
+        ("event loop", False, 0),
+        ("thread", True, 0),
+        ("processes", True, 2),
+    ]
+    print(f"{'validation':>12} {'p50, ms':>9} {'p99, ms':>9} {'writes/s':>9}")
+    for name, offload_validation, processes in modes:
+        settings.VALIDATION_PROCESSES = processes
+        app = build_app(offload_validation)
+        p50, p99, writes = asyncio.run(measure(app, location, duration))
+        validation_pool.shutdown()
+        print(f"{name:>12} {p50:>9.1f} {p99:>9.1f} {writes:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Time to import locations one by one and with the bulk import endpoint.
+
+Locations are stored in memory, so only request handling, validation and
+the amount of crud calls are compared.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_bulk_import.py [locations]
+"""
+import asyncio
+import copy
+import json
+import logging
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.authentication.authenticator import Authenticator
+from py_ocpi.core.config import logger
+from py_ocpi.core.crud import Crud
+from py_ocpi.core.validation import validation_pool
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_push import LOCATIONS
+
+HEADERS = {"Authorization": "Token dG9rZW4="}
+
+
+class BenchAuthenticator(Authenticator):
+    @classmethod
+    async def get_valid_token_c(cls):
+        return ["token"]
+
+    @classmethod
+    async def get_valid_token_a(cls):
+        return []
+
+
+class MemoryCrud(Crud):
+    storage: dict = {}
+
+    @classmethod
+    async def get(cls, module, role, id, *args, **kwargs):
+        return cls.storage.get(id)
+
+    @classmethod
+    async def list(cls, module, role, filters, *args, **kwargs):
+        return list(cls.storage.values()), len(cls.storage), True
+
+    @classmethod
+    async def create(cls, module, role, data, *args, **kwargs):
+        cls.storage[data["id"]] = data
+        return data
+
+    @classmethod
+    async def update(cls, module, role, data, id, *args, **kwargs):
+        cls.storage[id] = data
+        return data
+
+    @classmethod
+    async def delete(cls, module, role, id, *args, **kwargs):
+        cls.storage.pop(id, None)
+
+    @classmethod
+    async def do(cls, module, role, action, *args, data=None, **kwargs):
+        pass
+
+    @classmethod
+    async def bulk_upsert(cls, module, role, data, *args, **kwargs):
+        cls.storage.update((location["id"], location) for location in data)
+        return {}
+
+
+def get_locations(amount: int) -> list:
+    locations = []
+    for i in range(amount):
+        location = copy.deepcopy(LOCATIONS[0])
+        location["id"] = f"LOC{i}"
+        locations.append(location)
+    return locations
+
+
+def build_app() -> FastAPI:
+    return get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.emsp],
+        crud=MemoryCrud,
+        authenticator=BenchAuthenticator,
+        modules=[enums.ModuleID.locations],
+        bulk_import=True,
+    )
+
+
+async def put_locations(client: httpx.AsyncClient, locations: list) -> None:
+    for location in locations:
+        await client.put(
+            f"/ocpi/emsp/2.2.1/locations/us/AAA/{location['id']}",
+            json=location,
+            headers=HEADERS,
+        )
+
+
+async def import_locations(client: httpx.AsyncClient, locations: list) -> None:
+    body = "\n".join(json.dumps(location) for location in locations)
+    response = await client.post(
+        "/import/2.2.1/locations",
+        content=body,
+        headers={**HEADERS, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.json()["imported"] == len(locations)
+
+
+async def measure(run, locations: list) -> float:
+    MemoryCrud.storage = {}
+    transport = httpx.ASGITransport(app=build_app())  # type: ignore
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        start = time.perf_counter()
+        await run(client, locations)
+        elapsed = time.perf_counter() - start
+    assert len(MemoryCrud.storage) == len(locations)
+    return elapsed
+
+
+def main():
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    logger.setLevel(logging.WARNING)
+    locations = get_locations(amount)
+    one_by_one = asyncio.run(measure(put_locations, locations))
+    bulk = asyncio.run(measure(import_locations, locations))
+    validation_pool.shutdown()
+    print(f"PUT per location: {one_by_one:8.2f} s")
+    print(f"Bulk import:      {bulk:8.2f} s")
+    print(f"Speedup:          {one_by_one / bulk:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Time and bytes to poll an unchanged page of locations.
+
+A partner requests the same page again and again, with and without
+sending back ETag of the previous response.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_conditional_get.py [requests] [page]
+"""
+import asyncio
+import copy
+import logging
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.authentication.authenticator import Authenticator
+from py_ocpi.core.config import logger
+from py_ocpi.core.crud import Crud
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_push import LOCATIONS
+
+HEADERS = {"Authorization": "Token dG9rZW4="}
+
+
+class BenchAuthenticator(Authenticator):
+    @classmethod
+    async def get_valid_token_c(cls):
+        return ["token"]
+
+    @classmethod
+    async def get_valid_token_a(cls):
+        return []
+
+
+class MemoryCrud(Crud):
+    storage: list = []
+
+    @classmethod
+    async def get(cls, module, role, id, *args, **kwargs):
+        pass
+
+    @classmethod
+    async def list(cls, module, role, filters, *args, **kwargs):
+        return cls.storage, len(cls.storage), True
+
+    @classmethod
+    async def create(cls, module, role, data, *args, **kwargs):
+        pass
+
+    @classmethod
+    async def update(cls, module, role, data, id, *args, **kwargs):
+        pass
+
+    @classmethod
+    async def delete(cls, module, role, id, *args, **kwargs):
+        pass
+
+    @classmethod
+    async def do(cls, module, role, action, *args, data=None, **kwargs):
+        pass
+
+
+def get_locations(amount: int) -> list:
+    locations = []
+    for i in range(amount):
+        location = copy.deepcopy(LOCATIONS[0])
+        location["id"] = f"LOC{i}"
+        locations.append(location)
+    return locations
+
+
+def build_app(conditional_get: bool) -> FastAPI:
+    return get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=MemoryCrud,
+        authenticator=BenchAuthenticator,
+        modules=[enums.ModuleID.locations],
+        fast_json_response=True,
+        conditional_get=conditional_get,
+    )
+
+
+async def poll(conditional_get: bool, amount: int) -> tuple:
+    transport = httpx.ASGITransport(
+        app=build_app(conditional_get)
+    )  # type: ignore
+    headers = dict(HEADERS)
+    received = 0
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        start = time.perf_counter()
+        for _ in range(amount):
+            response = await client.get(
+                "/ocpi/cpo/2.2.1/locations/", headers=headers
+            )
+            assert response.status_code in (200, 304)
+            received += len(response.content)
+            if conditional_get:
+                headers["If-None-Match"] = response.headers["ETag"]
+        elapsed = time.perf_counter() - start
+    return elapsed, received
+
+
+def main():
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    page = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    logger.setLevel(logging.WARNING)
+    MemoryCrud.storage = get_locations(page)
+    for name, conditional_get in (("full", False), ("conditional", True)):
+        elapsed, received = asyncio.run(poll(conditional_get, amount))
+        print(
+            f"{name:>12}: {amount / elapsed:8.1f} req/s "
+            f"{received / amount / 1024:8.1f} KiB/req"
+        )
+
+
+if __name__ == "__main__":
+    main()
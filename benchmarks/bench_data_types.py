@@ -0,0 +1,223 @@
+"""
+Validation throughput of OCPI data types.
+
+Validates values of string fields of realistic Location and CDR payloads
+with the previous validators, which built a new String class on every
+URL validation and encoded every string, and with the current ones.
+Values are validated both as received from the request and as data of
+already validated models, e.g. when crud returns model objects.
+
+Then validates `amount` of DateTime, Number, Price and DisplayText
+values. Timestamps are validated with the previous DateTime validator,
+which parsed and formatted every value, and with the current one, for
+distinct and repeated values, in canonical and other formats.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_data_types.py [iterations] [amount]
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+
+from py_ocpi.core.config import settings
+from py_ocpi.core.data_types import (
+    URL,
+    CiStringBase,
+    DateTime,
+    DisplayText,
+    Number,
+    Price,
+    StringBase,
+    normalize_datetime,
+)
+from py_ocpi.modules.cdrs.v_2_2_1.schemas import Cdr
+from py_ocpi.modules.locations.v_2_2_1.schemas import Location
+
+from tests.test_modules.test_v_2_2_1.test_cdrs.utils import CDRS
+from tests.test_modules.test_v_2_2_1.test_locations.utils import LOCATIONS
+
+
+class LegacyStringBase(str):
+    max_length: int
+
+    @classmethod
+    def validate(cls, v, field: ModelField):
+        if not isinstance(v, str):
+            raise TypeError(f"excpected string but received {type(v)}")
+        try:
+            v.encode("UTF-8")
+        except UnicodeError as e:
+            raise ValueError("invalid string format") from e
+        if len(v) > cls.max_length:
+            raise ValueError(
+                f"{field.name} length must be lower or equal to {cls.max_length}"
+            )
+        return cls(v)
+
+
+def LegacyString(max_length: int = 255):
+    return type("String", (LegacyStringBase,), {"max_length": max_length})
+
+
+class LegacyCiStringBase(str):
+    max_length: int
+
+    @classmethod
+    def validate(cls, v, field: ModelField):
+        if not isinstance(v, str):
+            raise TypeError(f"excpected string but received {type(v)}")
+        if not v.isascii():
+            raise ValueError("invalid cistring format")
+        if len(v) > cls.max_length:
+            raise ValueError(
+                f"{field.name} length must be lower or equal to {cls.max_length}"
+            )
+
+        if settings.CI_STRING_LOWERCASE_PREFERENCE:
+            return cls(v.lower())
+
+        return cls(v.upper())
+
+
+def LegacyCiString(max_length: int = 255):
+    return type("CiString", (LegacyCiStringBase,), {"max_length": max_length})
+
+
+class LegacyURL(str):
+    @classmethod
+    def validate(cls, v, field: ModelField):
+        v = LegacyString(255).validate(v, field)
+        return cls(v)
+
+
+class LegacyDateTime(str):
+    @classmethod
+    def validate(cls, v):
+        if v.endswith("Z"):
+            v = f"{v[:-1]}+00:00"
+
+        try:
+            formatted_v = datetime.fromisoformat(v)
+        except ValueError as e:
+            raise ValueError(f"Invalid RFC 3339 timestamp: {v}") from e
+
+        return cls(
+            formatted_v.isoformat(timespec="seconds").replace("+00:00", "Z")
+        )
+
+
+def legacy_type(type_: type) -> type:
+    if issubclass(type_, StringBase):
+        return LegacyString(type_.max_length)
+    if issubclass(type_, CiStringBase):
+        return LegacyCiString(type_.max_length)
+    return LegacyURL
+
+
+def string_values(model: type, data: dict) -> Iterator[tuple]:
+    """Yield (type, field, value) of string fields of the payload."""
+    for name, field in model.__fields__.items():
+        value = data.get(name)
+        if value is None:
+            continue
+        items = [value] if field.shape == SHAPE_SINGLETON else value
+        type_ = field.type_
+        if not isinstance(type_, type):
+            continue
+        for item in items:
+            if issubclass(type_, BaseModel):
+                yield from string_values(type_, item)
+            elif issubclass(type_, (StringBase, CiStringBase, URL)):
+                yield type_, field, item
+
+
+def measure(values: List[tuple], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for type_, field, value in values:
+            type_.validate(value, field)
+    return len(values) * iterations / (time.perf_counter() - start)
+
+
+def measure_values(validate: Callable, values: list) -> float:
+    start = time.perf_counter()
+    for value in values:
+        validate(value)
+    return len(values) / (time.perf_counter() - start)
+
+
+def get_timestamps(amount: int, canonical: bool, distinct: bool) -> list:
+    start = datetime(2022, 1, 2)
+    timestamps = []
+    for i in range(amount):
+        value = start + timedelta(seconds=i if distinct else i % 100)
+        if canonical:
+            timestamps.append(value.isoformat() + "Z")
+        else:
+            timestamps.append(value.isoformat(sep=" ") + "+00:00")
+    return timestamps
+
+
+def bench_strings(iterations: int):
+    payloads = [(Location, LOCATIONS[0]), (Cdr, CDRS[0])]
+    print(
+        f"{'payload':>18} {'fields':>7} {'before, 1/s':>12} {'after, 1/s':>12}"
+    )
+    for model, payload in payloads:
+        values = list(string_values(model, payload))
+        validated = list(string_values(model, model(**payload).dict()))
+        for name, new_values in (("", values), (" (validated)", validated)):
+            legacy = [(legacy_type(t), f, v) for t, f, v in new_values]
+            before = measure(legacy, iterations)
+            after = measure(new_values, iterations)
+            print(
+                f"{model.__name__ + name:>18} {len(values):>7} "
+                f"{before:>12.0f} {after:>12.0f}"
+            )
+
+
+def bench_values(amount: int):
+    print(f"{'values':>30} {'before, 1/s':>12} {'after, 1/s':>12}")
+    for canonical in (True, False):
+        for distinct in (True, False):
+            timestamps = get_timestamps(amount, canonical, distinct)
+            normalize_datetime.cache_clear()
+            before = measure_values(LegacyDateTime.validate, timestamps)
+            after = measure_values(DateTime.validate, timestamps)
+            name = (
+                f"DateTime {'canonical' if canonical else 'offset'}"
+                f"{', distinct' if distinct else ', repeated'}"
+            )
+            print(f"{name:>30} {before:>12.0f} {after:>12.0f}")
+
+    others = [
+        ("Number", Number.validate, [i / 100 for i in range(amount)]),
+        (
+            "Price",
+            Price.validate,
+            [{"excl_vat": i / 100, "incl_vat": i / 80} for i in range(amount)],
+        ),
+        (
+            "DisplayText",
+            DisplayText.validate,
+            [{"language": "en", "text": f"Tariff {i}"} for i in range(amount)],
+        ),
+    ]
+    for name, validate, values in others:
+        print(f"{name:>30} {'':>12} {measure_values(validate, values):>12.0f}")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    amount = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    bench_strings(iterations)
+    print()
+    bench_values(amount)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Time to answer version details requests.
+
+Compares building VersionDetail and OCPIResponse models and encoding them
+as FastAPI does on every request with the response rendered once.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_discovery_responses.py [requests]
+"""
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from py_ocpi.core import status
+from py_ocpi.core.endpoints import ENDPOINTS
+from py_ocpi.core.enums import RoleEnum
+from py_ocpi.core.schemas import OCPIResponse
+from py_ocpi.modules.versions.enums import VersionNumber
+from py_ocpi.modules.versions.responses import DiscoveryResponses
+from py_ocpi.modules.versions.v_2_2_1.schemas import VersionDetail
+
+
+def get_endpoints() -> list:
+    return [
+        endpoint
+        for role in (RoleEnum.cpo, RoleEnum.emsp)
+        for endpoint in ENDPOINTS[VersionNumber.v_2_2_1][role].values()
+    ]
+
+
+def legacy_response(endpoints: list) -> JSONResponse:
+    content = OCPIResponse(
+        data=VersionDetail(
+            version=VersionNumber.v_2_2_1,
+            endpoints=endpoints,
+        ).dict(),
+        **status.OCPI_1000_GENERIC_SUCESS_CODE,
+    )
+    # FastAPI validates the content with the response model and encodes it
+    content = OCPIResponse.parse_obj(content.dict())
+    return JSONResponse(jsonable_encoder(content))
+
+
+def measure(respond, endpoints: list, amount: int) -> float:
+    start = time.perf_counter()
+    for _ in range(amount):
+        respond(endpoints)
+    return time.perf_counter() - start
+
+
+def main():
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    endpoints = get_endpoints()
+    responses = DiscoveryResponses()
+    prerendered = responses.version_details[VersionNumber.v_2_2_1].response
+    legacy = measure(legacy_response, endpoints, amount)
+    rendered = measure(prerendered, endpoints, amount)
+    print(f"Endpoints: {len(endpoints)}")
+    print(f"Models per request: {legacy / amount * 1e6:8.1f} us")
+    print(f"Prerendered:        {rendered / amount * 1e6:8.1f} us")
+    print(f"Speedup:            {legacy / rendered:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
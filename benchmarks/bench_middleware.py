@@ -0,0 +1,102 @@
+"""
+Requests per second of the exception handler middleware.
+
+Compares the previous `BaseHTTPMiddleware` based implementation with
+the pure ASGI `ExceptionHandlerMiddleware` on a locations list request.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_middleware.py [requests]
+"""
+import asyncio
+import logging
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware import Middleware
+from starlette.middleware.base import (
+    BaseHTTPMiddleware,
+    RequestResponseEndpoint,
+)
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.authentication.authenticator import Authenticator
+from py_ocpi.core.config import logger
+from py_ocpi.main import ExceptionHandlerMiddleware
+from py_ocpi.modules.versions.enums import VersionNumber
+
+
+class BenchAuthenticator(Authenticator):
+    @classmethod
+    async def get_valid_token_c(cls):
+        return ["token"]
+
+    @classmethod
+    async def get_valid_token_a(cls):
+        return []
+
+
+class LegacyExceptionHandlerMiddleware(BaseHTTPMiddleware):
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ):
+        logger.debug("%s: %s" % (request.method, request.url))
+        logger.debug("Request headers - %s" % request.headers)
+        try:
+            response = await call_next(request)
+        except Exception as e:
+            response = JSONResponse(content={"detail": str(e)})
+        logger.debug(f"Response status_code -> {response.status_code}.")
+        return response
+
+
+def build_app(legacy: bool) -> FastAPI:
+    crud = AsyncMock()
+    crud.list.return_value = [], 0, True
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_1_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=crud,
+        adapter=MagicMock(),
+        authenticator=BenchAuthenticator,
+        modules=[enums.ModuleID.locations],
+    )
+    if legacy:
+        app.user_middleware = [
+            Middleware(LegacyExceptionHandlerMiddleware)
+            if m.cls is ExceptionHandlerMiddleware
+            else m
+            for m in app.user_middleware
+        ]
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        headers = {"Authorization": "Token token"}
+        await client.get("/ocpi/cpo/2.1.1/locations/", headers=headers)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/ocpi/cpo/2.1.1/locations/", headers=headers)
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    logger.setLevel(logging.WARNING)
+    before = asyncio.run(measure(build_app(legacy=True), requests))
+    after = asyncio.run(measure(build_app(legacy=False), requests))
+    print(f"BaseHTTPMiddleware:   {before:10.1f} req/s")
+    print(f"Pure ASGI middleware: {after:10.1f} req/s")
+    print(f"Speedup:              {after / before:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Cost of applying a session PATCH depending on the session size.
+
+Compares the previous deepcopy of the adapted session followed by
+`partially_update_attributes` and `.dict()` with `apply_partial_update`
+on sessions with growing number of `charging_periods`.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_partial_update.py [iterations]
+"""
+import copy
+import sys
+import time
+from typing import Callable
+
+from py_ocpi.core.utils import apply_partial_update, partially_update_attributes
+from py_ocpi.modules.sessions.v_2_2_1.schemas import (
+    Session,
+    SessionPartialUpdate,
+)
+
+from tests.test_modules.test_v_2_2_1.test_sessions.utils import SESSIONS
+
+PATCH = SessionPartialUpdate(kwh=150, last_updated="2022-01-02 00:10:00+00:00")
+
+
+def get_session(charging_periods: int) -> dict:
+    session = copy.deepcopy(SESSIONS[0])
+    session["charging_periods"] = session["charging_periods"] * charging_periods
+    return Session(**session).dict()
+
+
+def legacy_partial_update(data: dict) -> dict:
+    new_session = copy.deepcopy(Session(**data))
+    partially_update_attributes(
+        new_session, PATCH.dict(exclude_defaults=True, exclude_unset=True)
+    )
+    return new_session.dict()
+
+
+def partial_update(data: dict) -> dict:
+    return apply_partial_update(data, PATCH, Session.parse_obj)
+
+
+def measure(update: Callable[[dict], dict], data: dict, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        update(data)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{'charging_periods':>16} {'deepcopy, us':>14} {'merge, us':>10}")
+    for charging_periods in (1, 10, 100, 1000):
+        data = get_session(charging_periods)
+        before = measure(legacy_partial_update, data, iterations)
+        after = measure(partial_update, data, iterations)
+        print(f"{charging_periods:>16} {before:>14.1f} {after:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Time to price CDRs with a tariff.
+
+Generates `sessions` CDRs with hourly charging periods and prices them
+period by period, checking restrictions of every tariff element for
+every period as a straightforward implementation does, and with the
+compiled tariff, which rates all periods at once. Totals are compared.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_pricing.py [sessions]
+"""
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from py_ocpi.modules.tariffs.v_2_2_1.schemas import Tariff
+from py_ocpi.pricing import ChargingPeriods, CompiledTariff
+from py_ocpi.pricing.periods import parse_time
+
+WEEKDAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY"]
+
+TARIFF = Tariff(
+    country_code="NL",
+    party_id="EXA",
+    id="PEAK",
+    currency="EUR",
+    elements=[
+        {
+            "price_components": [
+                {"type": "FLAT", "price": 0.5, "vat": 21, "step_size": 1}
+            ]
+        },
+        {
+            "price_components": [
+                {"type": "ENERGY", "price": 0.45, "vat": 21, "step_size": 1},
+                {"type": "TIME", "price": 1.2, "vat": 21, "step_size": 60},
+            ],
+            "restrictions": {
+                "start_time": "08:00",
+                "end_time": "20:00",
+                "day_of_week": WEEKDAYS,
+            },
+        },
+        {
+            "price_components": [
+                {"type": "ENERGY", "price": 0.35, "vat": 21, "step_size": 1}
+            ],
+            "restrictions": {"max_kwh": 20},
+        },
+        {
+            "price_components": [
+                {
+                    "type": "PARKING_TIME",
+                    "price": 5.0,
+                    "vat": 21,
+                    "step_size": 300,
+                }
+            ],
+            "restrictions": {"min_duration": 10800},
+        },
+        {
+            "price_components": [
+                {"type": "ENERGY", "price": 0.3, "vat": 21, "step_size": 1},
+                {"type": "TIME", "price": 0.6, "vat": 21, "step_size": 60},
+            ]
+        },
+    ],
+    last_updated="2022-01-01T00:00:00Z",
+)
+
+
+def get_cdrs(amount: int) -> list:
+    random.seed(1)
+    month = datetime(2022, 1, 1, tzinfo=timezone.utc)
+    cdrs = []
+    for _ in range(amount):
+        start = month + timedelta(minutes=random.randrange(31 * 1440))
+        periods = []
+        for hour in range(random.randint(1, 6)):
+            periods.append(
+                {
+                    "start_date_time": start + timedelta(hours=hour),
+                    "dimensions": [
+                        {"type": "ENERGY", "volume": random.uniform(2, 11)},
+                        {"type": "TIME", "volume": 1.0},
+                    ],
+                }
+            )
+        periods.append(
+            {
+                "start_date_time": start + timedelta(hours=len(periods)),
+                "dimensions": [
+                    {"type": "PARKING_TIME", "volume": random.uniform(0, 2)}
+                ],
+            }
+        )
+        cdrs.append({"start_date_time": start, "charging_periods": periods})
+    return cdrs
+
+
+def element_matches(restrictions, period_start, duration, energy) -> bool:
+    if restrictions is None:
+        return True
+    minute = period_start.hour * 60 + period_start.minute
+    if restrictions.start_time and minute < parse_time(restrictions.start_time):
+        return False
+    if restrictions.end_time and minute >= parse_time(restrictions.end_time):
+        return False
+    if restrictions.day_of_week and period_start.strftime("%A").upper() not in [
+        day.value for day in restrictions.day_of_week
+    ]:
+        return False
+    if restrictions.max_kwh is not None and energy >= restrictions.max_kwh:
+        return False
+    if (
+        restrictions.min_duration is not None
+        and duration < restrictions.min_duration
+    ):
+        return False
+    return True
+
+
+def find_component(tariff, type_, period_start, duration, energy):
+    for element in tariff.elements:
+        if not element_matches(
+            element.restrictions, period_start, duration, energy
+        ):
+            continue
+        for component in element.price_components:
+            if component.type.value == type_:
+                return component
+    return None
+
+
+def legacy_total(tariff, cdr) -> float:
+    """Price periods one by one, checking every element for every period."""
+    total = 0.0
+    energy = 0.0
+    session_start = cdr["start_date_time"]
+    first = cdr["charging_periods"][0]["start_date_time"]
+    flat = find_component(tariff, "FLAT", first, 0, 0)
+    if flat:
+        total += flat.price * (1 + flat.vat / 100)
+    volumes = {}
+    last_components = {}
+    for period in cdr["charging_periods"]:
+        period_start = period["start_date_time"]
+        duration = (period_start - session_start).total_seconds()
+        for dimension in period["dimensions"]:
+            type_ = dimension["type"]
+            component = find_component(
+                tariff, type_, period_start, duration, energy
+            )
+            if component:
+                price = component.price * (1 + component.vat / 100)
+                total += dimension["volume"] * price
+                volumes[type_] = volumes.get(type_, 0) + dimension["volume"]
+                last_components[type_] = component
+        energy += sum(
+            dimension["volume"]
+            for dimension in period["dimensions"]
+            if dimension["type"] == "ENERGY"
+        )
+    for type_, component in last_components.items():
+        step = component.step_size / (1000 if type_ == "ENERGY" else 3600)
+        steps = math.ceil(round(volumes[type_] / step, 9))
+        total += (steps * step - volumes[type_]) * (
+            component.price * (1 + component.vat / 100)
+        )
+    return total
+
+
+def main():
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cdrs = get_cdrs(amount)
+    periods_amount = sum(len(cdr["charging_periods"]) for cdr in cdrs)
+
+    start = time.perf_counter()
+    legacy = [legacy_total(TARIFF, cdr) for cdr in cdrs]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    periods = ChargingPeriods.from_sessions(cdrs)
+    collected = time.perf_counter() - start
+    compiled = CompiledTariff(TARIFF)
+    costs = compiled.rate(periods)
+    compiled_time = time.perf_counter() - start
+
+    assert np.allclose(costs.total_cost[1], legacy), "totals differ"
+    print(f"CDRs: {amount}, charging periods: {periods_amount}")
+    print(f"Period by period: {legacy_time * 1000:8.1f} ms")
+    print(
+        f"Compiled tariff:  {compiled_time * 1000:8.1f} ms "
+        f"(collecting periods {collected * 1000:.1f} ms)"
+    )
+    print(f"Speedup:          {legacy_time / compiled_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Time to pull a list of locations from another party.
+
+Simulates a CPO with `latency` milliseconds per page which sends pages of
+50 locations in chunks of 16 KB. The list is pulled by a sequential pager
+following `Link` headers, which reads every page as a whole, validates
+and creates locations one by one, and by the pull client, which plans the
+pages from `X-Total-Count`, requests `concurrency` of them at a time,
+decodes locations while they are received, validates them in the
+validation pool and stores them in batches.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_pull.py [amount] [latency] [concurrency]
+"""
+import asyncio
+import copy
+import json
+import sys
+import time
+from typing import AsyncIterator
+
+import httpx
+
+from py_ocpi.core.crud import Crud
+from py_ocpi.core.enums import ModuleID, RoleEnum
+from py_ocpi.core.pull import PullClient
+from py_ocpi.modules.locations.v_2_2_1.schemas import Location
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_push import LOCATIONS
+
+URL = "https://cpo.example.com/ocpi/cpo/2.2.1/locations/"
+PAGE_SIZE = 50
+CHUNK_SIZE = 16384
+
+
+class MemoryCrud(Crud):
+    storage: dict = {}
+
+    @classmethod
+    async def get(cls, module, role, id, *args, **kwargs):
+        return cls.storage.get(id)
+
+    @classmethod
+    async def list(cls, module, role, filters, *args, **kwargs):
+        return list(cls.storage.values()), len(cls.storage), True
+
+    @classmethod
+    async def create(cls, module, role, data, *args, **kwargs):
+        cls.storage[data["id"]] = data
+        return data
+
+    @classmethod
+    async def update(cls, module, role, data, id, *args, **kwargs):
+        cls.storage[id] = data
+        return data
+
+    @classmethod
+    async def delete(cls, module, role, id, *args, **kwargs):
+        cls.storage.pop(id, None)
+
+    @classmethod
+    async def do(cls, module, role, action, *args, data=None, **kwargs):
+        pass
+
+    @classmethod
+    async def bulk_upsert(cls, module, role, data, *args, **kwargs):
+        cls.storage.update((location["id"], location) for location in data)
+        return {}
+
+
+class Partner:
+    def __init__(self, amount: int, latency: float) -> None:
+        self.latency = latency
+        self.locations = []
+        for index in range(amount):
+            location = copy.deepcopy(LOCATIONS[0])
+            location["id"] = f"LOC{index}"
+            self.locations.append(location)
+
+    async def stream(self, body: bytes) -> AsyncIterator[bytes]:
+        for start in range(0, len(body), CHUNK_SIZE):
+            await asyncio.sleep(0)
+            yield body[start:][:CHUNK_SIZE]
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        offset = int(request.url.params.get("offset", 0))
+        limit = min(int(request.url.params.get("limit", PAGE_SIZE)), PAGE_SIZE)
+        body = json.dumps(
+            {
+                "data": self.locations[offset:][:limit],
+                "status_code": 1000,
+                "status_message": "Generic success code",
+                "timestamp": "2022-01-02T00:00:00Z",
+            }
+        ).encode()
+        headers = {"X-Total-Count": str(len(self.locations))}
+        if offset + limit < len(self.locations):
+            headers[
+                "Link"
+            ] = f'<{URL}?offset={offset + limit}&limit={limit}>; rel="next"'
+        return httpx.Response(200, content=self.stream(body), headers=headers)
+
+
+async def sequential_pull(client: httpx.AsyncClient) -> int:
+    """Hand-rolled pager, as used before the pull client."""
+    url = f"{URL}?offset=0&limit=100"
+    amount = 0
+    while url:
+        response = await client.get(url)
+        for location in response.json()["data"]:
+            Location(**location)
+            await MemoryCrud.create(ModuleID.locations, RoleEnum.emsp, location)
+            amount += 1
+        link = response.headers.get("link", "")
+        url = link[1:].partition(">")[0]
+    return amount
+
+
+async def measure(amount: int, latency: float, concurrency: int) -> None:
+    partner = Partner(amount, latency)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(partner.handle))
+
+    start = time.perf_counter()
+    pulled = await sequential_pull(client)
+    sequential = time.perf_counter() - start
+    assert pulled == amount
+
+    MemoryCrud.storage = {}
+    pull_client = PullClient(
+        http_client=client, page_limit=100, concurrency=concurrency
+    )
+    start = time.perf_counter()
+    result = await pull_client.pull(
+        URL, "token", ModuleID.locations, VersionNumber.v_2_2_1, MemoryCrud
+    )
+    pulled_concurrently = time.perf_counter() - start
+    assert result.stored == len(MemoryCrud.storage) == amount
+
+    print(
+        f"Locations: {amount}, pages: {result.pages}, "
+        f"latency: {latency * 1000:.0f} ms, concurrency: {concurrency}"
+    )
+    print(f"Sequential pager: {sequential * 1000:8.1f} ms")
+    print(f"Pull client:      {pulled_concurrently * 1000:8.1f} ms")
+    print(f"Speedup:          {sequential / pulled_concurrently:8.1f}x")
+
+
+def main():
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.05
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    asyncio.run(measure(amount, latency, concurrency))
+
+
+if __name__ == "__main__":
+    main()
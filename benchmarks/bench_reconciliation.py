@@ -0,0 +1,113 @@
+"""
+Throughput and memory of CDRs reconciliation.
+
+Generates `amount` CDRs on the fly, with charging periods and one of
+`tariffs` embedded tariffs, 1% of them with a wrong total cost, and
+reconciles them in chunks of different sizes. A chunk of one CDR rates
+every CDR separately. Then compares peak memory of reconciling two
+chunks of 10000 CDRs with reconciling five times `amount` CDRs, which
+depends on the chunk size and not on the amount of CDRs.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_reconciliation.py [amount] [tariffs]
+"""
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+from py_ocpi.pricing import CdrReconciler
+
+
+def get_tariff(index: int) -> dict:
+    return {
+        "country_code": "NL",
+        "party_id": "EXA",
+        "id": f"TARIFF{index}",
+        "currency": "EUR",
+        "elements": [
+            {
+                "price_components": [
+                    {"type": "FLAT", "price": 0.5, "vat": 21, "step_size": 1},
+                    {
+                        "type": "ENERGY",
+                        "price": 0.2 + index / 100,
+                        "vat": 21,
+                        "step_size": 1,
+                    },
+                ]
+            }
+        ],
+        "last_updated": "2022-01-01T00:00:00Z",
+    }
+
+
+def generate_cdrs(amount: int, tariffs: int) -> Iterator[dict]:
+    random.seed(1)
+    tariff_data = [get_tariff(index) for index in range(tariffs)]
+    month = datetime(2022, 1, 1, tzinfo=timezone.utc)
+    for number in range(amount):
+        index = random.randrange(tariffs)
+        start = month + timedelta(minutes=random.randrange(31 * 1440))
+        volumes = [round(random.uniform(2, 11), 3) for _ in range(4)]
+        energy = sum(volumes)
+        excl_vat = 0.5 + energy * (0.2 + index / 100)
+        if not number % 100:
+            excl_vat += 1
+        yield {
+            "id": f"CDR{number}",
+            "start_date_time": start,
+            "tariffs": [tariff_data[index]],
+            "charging_periods": [
+                {
+                    "start_date_time": start + timedelta(hours=hour),
+                    "dimensions": [
+                        {"type": "ENERGY", "volume": volume},
+                        {"type": "TIME", "volume": 1.0},
+                    ],
+                }
+                for hour, volume in enumerate(volumes)
+            ],
+            "total_cost": {
+                "excl_vat": round(excl_vat, 4),
+                "incl_vat": round(excl_vat * 1.21, 4),
+            },
+            "total_energy": energy,
+            "total_time": len(volumes),
+        }
+
+
+def main():
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    tariffs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    start = time.perf_counter()
+    for _ in generate_cdrs(amount, tariffs):
+        pass
+    generation = time.perf_counter() - start
+    print(f"CDRs: {amount}, tariffs: {tariffs}")
+
+    for chunk_size in (1, 1000, 10000):
+        start = time.perf_counter()
+        report = CdrReconciler(chunk_size=chunk_size).reconcile(
+            generate_cdrs(amount, tariffs)
+        )
+        elapsed = time.perf_counter() - start - generation
+        assert report.mismatched == (amount + 99) // 100, report.fields
+        print(
+            f"Chunk size {chunk_size:6}: {amount / elapsed:10.0f} CDRs/s, "
+            f"{report.mismatched} mismatched"
+        )
+
+    for traced in (20000, amount * 5):
+        tracemalloc.start()
+        CdrReconciler().reconcile(generate_cdrs(traced, tariffs))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"Peak memory of {traced:8} CDRs: {peak / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Time to update running costs of active sessions.
+
+Simulates `sessions` sessions which get a new charging period with every
+update, as CPOs PUT or PATCH sessions, up to `periods` periods each.
+After every update the cost is computed by rating the whole session
+again and by the running cost, which rates only the new period.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_running_cost.py [sessions] [periods]
+"""
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from py_ocpi.modules.tariffs.v_2_2_1.schemas import Tariff
+from py_ocpi.pricing import ChargingPeriods, CompiledTariff, RunningCosts
+
+TARIFF = Tariff(
+    country_code="NL",
+    party_id="EXA",
+    id="RUNNING",
+    currency="EUR",
+    elements=[
+        {
+            "price_components": [
+                {"type": "FLAT", "price": 0.5, "vat": 21, "step_size": 1},
+                {"type": "ENERGY", "price": 0.45, "vat": 21, "step_size": 1},
+            ],
+            "restrictions": {"start_time": "08:00", "end_time": "20:00"},
+        },
+        {
+            "price_components": [
+                {"type": "ENERGY", "price": 0.3, "vat": 21, "step_size": 1},
+                {"type": "TIME", "price": 0.6, "vat": 21, "step_size": 60},
+            ]
+        },
+    ],
+    last_updated="2022-01-01T00:00:00Z",
+)
+
+
+def get_periods(amount: int) -> list:
+    start = datetime(2022, 1, 3, 18, tzinfo=timezone.utc)
+    return [
+        {
+            "start_date_time": start + timedelta(minutes=minute),
+            "dimensions": [
+                {"type": "ENERGY", "volume": 0.18},
+                {"type": "TIME", "volume": 1 / 60},
+            ],
+        }
+        for minute in range(amount)
+    ]
+
+
+def get_session(index: int, periods: list) -> dict:
+    return {
+        "country_code": "NL",
+        "party_id": "EXA",
+        "id": f"SESSION{index}",
+        "start_date_time": periods[0]["start_date_time"],
+        "charging_periods": periods,
+        "status": "ACTIVE",
+    }
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    amount = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    tariff = CompiledTariff(TARIFF)
+    periods = get_periods(amount)
+
+    start = time.perf_counter()
+    for size in range(1, amount + 1):
+        for index in range(sessions):
+            session = get_session(index, periods[:size])
+            whole = tariff.rate(ChargingPeriods.from_sessions([session]))
+    whole_time = time.perf_counter() - start
+
+    running_costs = RunningCosts()
+    start = time.perf_counter()
+    for size in range(1, amount + 1):
+        for index in range(sessions):
+            session = get_session(index, periods[:size])
+            running = running_costs.update(session, tariff)
+    running_time = time.perf_counter() - start
+
+    assert np.allclose(whole.total_cost, running.total_cost), "costs differ"
+    updates = sessions * amount
+    print(f"Sessions: {sessions}, periods per session: {amount}")
+    print(f"Whole session:  {whole_time / updates * 1e6:8.1f} us per update")
+    print(f"Running cost:   {running_time / updates * 1e6:8.1f} us per update")
+    print(f"Speedup:        {whole_time / running_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
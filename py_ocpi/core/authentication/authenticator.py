@@ -1,13 +1,95 @@
+import time
 from abc import ABC, abstractmethod
 
-from typing import List
+from typing import Collection, Dict, FrozenSet, List, Optional, Tuple
 
 from py_ocpi.core.exceptions import AuthorizationOCPIError
-from py_ocpi.core.config import logger
+from py_ocpi.core.config import logger, settings
+
+TOKEN_A = "token_a"  # nosec
+TOKEN_C = "token_c"  # nosec
+
+
+class TokenCache:
+    """
+    TTL cache keeping a hashed set index of valid tokens per token type.
+
+    :param ttl: Seconds after which cached tokens are fetched again.
+    :param max_size: Token lists longer than this value aren't cached,
+      which keeps the memory used by the cache bounded.
+    """
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: Dict[str, Tuple[float, FrozenSet[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.last_refresh_latency = 0.0
+        self.total_refresh_latency = 0.0
+
+    def get(self, token_type: str) -> Optional[FrozenSet[str]]:
+        """Return cached tokens of given type if they haven't expired."""
+        entry = self._entries.get(token_type)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def set(
+        self, token_type: str, tokens: Collection[str], latency: float
+    ) -> FrozenSet[str]:
+        """Store tokens of given type and record refresh latency."""
+        self.refreshes += 1
+        self.last_refresh_latency = latency
+        self.total_refresh_latency += latency
+
+        token_set = frozenset(tokens)
+        if len(token_set) > self.max_size:
+            logger.debug(
+                "Token list of `%s` type exceeds cache max size." % token_type
+            )
+            self._entries.pop(token_type, None)
+        else:
+            self._entries[token_type] = (
+                time.monotonic() + self.ttl,
+                token_set,
+            )
+        return token_set
+
+    def invalidate(self, token_type: Optional[str] = None) -> None:
+        """Drop cached tokens of given type or all of them."""
+        if token_type is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(token_type, None)
+
+    def stats(self) -> dict:
+        """Return hit rate and refresh latency metrics."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "last_refresh_latency": self.last_refresh_latency,
+            "avg_refresh_latency": (
+                self.total_refresh_latency / self.refreshes
+                if self.refreshes
+                else 0.0
+            ),
+        }
 
 
 class Authenticator(ABC):
-    """Base class responsible for verifying authorization tokens."""
+    """Base class responsible for verifying authorization tokens.
+
+    Valid tokens are cached for `AUTH_TOKEN_CACHE_TTL` seconds when
+    the setting is greater than zero. Call `invalidate_token_cache`
+    whenever tokens are rotated outside of the credentials module.
+    """
 
     @classmethod
     async def authenticate(cls, auth_token: str) -> None:
@@ -16,7 +98,7 @@ class Authenticator(ABC):
         :raises AuthorizationOCPIError: If auth_token is not in a given
           list of verified tokens C.
         """
-        list_token_c = await cls.get_valid_token_c()
+        list_token_c = await cls._get_valid_tokens(TOKEN_C)
         if auth_token not in list_token_c:
             logger.debug("Given `%s` token is not valid" % auth_token)
             raise AuthorizationOCPIError
@@ -28,18 +110,64 @@ class Authenticator(ABC):
     ) -> str | dict | None:
         """Authenticate given auth token where both tokens valid."""
         if auth_token:
-            list_token_a = await cls.get_valid_token_a()
+            list_token_a = await cls._get_valid_tokens(TOKEN_A)
             if auth_token in list_token_a:
                 logger.debug("Token A `%s` is used." % auth_token)
                 return {}
 
-            list_token_c = await cls.get_valid_token_c()
+            list_token_c = await cls._get_valid_tokens(TOKEN_C)
             if auth_token in list_token_c:
                 logger.debug("Token C `%s` is used." % auth_token)
                 return auth_token
         logger.debug("Token `%s` is not of type A or C." % auth_token)
         return None
 
+    @classmethod
+    def get_token_cache(cls) -> TokenCache:
+        """Return token cache of the authenticator class."""
+        cache = cls.__dict__.get("_token_cache")
+        if cache is None:
+            cache = TokenCache(
+                settings.AUTH_TOKEN_CACHE_TTL,
+                settings.AUTH_TOKEN_CACHE_MAX_SIZE,
+            )
+            setattr(cls, "_token_cache", cache)
+        return cache
+
+    @classmethod
+    def invalidate_token_cache(cls, token_type: Optional[str] = None) -> None:
+        """Drop cached tokens, e.g. after credentials were changed.
+
+        :param token_type: `TOKEN_A` or `TOKEN_C`, all types if not given.
+        """
+        logger.debug("Invalidate token cache of `%s`." % cls.__name__)
+        cls.get_token_cache().invalidate(token_type)
+
+    @classmethod
+    def token_cache_stats(cls) -> dict:
+        """Return token cache hit rate and refresh latency metrics."""
+        return cls.get_token_cache().stats()
+
+    @classmethod
+    async def _get_valid_tokens(cls, token_type: str) -> Collection[str]:
+        getter = (
+            cls.get_valid_token_a
+            if token_type == TOKEN_A
+            else cls.get_valid_token_c
+        )
+        if settings.AUTH_TOKEN_CACHE_TTL <= 0:
+            return await getter()
+
+        cache = cls.get_token_cache()
+        tokens = cache.get(token_type)
+        if tokens is None:
+            start = time.perf_counter()
+            valid_tokens = await getter()
+            tokens = cache.set(
+                token_type, valid_tokens, time.perf_counter() - start
+            )
+        return tokens
+
     @classmethod
     @abstractmethod
     async def get_valid_token_c(cls) -> List[str]:
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from starlette.requests import HTTPConnection
+
+from py_ocpi.modules.versions.enums import VersionNumber
+
+
+@dataclass(frozen=True)
+class AuthContext:
+    """
+    Authorization data resolved once per request by the verifiers.
+
+    :param raw_token: Token as it was sent by the client.
+    :param token: Token decoded according to the OCPI version.
+    :param version: OCPI version which was used to decode the token.
+    :param credentials: Result of credentials authentication, if any.
+    """
+
+    raw_token: Optional[str]
+    token: Optional[str]
+    version: Optional[VersionNumber]
+    credentials: str | dict | None = None
+
+
+def set_auth_context(
+    connection: HTTPConnection, context: AuthContext
+) -> AuthContext:
+    """Attach auth context to the current request or websocket."""
+    connection.state.auth_context = context
+    return context
+
+
+def get_auth_context(connection: HTTPConnection) -> Optional[AuthContext]:
+    """
+    Return auth context of the current request or websocket.
+
+    Can be used as a dependency in handlers, returns None if
+    the request wasn't verified (e.g. `NO_AUTH` mode).
+    """
+    return getattr(connection.state, "auth_context", None)
@@ -2,14 +2,17 @@ from fastapi import (
     Depends,
     Header,
     Path,
+    Request,
     Security,
     status,
     Query,
+    WebSocket,
     WebSocketException,
 )
 from fastapi.security import APIKeyHeader
 
 from py_ocpi.core.authentication.authenticator import Authenticator
+from py_ocpi.core.authentication.context import AuthContext, set_auth_context
 from py_ocpi.core.config import logger, settings
 from py_ocpi.core.dependencies import get_authenticator
 from py_ocpi.core.exceptions import AuthorizationOCPIError
@@ -24,6 +27,38 @@ api_key_header = APIKeyHeader(
 auth_verifier = Security(api_key_header) if not settings.NO_AUTH else ""
 
 
+def split_token(authorization: str) -> str:
+    """
+    Return token part of the authorization header.
+
+    :raises AuthorizationOCPIError: If header doesn't start with `Token `.
+    """
+    try:
+        return authorization.split()[1]
+    except IndexError:
+        logger.debug(
+            "Token `%s` cannot be split in parts. "
+            "Check if it starts with `Token `" % authorization
+        )
+        raise AuthorizationOCPIError
+
+
+def decode_token(token: str) -> str:
+    """
+    Return base64 decoded token.
+
+    :raises AuthorizationOCPIError: If token cannot be decoded.
+    """
+    try:
+        return decode_string_base64(token)
+    except UnicodeDecodeError:
+        logger.debug(
+            "Token `%s` cannot be decoded. "
+            "Check if the token is already encoded." % token
+        )
+        raise AuthorizationOCPIError
+
+
 class AuthorizationVerifier:
     """
     A class responsible for verifying authorization tokens
@@ -37,6 +72,7 @@ class AuthorizationVerifier:
 
     async def __call__(
         self,
+        request: Request,
         authorization: str = auth_verifier,
         authenticator: Authenticator = Depends(get_authenticator),
     ):
@@ -44,6 +80,8 @@ class AuthorizationVerifier:
         Verifies the authorization token using the specified version
         and an Authenticator.
 
+        :param request (Request): The current request, verified token
+          is stored in its auth context.
         :param authorization (str): The authorization header containing
           the token.
         :param authenticator (Authenticator): An Authenticator instance used
@@ -56,24 +94,14 @@ class AuthorizationVerifier:
             logger.debug("Authentication skipped due to NO_AUTH setting.")
             return True
 
-        try:
-            token = authorization.split()[1]
-            if self.version.startswith("2.2"):
-                try:
-                    token = decode_string_base64(token)
-                except UnicodeDecodeError:
-                    logger.debug(
-                        "Token `%s` cannot be decoded. "
-                        "Check if the token is already encoded." % token
-                    )
-                    raise AuthorizationOCPIError
-            await authenticator.authenticate(token)
-        except IndexError:
-            logger.debug(
-                "Token `%s` cannot be split in parts. "
-                "Check if it starts with `Token `"
-            )
-            raise AuthorizationOCPIError
+        raw_token = split_token(authorization)
+        token = raw_token
+        if self.version.startswith("2.2"):
+            token = decode_token(raw_token)
+        await authenticator.authenticate(token)
+        return set_auth_context(
+            request, AuthContext(raw_token, token, self.version)
+        )
 
 
 class CredentialsAuthorizationVerifier:
@@ -89,6 +117,7 @@ class CredentialsAuthorizationVerifier:
 
     async def __call__(
         self,
+        request: Request,
         authorization: str = Security(api_key_header),
         authenticator: Authenticator = Depends(get_authenticator),
     ) -> str | dict | None:
@@ -96,6 +125,8 @@ class CredentialsAuthorizationVerifier:
         Verifies the authorization token using the specified version
         and an Authenticator.
 
+        :param request (Request): The current request, verified token
+          is stored in its auth context.
         :param authorization (str): The authorization header containing
           the token.
         :param authenticator (Authenticator): An Authenticator instance used
@@ -104,31 +135,23 @@ class CredentialsAuthorizationVerifier:
         :raises AuthorizationOCPIError: If there is an issue with
           the authorization token.
         """
-        try:
-            token = authorization.split()[1]
-        except IndexError:
-            logger.debug(
-                "Token `%s` cannot be split in parts. "
-                "Check if it starts with `Token `"
-            )
-            raise AuthorizationOCPIError
+        raw_token = split_token(authorization)
+        token = raw_token
 
         if self.version:
             if self.version.startswith("2.2"):
-                try:
-                    token = decode_string_base64(token)
-                except UnicodeDecodeError:
-                    logger.debug(
-                        "Token `%s` cannot be decoded. "
-                        "Check if the token is already encoded." % token
-                    )
-                    raise AuthorizationOCPIError
+                token = decode_token(raw_token)
         else:
             try:
-                token = decode_string_base64(token)
+                token = decode_string_base64(raw_token)
             except UnicodeDecodeError:
                 pass
-        return await authenticator.authenticate_credentials(token)
+        credentials = await authenticator.authenticate_credentials(token)
+        set_auth_context(
+            request,
+            AuthContext(raw_token, token, self.version, credentials),
+        )
+        return credentials
 
 
 class VersionsAuthorizationVerifier(CredentialsAuthorizationVerifier):
@@ -139,6 +162,7 @@ class VersionsAuthorizationVerifier(CredentialsAuthorizationVerifier):
 
     async def __call__(
         self,
+        request: Request,
         authorization: str = auth_verifier,
         authenticator: Authenticator = Depends(get_authenticator),
     ) -> str | dict | None:
@@ -146,6 +170,8 @@ class VersionsAuthorizationVerifier(CredentialsAuthorizationVerifier):
         Verifies the authorization token using the specified version
         and an Authenticator for version endpoints.
 
+        :param request (Request): The current request, verified token
+          is stored in its auth context.
         :param authorization (str): The authorization header containing
           the token.
         :param authenticator (Authenticator): An Authenticator instance used
@@ -157,7 +183,7 @@ class VersionsAuthorizationVerifier(CredentialsAuthorizationVerifier):
         if settings.NO_AUTH and authorization == "":
             logger.debug("Authentication skipped due to NO_AUTH setting.")
             return ""
-        return await super().__call__(authorization, authenticator)
+        return await super().__call__(request, authorization, authenticator)
 
 
 class HttpPushVerifier:
@@ -167,6 +193,7 @@ class HttpPushVerifier:
 
     async def __call__(
         self,
+        request: Request,
         authorization: str = Header(...) if not settings.NO_AUTH else "",
         version: VersionNumber = Path(...),
         authenticator: Authenticator = Depends(get_authenticator),
@@ -175,6 +202,8 @@ class HttpPushVerifier:
         Verifies the authorization token using the specified version
         and an Authenticator.
 
+        :param request (Request): The current request, verified token
+          is stored in its auth context.
         :param authorization (str): The authorization header containing
           the token.
         :param version (VersionNumber): The authorization header containing
@@ -189,24 +218,12 @@ class HttpPushVerifier:
             logger.debug("Authentication skipped due to NO_AUTH setting.")
             return True
 
-        try:
-            token = authorization.split()[1]
-            if version.value.startswith("2.2"):
-                try:
-                    token = decode_string_base64(token)
-                except UnicodeDecodeError:
-                    logger.debug(
-                        "Token `%s` cannot be decoded. "
-                        "Check if the token is already encoded." % token
-                    )
-                    raise AuthorizationOCPIError
-            await authenticator.authenticate(token)
-        except IndexError:
-            logger.debug(
-                "Token `%s` cannot be split in parts. "
-                "Check if it starts with `Token `"
-            )
-            raise AuthorizationOCPIError
+        raw_token = split_token(authorization)
+        token = raw_token
+        if version.value.startswith("2.2"):
+            token = decode_token(raw_token)
+        await authenticator.authenticate(token)
+        return set_auth_context(request, AuthContext(raw_token, token, version))
 
 
 class WSPushVerifier:
@@ -216,6 +233,7 @@ class WSPushVerifier:
 
     async def __call__(
         self,
+        websocket: WebSocket,
         token: str = Query(...) if not settings.NO_AUTH else "",
         version: VersionNumber = Path(...),
         authenticator: Authenticator = Depends(get_authenticator),
@@ -224,6 +242,8 @@ class WSPushVerifier:
         Verifies the authorization token using the specified version
         and an Authenticator.
 
+        :param websocket (WebSocket): The current websocket, verified token
+          is stored in its auth context.
         :param token (str): Token parameter in ws.
         :param version (str): The authorization header containing
           the token.
@@ -242,15 +262,12 @@ class WSPushVerifier:
                 logger.debug("Token wasn't given.")
                 raise AuthorizationOCPIError
 
+            raw_token = token
             if version.value.startswith("2.2"):
-                try:
-                    token = decode_string_base64(token)
-                except UnicodeDecodeError:
-                    logger.debug(
-                        "Token `%s` cannot be decoded. "
-                        "Check if the token is already encoded." % token
-                    )
-                    raise AuthorizationOCPIError
+                token = decode_token(raw_token)
             await authenticator.authenticate(token)
         except AuthorizationOCPIError:
             raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+        return set_auth_context(
+            websocket, AuthContext(raw_token, token, version)
+        )
@@ -0,0 +1,209 @@
+import asyncio
+import json
+from collections import deque
+from functools import partial
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    status as fastapistatus,
+)
+from pydantic import ValidationError
+
+from py_ocpi.core.authentication.verifier import HttpPushVerifier
+from py_ocpi.core.config import logger, settings
+from py_ocpi.core.crud import Crud, upsert_each
+from py_ocpi.core.dependencies import get_crud
+from py_ocpi.core.enums import ModuleID, RoleEnum
+from py_ocpi.core.schemas import BulkImportError, BulkImportResponse
+from py_ocpi.core.utils import get_auth_token, get_module_model
+from py_ocpi.core.validation import validation_pool
+from py_ocpi.modules.versions.enums import VersionNumber
+
+ValidLocation = Tuple[int, dict]
+InvalidLocation = Tuple[int, Optional[str], str]
+
+
+def format_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+        for error in e.errors()
+    )
+
+
+def validate_locations(
+    version: VersionNumber, items: list, start: int
+) -> Tuple[List[ValidLocation], List[InvalidLocation]]:
+    """
+    Validate locations of the chunk, run in the validation pool.
+
+    :param items: Locations, either NDJSON lines or parsed objects.
+    :param start: Index of the first location of the chunk in the body.
+    :return: Valid locations as JSON compatible dicts and errors of
+      invalid ones, with their index in the body.
+    """
+    schema = get_module_model("Location", "locations", version.name)
+    valid: List[ValidLocation] = []
+    invalid: List[InvalidLocation] = []
+    for index, item in enumerate(items, start):
+        object_id = None
+        try:
+            if isinstance(item, (bytes, str)):
+                item = json.loads(item)
+            if not isinstance(item, dict):
+                raise TypeError("location object expected")
+            object_id = item.get("id")
+            location = schema(**item)
+        except ValidationError as e:
+            invalid.append((index, object_id, format_validation_error(e)))
+        except (TypeError, ValueError) as e:
+            invalid.append((index, object_id, str(e)))
+        else:
+            # String types of the schema can't be pickled, send plain JSON
+            valid.append((index, json.loads(location.json())))
+    return valid, invalid
+
+
+async def bulk_upsert(
+    crud: Crud,
+    data: List[dict],
+    module: ModuleID = ModuleID.locations,
+    role: RoleEnum = RoleEnum.emsp,
+    **kwargs,
+) -> Dict[int, str]:
+    """Store the chunk with `crud.bulk_upsert`, return object errors."""
+    # cruds which don't subclass Crud may have no bulk_upsert
+    upsert = getattr(crud, "bulk_upsert", None) or partial(upsert_each, crud)
+    try:
+        return await upsert(module, role, data, **kwargs)
+    except Exception as e:
+        logger.warning(
+            "Bulk upsert of %s %s failed: %s" % (len(data), module.value, e)
+        )
+        return {index: str(e) for index in range(len(data))}
+
+
+async def read_ndjson(request: Request) -> AsyncIterator[list]:
+    """Yield chunks of NDJSON lines while the body is received."""
+    chunk: List[bytes] = []
+    rest = b""
+    async for data in request.stream():
+        lines = (rest + data).split(b"\n")
+        rest = lines.pop()
+        for line in lines:
+            if line.strip():
+                chunk.append(line)
+            if len(chunk) >= settings.BULK_IMPORT_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+    if rest.strip():
+        chunk.append(rest)
+    if chunk:
+        yield chunk
+
+
+async def read_list(request: Request) -> AsyncIterator[list]:
+    """Yield chunks of the JSON list body."""
+    try:
+        items = json.loads(await request.body())
+    except ValueError:
+        items = None
+    if not isinstance(items, list):
+        raise HTTPException(
+            fastapistatus.HTTP_400_BAD_REQUEST,
+            "Body must be a JSON list or NDJSON of locations",
+        )
+    size = settings.BULK_IMPORT_CHUNK_SIZE
+    for start in range(0, len(items), size):
+        end = start + size
+        yield items[start:end]
+
+
+async def import_locations(
+    version: VersionNumber,
+    chunks: AsyncIterator[list],
+    crud: Any,
+    **kwargs,
+) -> BulkImportResponse:
+    """
+    Validate chunks of locations in the validation pool and store them.
+
+    Chunks are validated concurrently, up to one per validation process
+    ahead of the chunk being stored, and stored in order.
+    """
+    received = 0
+    errors: List[BulkImportError] = []
+    pending: Deque[asyncio.Future] = deque()
+
+    async def store(validation: asyncio.Future) -> None:
+        valid, invalid = await validation
+        errors.extend(
+            BulkImportError(index=index, id=object_id, error=error)
+            for index, object_id, error in invalid
+        )
+        if not valid:
+            return
+        failed = await bulk_upsert(
+            crud, [location for _, location in valid], version=version, **kwargs
+        )
+        for position, error in failed.items():
+            index, location = valid[position]
+            errors.append(
+                BulkImportError(index=index, id=location.get("id"), error=error)
+            )
+
+    try:
+        async for chunk in chunks:
+            pending.append(
+                asyncio.ensure_future(
+                    validation_pool.run(
+                        validate_locations, version, chunk, received
+                    )
+                )
+            )
+            received += len(chunk)
+            if len(pending) > max(settings.VALIDATION_PROCESSES, 1):
+                await store(pending.popleft())
+        while pending:
+            await store(pending.popleft())
+    finally:
+        for validation in pending:
+            validation.cancel()
+
+    errors.sort(key=lambda error: error.index)
+    logger.info(
+        "Imported %s of %s locations." % (received - len(errors), received)
+    )
+    return BulkImportResponse(
+        received=received, imported=received - len(errors), errors=errors
+    )
+
+
+router = APIRouter(
+    dependencies=[Depends(HttpPushVerifier())],
+)
+
+
+# WARNING it's advised not to expose this endpoint
+@router.post(
+    "/{version}/locations",
+    status_code=200,
+    include_in_schema=False,
+    response_model=BulkImportResponse,
+)
+async def bulk_import_locations(
+    request: Request,
+    version: VersionNumber,
+    crud: Crud = Depends(get_crud),
+):
+    logger.info("Received locations bulk import request.")
+    auth_token = get_auth_token(request, version)
+    if "ndjson" in request.headers.get("content-type", ""):
+        chunks = read_ndjson(request)
+    else:
+        chunks = read_list(request)
+
+    return await import_locations(version, chunks, crud, auth_token=auth_token)
@@ -0,0 +1,284 @@
+import asyncio
+import hashlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Request, Response, status as fastapistatus
+from fastapi.routing import APIRoute
+
+from py_ocpi.core import status
+from py_ocpi.core.config import logger
+from py_ocpi.core.enums import ModuleID, RoleEnum
+from py_ocpi.core.responses import RESPONSE_PARAM_NAME, dumps
+from py_ocpi.core.schemas import OCPIResponse
+
+REQUEST_PARAM_NAME = "__ocpi_conditional_request"
+
+
+class NotModified(Exception):
+    """Raised when the client already has the requested data."""
+
+
+class ConditionalRequest:
+    """
+    Validators sent by the client and validators of the requested data.
+
+    `etag` and `last_modified` are set from crud data by the endpoint
+    helpers before the data is adapted, so the request can be answered
+    with `304 Not Modified` as soon as they are known.
+    """
+
+    def __init__(
+        self,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None,
+    ) -> None:
+        self.if_none_match = if_none_match
+        self.if_modified_since = parse_http_date(if_modified_since)
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[datetime] = None
+
+    def is_not_modified(self) -> bool:
+        # If-Modified-Since is ignored when If-None-Match is sent
+        if self.if_none_match is not None:
+            return self.etag is not None and etag_matches(
+                self.if_none_match, self.etag
+            )
+        if self.if_modified_since is None or self.last_modified is None:
+            return False
+        return self.last_modified.replace(microsecond=0) <= (
+            self.if_modified_since
+        )
+
+    def check(self) -> None:
+        if self.is_not_modified():
+            logger.debug("Requested data is not modified.")
+            raise NotModified
+
+    def headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["ETag"] = self.etag
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                self.last_modified, usegmt=True
+            )
+        return headers
+
+
+conditional_request: ContextVar[Optional[ConditionalRequest]] = ContextVar(
+    "conditional_request", default=None
+)
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Return aware datetime of HTTP date header, None if it's invalid."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def parse_last_updated(value: Any) -> Optional[datetime]:
+    """Return aware UTC datetime of the object last_updated, if possible."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of the ETag with If-None-Match header value."""
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in tags)
+
+
+def make_etag(value: Any) -> str:
+    """Return strong ETag of JSON serializable value."""
+    return '"%s"' % hashlib.blake2b(dumps(value), digest_size=16).hexdigest()
+
+
+def get_field(data: Any, name: str) -> Any:
+    if isinstance(data, dict):
+        return data[name]
+    return getattr(data, name)
+
+
+def object_key(
+    data: Any, module: ModuleID, id_field: Optional[str] = None
+) -> list:
+    if id_field is None:
+        id_field = "uid" if module == ModuleID.tokens else "id"
+    last_updated = get_field(data, "last_updated")
+    if isinstance(last_updated, datetime):
+        last_updated = last_updated.isoformat()
+    return [str(get_field(data, id_field)), str(last_updated)]
+
+
+async def check_list_version(
+    crud, module: ModuleID, role: RoleEnum, filters: dict, *args, **kwargs
+) -> None:
+    """
+    Answer conditional list request with the version of crud, if any.
+
+    Crud `list_version` is called only for conditional GET requests,
+    when it returns the version of the list `list` isn't called for
+    requests the client has the list of.
+
+    :raises NotModified: If the client has the current list.
+    """
+    request = conditional_request.get()
+    if request is None:
+        return
+    list_version = getattr(crud, "list_version", None)
+    if list_version is None:
+        return
+    version = await list_version(module, role, filters, *args, **kwargs)
+    if version is not None:
+        request.etag = make_etag(["version", str(version)])
+        request.check()
+
+
+def check_list(data_list: list, module: ModuleID, *extra: Any) -> None:
+    """
+    Answer conditional list request with validators of crud objects.
+
+    ETag is made of ids and last_updated of the objects and extra
+    values (e.g. pagination headers), or of the objects content when
+    they don't have last_updated. Last-Modified isn't sent for lists,
+    removed objects don't change it.
+
+    :raises NotModified: If the client has the current list.
+    """
+    request = conditional_request.get()
+    if request is None or request.etag is not None:
+        return
+    try:
+        keys = [object_key(data, module) for data in data_list]
+    except (AttributeError, KeyError):
+        request.etag = make_etag([data_list, *extra])
+    else:
+        request.etag = make_etag([keys, *extra])
+    request.check()
+
+
+def check_object(
+    data: Any, module: ModuleID, id_field: Optional[str] = None
+) -> None:
+    """
+    Answer conditional object request with validators of crud object.
+
+    :param id_field: Field identifying the object, e.g. `uid` of EVSEs,
+      by default the id field of the module objects.
+    :raises NotModified: If the client has the current object.
+    """
+    request = conditional_request.get()
+    if request is None:
+        return
+    try:
+        request.etag = make_etag(object_key(data, module, id_field))
+        request.last_modified = parse_last_updated(
+            get_field(data, "last_updated")
+        )
+    except (AttributeError, KeyError):
+        request.etag = make_etag(data)
+    request.check()
+
+
+def enable_conditional_get(app: FastAPI) -> None:
+    """
+    Answer GET requests of the app routes with validators.
+
+    Responses get `ETag` (and `Last-Modified` for single objects) headers
+    and requests with `If-None-Match` or `If-Modified-Since` matching
+    them are answered with `304 Not Modified`. Endpoints which check
+    crud data answer before adapting it, ETag of other endpoints is
+    made of the response data or taken from the returned response.
+
+    :param app: FastAPI application with included OCPI routers.
+    """
+    for route in app.routes:
+        if (
+            isinstance(route, APIRoute)
+            and "GET" in route.methods
+            and route.response_model is OCPIResponse
+            and asyncio.iscoroutinefunction(route.dependant.call)
+        ):
+            wrap_route_conditional(route)
+
+
+def wrap_route_conditional(route: APIRoute) -> None:
+    dependant = route.dependant
+    endpoint = dependant.call
+    request_injected = dependant.request_param_name is None
+    if request_injected:
+        dependant.request_param_name = REQUEST_PARAM_NAME
+    request_param_name = dependant.request_param_name
+    response_injected = dependant.response_param_name is None
+    if response_injected:
+        dependant.response_param_name = RESPONSE_PARAM_NAME
+    response_param_name = dependant.response_param_name
+
+    async def call(**values):
+        if request_injected:
+            request: Request = values.pop(request_param_name)
+        else:
+            request = values[request_param_name]
+        if response_injected:
+            sub_response: Response = values.pop(response_param_name)
+        else:
+            sub_response = values[response_param_name]
+
+        conditional = ConditionalRequest(
+            request.headers.get("if-none-match"),
+            request.headers.get("if-modified-since"),
+        )
+        token = conditional_request.set(conditional)
+        try:
+            content = await endpoint(**values)  # type: ignore
+            if isinstance(content, Response) and "etag" in content.headers:
+                # prerendered responses carry ETag of their data
+                conditional.etag = content.headers["etag"]
+                conditional.check()
+            elif (
+                isinstance(content, OCPIResponse)
+                and content.status_code
+                == status.OCPI_1000_GENERIC_SUCESS_CODE["status_code"]
+                and conditional.etag is None
+            ):
+                conditional.etag = make_etag(
+                    [
+                        content.data,
+                        sub_response.headers.get("link"),
+                        sub_response.headers.get("x-total-count"),
+                    ]
+                )
+                conditional.check()
+        except NotModified:
+            return Response(
+                status_code=fastapistatus.HTTP_304_NOT_MODIFIED,
+                headers=conditional.headers(),
+            )
+        finally:
+            conditional_request.reset(token)
+
+        if isinstance(content, OCPIResponse):
+            sub_response.headers.update(conditional.headers())
+        return content
+
+    dependant.call = call
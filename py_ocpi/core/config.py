@@ -13,13 +13,47 @@ class Settings(BaseSettings):
     OCPI_HOST: str = "www.example.com"
     OCPI_PREFIX: str = "ocpi"
     PUSH_PREFIX: str = "push"
+    IMPORT_PREFIX: str = "import"
     COUNTRY_CODE: str = "US"
     PARTY_ID: str = "NON"
     PROTOCOL: str = "https"
     COMMAND_AWAIT_TIME: int = 5
+    COMMAND_POLL_INTERVAL: float = 2.0
+    COMMAND_POLL_MAX_INTERVAL: float = 30.0
     GET_ACTIVE_PROFILE_AWAIT_TIME: int = 5
+    CHARGING_PROFILE_POLL_INTERVAL: float = 2.0
+    CHARGING_PROFILE_BATCH_SIZE: int = 500
+    CHARGING_PROFILE_WORKERS: int = 10
     TRAILING_SLASH: bool = True
     CI_STRING_LOWERCASE_PREFERENCE: bool = True
+    AUTH_TOKEN_CACHE_TTL: int = 0
+    AUTH_TOKEN_CACHE_MAX_SIZE: int = 100000
+    HTTP_CLIENT_TIMEOUT: float = 10.0
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 5.0
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 5.0
+    HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST: int = 0
+    HTTP_CLIENT_HTTP2: bool = False
+    PUSH_CONCURRENCY: int = 10
+    PUSH_RECEIVER_TIMEOUT: float = 30.0
+    PUSH_ENDPOINTS_CACHE_TTL: int = 0
+    PUSH_ENDPOINTS_CACHE_STALE_TTL: int = 0
+    PUSH_DELTA: bool = False
+    PUSH_DELTA_CACHE_SIZE: int = 10000
+    PUSH_DELTA_MAX_PATCHES: int = 5
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    OUTBOX_LEASE_TIMEOUT: float = 60.0
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_RETRY_BASE_DELAY: float = 1.0
+    OUTBOX_RETRY_MAX_DELAY: float = 300.0
+    VALIDATION_PROCESSES: int = 4
+    VALIDATION_OFFLOAD_MIN_SIZE: int = 65536
+    BULK_IMPORT_CHUNK_SIZE: int = 1000
+    PULL_PAGE_LIMIT: int = 100
+    PULL_CONCURRENCY: int = 4
+    PULL_BATCH_SIZE: int = 500
 
     @classmethod
     @validator("BACKEND_CORS_ORIGINS", pre=True)
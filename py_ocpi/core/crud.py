@@ -1,4 +1,5 @@
-from typing import Any, Tuple, Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Tuple, Optional
 from abc import ABC, abstractmethod
 
 from py_ocpi.core.enums import ModuleID, RoleEnum, Action
@@ -38,6 +39,26 @@ class Crud(ABC):
         """
         pass
 
+    @classmethod
+    async def get_many(
+        cls, module: ModuleID, role: RoleEnum, queries: List[dict]
+    ) -> List[Any]:
+        """Get several objects at once
+
+        Used by the charging profiles scheduler to look up results of all
+        pending requests with one call. Override it to query the database
+        once, by default `get` is called for each query concurrently.
+
+        :param module: The OCPI module
+        :param role: The role of the caller
+        :param queries: Keyword arguments of `get` for each object, `id`
+            key contains the ID of the object
+
+        :return: The objects data in order of the queries
+        :rtype: List[Any]
+        """
+        return await get_each(cls, module, role, queries)
+
     @abstractmethod
     async def list(
         cls, module: ModuleID, role: RoleEnum, filters: dict, *args, **kwargs
@@ -46,7 +67,13 @@ class Crud(ABC):
 
         :param module: The OCPI module
         :param role: The role of the caller
-        :param filters: OCPI pagination filters
+        :param filters: OCPI pagination filters. When the application
+            is initialized with `PaginationMode.cursor`, filters also
+            contain `cursor` key: None for the first page, otherwise
+            dict with `last_updated` (str) and `id` (str) of the last
+            object of the previous page. Objects should be ordered by
+            (last_updated, id) and start right after the cursor key,
+            `offset` should be ignored. `id` is `uid` for tokens.
 
         :keyword auth_token: (str) The authentication token used by a third
             party
@@ -61,6 +88,54 @@ class Crud(ABC):
         """
         pass
 
+    @classmethod
+    async def list_version(
+        cls, module: ModuleID, role: RoleEnum, filters: dict, *args, **kwargs
+    ) -> Any:
+        """Get the version of the list of objects (optional)
+
+        Used by list endpoints for conditional GET requests when the
+        application is initialized with `conditional_get=True`. Requests
+        with ETag of the same version are answered with `304 Not Modified`
+        without calling `list`. Version must change whenever `list` with
+        the same filters would return other objects, e.g. max last_updated
+        and amount of the objects. Return None, as by default, to compare
+        the listed objects.
+
+        :param module: The OCPI module
+        :param role: The role of the caller
+        :param filters: OCPI pagination filters
+
+        Accepts the same keyword arguments as `list`.
+
+        :return: The list version, None to compare the listed objects
+        :rtype: Any
+        """
+        return None
+
+    @classmethod
+    async def list_iter(
+        cls, module: ModuleID, role: RoleEnum, filters: dict, *args, **kwargs
+    ) -> Tuple[AsyncIterator[Any], int, bool]:
+        """Get the list of objects as an async iterator
+
+        Used by list endpoints when the application is initialized with
+        `list_streaming=True`. Override it to yield objects straight from
+        a database cursor, by default objects returned by `list` are
+        iterated.
+
+        :param module: The OCPI module
+        :param role: The role of the caller
+        :param filters: OCPI pagination filters
+
+        Accepts the same keyword arguments as `list`.
+
+        :return:  Objects async iterator, Total number of objects, if
+            it's the last page or not(for pagination)
+        :rtype: Tuple[AsyncIterator[Any], int, bool]
+        """
+        return await iterate_list(cls, module, role, filters, *args, **kwargs)
+
     @abstractmethod
     async def create(
         cls, module: ModuleID, role: RoleEnum, data: dict, *args, **kwargs
@@ -98,6 +173,9 @@ class Crud(ABC):
     ) -> Any:
         """Update an object
 
+        On `PATCH` requests data is the object returned by `get`,
+        converted with the adapter, with the changed fields merged in.
+
         :param module: The OCPI module
         :param role: The role of the caller
         :param data: The object details
@@ -117,6 +195,35 @@ class Crud(ABC):
         """
         pass
 
+    @classmethod
+    async def bulk_upsert(
+        cls,
+        module: ModuleID,
+        role: RoleEnum,
+        data: List[dict],
+        *args,
+        **kwargs,
+    ) -> Dict[int, str]:
+        """Create or update several objects at once
+
+        Used by the bulk import with chunks of validated objects. Override
+        it to write the chunk with one database call, by default each
+        object is looked up with `get` and stored with `update` or
+        `create` concurrently, `country_code` and `party_id` keyword
+        arguments are taken from the object.
+
+        :param module: The OCPI module
+        :param role: The role of the caller
+        :param data: The objects details
+
+        Accepts the same keyword arguments as `update`.
+
+        :return: Errors of the objects which weren't stored by their index
+            in data
+        :rtype: Dict[int, str]
+        """
+        return await upsert_each(cls, module, role, data, *args, **kwargs)
+
     @abstractmethod
     async def delete(
         cls, module: ModuleID, role: RoleEnum, id, *args, **kwargs
@@ -168,3 +275,251 @@ class Crud(ABC):
         :rtype: Any
         """
         pass
+
+    @classmethod
+    async def get_evse(
+        cls,
+        module: ModuleID,
+        role: RoleEnum,
+        location_id: Any,
+        evse_uid: Any,
+        *args,
+        **kwargs,
+    ) -> Any:
+        """Get an EVSE of the location (optional)
+
+        Used by eMSP locations endpoints instead of loading the whole
+        location with `get` when crud overrides it, otherwise the EVSE is
+        taken from the location.
+
+        :param module: The OCPI module
+        :param role: The role of the caller
+        :param location_id: The ID of the location
+        :param evse_uid: The UID of the EVSE
+
+        Accepts the same keyword arguments as `get`.
+
+        :return: The EVSE data in OCPI schema, None if it's not found
+        :rtype: Any
+        """
+        pass
+
+    @classmethod
+    async def get_connector(
+        cls,
+        module: ModuleID,
+        role: RoleEnum,
+        location_id: Any,
+        evse_uid: Any,
+        connector_id: Any,
+        *args,
+        **kwargs,
+    ) -> Any:
+        """Get a connector of the EVSE (optional)
+
+        Used instead of loading the whole location with `get` when crud
+        overrides it, otherwise the connector is taken from the location.
+
+        :param module: The OCPI module
+        :param role: The role of the caller
+        :param location_id: The ID of the location
+        :param evse_uid: The UID of the EVSE
+        :param connector_id: The ID of the connector
+
+        Accepts the same keyword arguments as `get`.
+
+        :return: The connector data in OCPI schema, None if it's not found
+        :rtype: Any
+        """
+        pass
+
+    @classmethod
+    async def upsert_evse(
+        cls,
+        module: ModuleID,
+        role: RoleEnum,
+        data: dict,
+        location_id: Any,
+        evse_uid: Any,
+        *args,
+        **kwargs,
+    ) -> Any:
+        """Create or replace an EVSE of the location (optional)
+
+        Used when crud overrides it, otherwise the location is loaded with
+        `get` and stored with `update`.
+
+        :param module: The OCPI module
+        :param role: The role of the caller
+        :param data: The EVSE details
+        :param location_id: The ID of the location
+        :param evse_uid: The UID of the EVSE
+
+        Accepts the same keyword arguments as `update`.
+
+        :return: The stored EVSE data, None if the location is not found
+        :rtype: Any
+        """
+        pass
+
+    @classmethod
+    async def upsert_connector(
+        cls,
+        module: ModuleID,
+        role: RoleEnum,
+        data: dict,
+        location_id: Any,
+        evse_uid: Any,
+        connector_id: Any,
+        *args,
+        **kwargs,
+    ) -> Any:
+        """Create or replace a connector of the EVSE (optional)
+
+        Used when crud overrides it, otherwise the location is loaded with
+        `get` and stored with `update`.
+
+        :param module: The OCPI module
+        :param role: The role of the caller
+        :param data: The connector details
+        :param location_id: The ID of the location
+        :param evse_uid: The UID of the EVSE
+        :param connector_id: The ID of the connector
+
+        Accepts the same keyword arguments as `update`.
+
+        :return: The stored connector data, None if the location or EVSE
+            is not found
+        :rtype: Any
+        """
+        pass
+
+    @classmethod
+    async def patch_evse(
+        cls,
+        module: ModuleID,
+        role: RoleEnum,
+        data: dict,
+        location_id: Any,
+        evse_uid: Any,
+        *args,
+        **kwargs,
+    ) -> Any:
+        """Update fields of an EVSE (optional)
+
+        Used when crud overrides it, otherwise the location is loaded with
+        `get` and stored with `update`.
+
+        :param module: The OCPI module
+        :param role: The role of the caller
+        :param data: The changed EVSE fields
+        :param location_id: The ID of the location
+        :param evse_uid: The UID of the EVSE
+
+        Accepts the same keyword arguments as `update`.
+
+        :return: The updated EVSE data, None if it's not found
+        :rtype: Any
+        """
+        pass
+
+    @classmethod
+    async def patch_connector(
+        cls,
+        module: ModuleID,
+        role: RoleEnum,
+        data: dict,
+        location_id: Any,
+        evse_uid: Any,
+        connector_id: Any,
+        *args,
+        **kwargs,
+    ) -> Any:
+        """Update fields of a connector (optional)
+
+        Used when crud overrides it, otherwise the location is loaded with
+        `get` and stored with `update`.
+
+        :param module: The OCPI module
+        :param role: The role of the caller
+        :param data: The changed connector fields
+        :param location_id: The ID of the location
+        :param evse_uid: The UID of the EVSE
+        :param connector_id: The ID of the connector
+
+        Accepts the same keyword arguments as `update`.
+
+        :return: The updated connector data, None if it's not found
+        :rtype: Any
+        """
+        pass
+
+
+async def upsert_each(
+    crud: Any,
+    module: ModuleID,
+    role: RoleEnum,
+    data: List[dict],
+    *args,
+    **kwargs,
+) -> Dict[int, str]:
+    """Default `bulk_upsert`, store objects one by one concurrently."""
+
+    async def upsert(item: dict) -> None:
+        object_id = item["uid" if module == ModuleID.tokens else "id"]
+        item_kwargs = dict(
+            kwargs,
+            country_code=item.get("country_code"),
+            party_id=item.get("party_id"),
+        )
+        if await crud.get(module, role, object_id, *args, **item_kwargs):
+            await crud.update(
+                module, role, item, object_id, *args, **item_kwargs
+            )
+        else:
+            await crud.create(module, role, item, *args, **item_kwargs)
+
+    results = await asyncio.gather(
+        *(upsert(item) for item in data), return_exceptions=True
+    )
+    return {
+        index: str(result)
+        for index, result in enumerate(results)
+        if isinstance(result, Exception)
+    }
+
+
+async def get_each(
+    crud: Any, module: ModuleID, role: RoleEnum, queries: List[dict]
+) -> List[Any]:
+    """Default `get_many`, call `crud.get` for each query concurrently."""
+
+    async def get(query: dict) -> Any:
+        query = dict(query)
+        return await crud.get(module, role, query.pop("id"), **query)
+
+    return list(await asyncio.gather(*(get(query) for query in queries)))
+
+
+async def iterate_list(
+    crud: Any, module: ModuleID, role: RoleEnum, filters: dict, *args, **kwargs
+) -> Tuple[AsyncIterator[Any], int, bool]:
+    """Default `list_iter`, iterate objects returned by `crud.list`."""
+    data_list, total, is_last_page = await crud.list(
+        module, role, filters, *args, **kwargs
+    )
+
+    async def iterate() -> AsyncIterator[Any]:
+        for data in data_list:
+            yield data
+
+    return iterate(), total, is_last_page
+
+
+def overrides(crud: Any, name: str) -> bool:
+    """Return True if crud has its own implementation of optional method."""
+    method = getattr(crud, name, None)
+    if method is None:
+        return False
+    default = getattr(Crud, name).__func__
+    return getattr(method, "__func__", method) is not default
@@ -3,12 +3,30 @@ OCPI data types based on https://github.com/ocpi/ocpi/blob/2.2.1/types.asciidoc
 """
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Type
 from pydantic.fields import ModelField
 
 from .config import settings
 
 
+def validate_string(v, max_length: int, field: ModelField) -> str:
+    """Return v if it's a valid UTF-8 string of at most max_length."""
+    if not isinstance(v, str):
+        raise TypeError(f"excpected string but received {type(v)}")
+    # only strings with lone surrogates can't be encoded
+    if not v.isascii():
+        try:
+            v.encode("UTF-8")
+        except UnicodeError as e:
+            raise ValueError("invalid string format") from e
+    if len(v) > max_length:
+        raise ValueError(
+            f"{field.name} length must be lower or equal to {max_length}"
+        )
+    return v
+
+
 class StringBase(str):
     """
     Case sensitive String. Only printable UTF-8 allowed.
@@ -30,25 +48,32 @@ class StringBase(str):
 
     @classmethod
     def validate(cls, v, field: ModelField):
-        if not isinstance(v, str):
-            raise TypeError(f"excpected string but received {type(v)}")
-        try:
-            v.encode("UTF-8")
-        except UnicodeError as e:
-            raise ValueError("invalid string format") from e
-        if len(v) > cls.max_length:
-            raise ValueError(
-                f"{field.name} length must be lower or equal to {cls.max_length}"
-            )
-        return cls(v)
+        # already validated, e.g. data of another model
+        if type(v) is cls and len(v) <= cls.max_length:
+            return v
+        return cls(validate_string(v, cls.max_length, field))
 
     def __repr__(self):
         return f"String({super().__repr__()})"
 
+    def __reduce__(self):
+        # String types are created by String(max_length), so they can't
+        # be pickled by reference, e.g. to be sent to another process
+        return make_string, (self.max_length, str(self))
+
+
+@lru_cache(maxsize=None)
+def string_type(max_length: int) -> Type[str]:
+    return type("String", (StringBase,), {"max_length": max_length})
+
 
 class String:
     def __new__(cls, max_length: int = 255) -> Type[str]:  # type: ignore
-        return type("String", (StringBase,), {"max_length": max_length})
+        return string_type(max_length)
+
+
+def make_string(max_length: int, value: str) -> str:
+    return string_type(max_length)(value)
 
 
 class CiStringBase(str):
@@ -89,10 +114,22 @@ class CiStringBase(str):
     def __repr__(self):
         return f"CiString({super().__repr__()})"
 
+    def __reduce__(self):
+        return make_ci_string, (self.max_length, str(self))
+
+
+@lru_cache(maxsize=None)
+def ci_string_type(max_length: int) -> type:
+    return type("CiString", (CiStringBase,), {"max_length": max_length})
+
 
 class CiString:
     def __new__(cls, max_length: int = 255) -> type:  # type: ignore
-        return type("CiString", (CiStringBase,), {"max_length": max_length})
+        return ci_string_type(max_length)
+
+
+def make_ci_string(max_length: int, value: str) -> str:
+    return ci_string_type(max_length)(value)
 
 
 class URL(str):
@@ -113,13 +150,66 @@ class URL(str):
 
     @classmethod
     def validate(cls, v, field: ModelField):
-        v = String(255).validate(v, field)  # type: ignore
-        return cls(v)
+        if type(v) is cls and len(v) <= 255:
+            return v
+        return cls(validate_string(v, 255, field))
 
     def __repr__(self):
         return f"URL({super().__repr__()})"
 
 
+def format_datetime(v) -> str:
+    if v.endswith("Z"):
+        v = f"{v[:-1]}+00:00"
+
+    try:
+        formatted_v = datetime.fromisoformat(v)
+    except ValueError as e:
+        raise ValueError(f"Invalid RFC 3339 timestamp: {v}") from e
+
+    offset = formatted_v.utcoffset()
+    if offset:
+        return formatted_v.isoformat(timespec="seconds")
+    # same as isoformat with `Z` suffix for UTC, but cheaper
+    return "%04d-%02d-%02dT%02d:%02d:%02d%s" % (
+        formatted_v.year,
+        formatted_v.month,
+        formatted_v.day,
+        formatted_v.hour,
+        formatted_v.minute,
+        formatted_v.second,
+        "" if offset is None else "Z",
+    )
+
+
+def is_canonical_datetime(v: str) -> bool:
+    """Check if v looks like `2022-01-02T00:00:00Z`."""
+    return (
+        len(v) == 20
+        and v[19] == "Z"
+        and v[10] == "T"
+        and v[4] == v[7] == "-"
+        and v[13] == v[16] == ":"
+    )
+
+
+@lru_cache(maxsize=4096)
+def normalize_datetime(v: str) -> str:
+    """
+    Return the timestamp formatted as `2022-01-02T00:00:00Z`.
+
+    Timestamps already in this format are only checked to be valid dates,
+    results of repeated values, e.g. `last_updated` of a list, are cached.
+    """
+    if is_canonical_datetime(v):
+        try:
+            datetime.fromisoformat(v[:19])
+        except ValueError as e:
+            raise ValueError(f"Invalid RFC 3339 timestamp: {v}") from e
+        return v
+    return format_datetime(v)
+
+
 class DateTime(str):
     """
     All timestamps are formatted as string(25) following RFC 3339,
@@ -147,17 +237,9 @@ class DateTime(str):
 
     @classmethod
     def validate(cls, v):
-        if v.endswith("Z"):
-            v = f"{v[:-1]}+00:00"
-
-        try:
-            formatted_v = datetime.fromisoformat(v)
-        except ValueError as e:
-            raise ValueError(f"Invalid RFC 3339 timestamp: {v}") from e
-
-        return cls(
-            formatted_v.isoformat(timespec="seconds").replace("+00:00", "Z")
-        )
+        if isinstance(v, str):
+            return cls(normalize_datetime(v))
+        return cls(format_datetime(v))
 
     def __repr__(self):
         return f"DateTime({super().__repr__()})"
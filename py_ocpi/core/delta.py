@@ -0,0 +1,197 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from py_ocpi.core.config import logger, settings
+from py_ocpi.core.enums import ModuleID
+from py_ocpi.modules.versions.enums import VersionNumber
+
+SnapshotKey = Tuple[str, str, str, str]
+Patch = Tuple[str, dict]
+
+# modules which receiver interface supports PATCH, CDRs are never patched
+PATCH_MODULES: Dict[VersionNumber, Set[ModuleID]] = {
+    VersionNumber.v_2_2_1: {
+        ModuleID.locations,
+        ModuleID.sessions,
+        ModuleID.tokens,
+    },
+    VersionNumber.v_2_1_1: {
+        ModuleID.locations,
+        ModuleID.sessions,
+        ModuleID.tariffs,
+        ModuleID.tokens,
+    },
+}
+
+
+def supports_patch(version: VersionNumber, module_id: ModuleID) -> bool:
+    return module_id in PATCH_MODULES.get(version, set())
+
+
+def changed_fields(
+    baseline: dict, data: dict, exclude: Tuple[str, ...] = ()
+) -> Optional[dict]:
+    """Return fields of data which differ from baseline.
+
+    None is returned if fields were added or removed, such change
+    can't be expressed with PATCH.
+    """
+    if baseline.keys() != data.keys():
+        return None
+    return {
+        key: value
+        for key, value in data.items()
+        if key not in exclude and baseline[key] != value
+    }
+
+
+def with_last_updated(fields: dict, data: dict) -> dict:
+    # receivers require last_updated in every PATCH request
+    if "last_updated" in data:
+        return {**fields, "last_updated": data["last_updated"]}
+    return fields
+
+
+def index_by(items: Optional[list], key: str) -> Optional[Dict[str, dict]]:
+    items = items or []
+    indexed = {item.get(key): item for item in items}
+    if len(indexed) != len(items) or None in indexed:
+        return None
+    return indexed
+
+
+def object_patches(baseline: dict, data: dict) -> Optional[List[Patch]]:
+    fields = changed_fields(baseline, data)
+    if fields is None:
+        return None
+    return [("", with_last_updated(fields, data))]
+
+
+def location_patches(baseline: dict, data: dict) -> Optional[List[Patch]]:
+    """
+    Return PATCH requests of changed location, EVSEs and connectors.
+
+    Parent objects are patched only if their own fields changed, since
+    receivers update last_updated of the parents of patched EVSE or
+    connector themselves. Adding or removing EVSEs and connectors
+    requires the full object.
+    """
+    fields = changed_fields(baseline, data, exclude=("evses",))
+    evses = index_by(data.get("evses"), "uid")
+    baseline_evses = index_by(baseline.get("evses"), "uid")
+    if (
+        fields is None
+        or evses is None
+        or baseline_evses is None
+        or evses.keys() != baseline_evses.keys()
+    ):
+        return None
+
+    patches: List[Patch] = []
+    for uid, evse in evses.items():
+        baseline_evse = baseline_evses[uid]
+        evse_fields = changed_fields(
+            baseline_evse, evse, exclude=("connectors",)
+        )
+        connectors = index_by(evse.get("connectors"), "id")
+        baseline_connectors = index_by(baseline_evse.get("connectors"), "id")
+        if (
+            evse_fields is None
+            or connectors is None
+            or baseline_connectors is None
+            or connectors.keys() != baseline_connectors.keys()
+        ):
+            return None
+
+        connector_patches: List[Patch] = []
+        for connector_id, connector in connectors.items():
+            connector_fields = changed_fields(
+                baseline_connectors[connector_id], connector
+            )
+            if connector_fields is None:
+                return None
+            if connector_fields:
+                connector_patches.append(
+                    (
+                        f"/{uid}/{connector_id}",
+                        with_last_updated(connector_fields, connector),
+                    )
+                )
+
+        evse_fields.pop("last_updated", None)
+        if evse_fields:
+            patches.append((f"/{uid}", with_last_updated(evse_fields, evse)))
+        patches.extend(connector_patches)
+
+    fields.pop("last_updated", None)
+    if fields or not patches:
+        patches.insert(0, ("", with_last_updated(fields, data)))
+    return patches
+
+
+def get_patches(
+    module_id: ModuleID, baseline: dict, data: dict
+) -> Optional[List[Patch]]:
+    """
+    Return PATCH requests turning baseline into data.
+
+    Each request is a tuple of object url suffix and request body.
+    None means the full object has to be sent.
+    """
+    if module_id == ModuleID.locations:
+        patches = location_patches(baseline, data)
+    else:
+        patches = object_patches(baseline, data)
+
+    if patches is not None and len(patches) > settings.PUSH_DELTA_MAX_PATCHES:
+        return None
+    return patches
+
+
+class PushSnapshotCache:
+    """
+    Objects last delivered to push receivers.
+
+    Keeps up to `PUSH_DELTA_CACHE_SIZE` objects, least recently pushed
+    are dropped first. Snapshot is dropped whenever delivery fails, so the
+    next push sends the full object.
+    """
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[SnapshotKey, dict]" = OrderedDict()
+
+    def get_patches(
+        self,
+        key: SnapshotKey,
+        module_id: ModuleID,
+        data: dict,
+    ) -> Optional[List[Patch]]:
+        """Return PATCH requests for the receiver or None to send PUT."""
+        baseline = self._entries.get(key)
+        if baseline is None:
+            return None
+        return get_patches(module_id, baseline, data)
+
+    def update(self, key: SnapshotKey, data: dict, delivered: bool) -> None:
+        if not delivered:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.PUSH_DELTA_CACHE_SIZE:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, endpoints_url: Optional[str] = None) -> None:
+        """Drop snapshots of given receiver or all."""
+        logger.debug("Invalidate push snapshots of `%s`." % endpoints_url)
+        if endpoints_url is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == endpoints_url]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+push_snapshots = PushSnapshotCache()
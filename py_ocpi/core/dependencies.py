@@ -1,13 +1,17 @@
 from datetime import datetime
 
-from fastapi import Query
+from fastapi import Depends, HTTPException, Query, status as fastapistatus
 
 from py_ocpi.core.adapter import Adapter
 from py_ocpi.core.authentication.authenticator import Authenticator
 from py_ocpi.core.config import settings
 from py_ocpi.core.crud import Crud
 from py_ocpi.core.data_types import URL
+from py_ocpi.core.enums import PaginationMode
+from py_ocpi.core.http_client import http_client_manager
+from py_ocpi.core.utils import decode_cursor
 from py_ocpi.modules.versions.enums import VersionNumber
+from py_ocpi.modules.versions.responses import DiscoveryResponses
 from py_ocpi.modules.versions.schemas import Version
 
 
@@ -43,15 +47,46 @@ def get_modules():
     return []
 
 
+def get_discovery_responses():
+    return DiscoveryResponses()
+
+
+def get_http_client():
+    return http_client_manager.client
+
+
+def get_outbox():
+    return None
+
+
+def get_list_streaming():
+    return False
+
+
+def get_pagination_mode():
+    return PaginationMode.offset
+
+
 def pagination_filters(
     date_from: datetime = Query(default=None),
     date_to: datetime = Query(default=None),
     offset: int = Query(default=0),
     limit: int = Query(default=50),
+    cursor: str = Query(default=None),
+    pagination_mode: PaginationMode = Depends(get_pagination_mode),
 ):
-    return {
+    filters = {
         "date_from": date_from,
         "date_to": date_to,
         "offset": offset,
         "limit": limit,
     }
+    if pagination_mode == PaginationMode.cursor:
+        try:
+            filters["cursor"] = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(
+                fastapistatus.HTTP_400_BAD_REQUEST,
+                "Invalid pagination cursor",
+            )
+    return filters
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from py_ocpi.core.config import logger, settings
+
+CacheKey = Tuple[str, str]
+
+
+class VersionDetailsCache:
+    """
+    Cache of endpoints returned by version details of push receivers.
+
+    Endpoints are cached per receiver (version details url and token) for
+    `PUSH_ENDPOINTS_CACHE_TTL` seconds. During the next
+    `PUSH_ENDPOINTS_CACHE_STALE_TTL` seconds stale endpoints are returned
+    while they are refreshed in background. Credentials module invalidates
+    endpoints of the party whenever its credentials are changed.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[CacheKey, Tuple[float, list]] = {}
+        self._pending: Dict[CacheKey, asyncio.Future] = {}
+        self._refreshing: Dict[CacheKey, asyncio.Task] = {}
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        endpoints_url: str,
+        auth_token: str,
+        fetch: Callable[[], Awaitable[list]],
+    ) -> list:
+        """
+        Return endpoints of the receiver, use fetch on cache miss.
+
+        :param endpoints_url: Version details url of the receiver.
+        :param auth_token: Token used to request version details.
+        :param fetch: Coroutine function requesting receiver endpoints.
+        """
+        ttl = settings.PUSH_ENDPOINTS_CACHE_TTL
+        if ttl <= 0:
+            return await fetch()
+
+        key = (endpoints_url, auth_token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < ttl:
+                self.hits += 1
+                return entry[1]
+            if age < ttl + settings.PUSH_ENDPOINTS_CACHE_STALE_TTL:
+                self.stale_hits += 1
+                self.refresh_in_background(key, fetch)
+                return entry[1]
+
+        self.misses += 1
+        return await self.load(key, fetch)
+
+    async def load(
+        self, key: CacheKey, fetch: Callable[[], Awaitable[list]]
+    ) -> list:
+        # concurrent pushes to the same receiver share one request
+        pending = self._pending.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # request which was awaited got cancelled, send a new one
+                return await self.load(key, fetch)
+
+        generation = self._generation
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            endpoints = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # exception is re-raised here, mark it as retrieved
+            future.exception()
+            raise
+        else:
+            # don't store endpoints requested before invalidation
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic(), endpoints)
+            future.set_result(endpoints)
+            return endpoints
+        finally:
+            self._pending.pop(key, None)
+
+    def refresh_in_background(
+        self, key: CacheKey, fetch: Callable[[], Awaitable[list]]
+    ) -> None:
+        if key in self._refreshing or key in self._pending:
+            return
+
+        async def refresh():
+            try:
+                await self.load(key, fetch)
+            except Exception as e:
+                logger.warning(
+                    "Refresh of `%s` endpoints failed: %s" % (key[0], e)
+                )
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def invalidate(self, endpoints_url: Optional[str] = None) -> None:
+        """Drop cached endpoints of given version details url or all."""
+        logger.debug("Invalidate endpoints cache of `%s`." % endpoints_url)
+        self._generation += 1
+        if endpoints_url is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == endpoints_url]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        """Return hit and miss counters."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+        }
+
+
+version_details_cache = VersionDetailsCache()
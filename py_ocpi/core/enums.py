@@ -56,6 +56,13 @@ class Action(str, Enum):
     send_update_charging_profile = "SendUpdateChargingProfile"  # nosec
 
 
+class PaginationMode(str, Enum):
+    # OCPI offset/limit pagination
+    offset = "offset"
+    # keyset pagination on (last_updated, id) with an opaque cursor
+    cursor = "cursor"
+
+
 class EnvironmentType(str, Enum):
     production = "production"
     development = "development"
@@ -12,3 +12,9 @@ class AuthorizationOCPIError(OCPIError):
 class NotFoundOCPIError(OCPIError):
     def __str__(self):
         return "Object not found."
+
+
+class PullError(OCPIError):
+    """
+    List of the other party couldn't be pulled
+    """
@@ -0,0 +1,140 @@
+import asyncio
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+from py_ocpi.core.config import logger, settings
+
+HostKey = Tuple[str, str, Optional[int]]
+
+
+class ReleasingByteStream(httpx.AsyncByteStream):
+    """Response stream releasing host semaphore once it's closed."""
+
+    def __init__(
+        self, stream: httpx.AsyncByteStream, semaphore: asyncio.Semaphore
+    ) -> None:
+        self.stream = stream
+        self.semaphore = semaphore
+        self.released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            if not self.released:
+                self.released = True
+                self.semaphore.release()
+
+
+class PerHostLimitTransport(httpx.AsyncBaseTransport):
+    """
+    Transport limiting the amount of concurrent requests per host.
+
+    httpx limits connections of the whole pool only, so a single slow
+    partner could take all of them.
+
+    :param transport: Transport which sends the requests.
+    :param max_per_host: Max amount of requests sent to one host at a time.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, max_per_host: int
+    ) -> None:
+        self.transport = transport
+        self.max_per_host = max_per_host
+        self.semaphores: Dict[HostKey, asyncio.Semaphore] = {}
+
+    def get_semaphore(self, url: httpx.URL) -> asyncio.Semaphore:
+        key = (url.scheme, url.host, url.port)
+        semaphore = self.semaphores.get(key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_host)
+            self.semaphores[key] = semaphore
+        return semaphore
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        semaphore = self.get_semaphore(request.url)
+        await semaphore.acquire()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        if response.is_closed:
+            # content was already read, e.g. by mock transports
+            semaphore.release()
+            return response
+        response.stream = ReleasingByteStream(
+            response.stream, semaphore  # type: ignore
+        )
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Return HTTP client configured with `HTTP_CLIENT_*` settings."""
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=(
+            settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        settings.HTTP_CLIENT_TIMEOUT,
+        connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+    )
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+        limits=limits,
+        http2=settings.HTTP_CLIENT_HTTP2,
+    )
+    if settings.HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST > 0:
+        transport = PerHostLimitTransport(
+            transport, settings.HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST
+        )
+    logger.debug("Create shared HTTP client.")
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+class HTTPClientManager:
+    """
+    Holder of the HTTP client shared by all outbound OCPI requests.
+
+    The client is created on application startup, or lazily on first use
+    if startup events weren't run, and closed on shutdown.
+
+    :param client: Client to use instead of the default one, e.g. a stub
+      in tests. It isn't closed by the manager.
+    """
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None) -> None:
+        self._client = client
+        self._owned = client is None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or (self._owned and self._client.is_closed):
+            self._client = create_http_client()
+        return self._client
+
+    async def startup(self) -> None:
+        self.client
+
+    async def shutdown(self) -> None:
+        if self._owned and self._client is not None:
+            logger.debug("Close shared HTTP client.")
+            await self._client.aclose()
+            self._client = None
+
+
+# used when no client is given, closed on shutdown of OCPI applications
+http_client_manager = HTTPClientManager()
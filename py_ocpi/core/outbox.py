@@ -0,0 +1,508 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+from py_ocpi.core.adapter import Adapter
+from py_ocpi.core.config import logger, settings
+from py_ocpi.core.crud import Crud
+from py_ocpi.core.enums import ModuleID
+from py_ocpi.core.http_client import HTTPClientManager, http_client_manager
+from py_ocpi.core.push import push_object
+from py_ocpi.core.schemas import Push, Receiver
+from py_ocpi.modules.versions.enums import VersionNumber
+
+JobKey = Tuple[str, str, str, str]
+
+
+@dataclass
+class OutboxJob:
+    """
+    Delivery of one object to one receiver.
+
+    Object data isn't stored, it's loaded from crud right before
+    the delivery, so the latest state of the object is always sent.
+
+    :param auth_token: Token of the party which requested the push,
+      passed to crud when the object is loaded.
+    :param revision: Incremented whenever an update of the same object
+      for the same receiver is enqueued while the job is waiting.
+    """
+
+    version: VersionNumber
+    module_id: ModuleID
+    object_id: str
+    receiver: Receiver
+    auth_token: Optional[str] = None
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    revision: int = 0
+    last_error: Optional[str] = None
+
+    @property
+    def key(self) -> JobKey:
+        return (
+            self.version.value,
+            self.module_id.value,
+            self.object_id,
+            self.receiver.endpoints_url,
+        )
+
+
+class OutboxBackend(ABC):
+    """Storage of outbox jobs, coalesced by object and receiver."""
+
+    @abstractmethod
+    async def put(self, job: OutboxJob) -> bool:
+        """Store the job.
+
+        :return: True if the job was coalesced with a waiting one.
+        """
+        pass
+
+    @abstractmethod
+    async def lease(
+        self, limit: int, now: float, lease_until: float
+    ) -> List[OutboxJob]:
+        """Return due jobs and postpone them until `lease_until`.
+
+        Leased jobs aren't returned again while they are delivered, jobs
+        of a crashed worker become due once the lease expires.
+        """
+        pass
+
+    @abstractmethod
+    async def complete(self, job: OutboxJob, now: float) -> None:
+        """Remove delivered job.
+
+        If the job was updated during the delivery it's kept and
+        scheduled for immediate delivery of the new state.
+        """
+        pass
+
+    @abstractmethod
+    async def retry(self, job: OutboxJob) -> None:
+        """Store attempts, next attempt time and last error of the job."""
+        pass
+
+    @abstractmethod
+    async def discard(self, job: OutboxJob) -> None:
+        """Remove job which ran out of attempts."""
+        pass
+
+    @abstractmethod
+    async def size(self) -> int:
+        """Return amount of stored jobs."""
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryOutboxBackend(OutboxBackend):
+    """Outbox backend keeping jobs in memory of the process."""
+
+    def __init__(self) -> None:
+        self.jobs: Dict[JobKey, OutboxJob] = {}
+
+    async def put(self, job: OutboxJob) -> bool:
+        waiting = self.jobs.get(job.key)
+        if waiting is None:
+            self.jobs[job.key] = replace(job)
+            return False
+        waiting.receiver = job.receiver
+        waiting.auth_token = job.auth_token
+        waiting.revision += 1
+        return True
+
+    async def lease(
+        self, limit: int, now: float, lease_until: float
+    ) -> List[OutboxJob]:
+        due = sorted(
+            (job for job in self.jobs.values() if job.next_attempt_at <= now),
+            key=lambda job: job.next_attempt_at,
+        )[:limit]
+        for job in due:
+            job.next_attempt_at = lease_until
+        return [replace(job) for job in due]
+
+    async def complete(self, job: OutboxJob, now: float) -> None:
+        stored = self.jobs.get(job.key)
+        if stored is None:
+            return
+        if stored.revision == job.revision:
+            del self.jobs[job.key]
+        else:
+            stored.attempts = 0
+            stored.next_attempt_at = now
+
+    async def retry(self, job: OutboxJob) -> None:
+        stored = self.jobs.get(job.key)
+        if stored is not None:
+            stored.attempts = job.attempts
+            stored.next_attempt_at = job.next_attempt_at
+            stored.last_error = job.last_error
+
+    async def discard(self, job: OutboxJob) -> None:
+        self.jobs.pop(job.key, None)
+
+    async def size(self) -> int:
+        return len(self.jobs)
+
+
+class SQLiteOutboxBackend(OutboxBackend):
+    """
+    Outbox backend keeping jobs in a local SQLite database.
+
+    Jobs survive restarts of the application. Queries are run in
+    a thread, so they don't block the event loop.
+
+    :param path: Path of the database file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "version TEXT NOT NULL, "
+                "module_id TEXT NOT NULL, "
+                "object_id TEXT NOT NULL, "
+                "endpoints_url TEXT NOT NULL, "
+                "auth_token TEXT NOT NULL, "
+                "requester_auth_token TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "next_attempt_at REAL NOT NULL DEFAULT 0, "
+                "revision INTEGER NOT NULL DEFAULT 0, "
+                "last_error TEXT, "
+                "PRIMARY KEY (version, module_id, object_id, endpoints_url))"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS outbox_next_attempt_at "
+                "ON outbox (next_attempt_at)"
+            )
+            columns = [
+                row[1]
+                for row in self.connection.execute("PRAGMA table_info(outbox)")
+            ]
+            if "requester_auth_token" not in columns:
+                self.connection.execute(
+                    "ALTER TABLE outbox ADD COLUMN requester_auth_token TEXT"
+                )
+
+    async def run(self, query: str, *params) -> sqlite3.Cursor:
+        def execute() -> sqlite3.Cursor:
+            with self.lock, self.connection:
+                return self.connection.execute(query, params)
+
+        return await asyncio.to_thread(execute)
+
+    async def put(self, job: OutboxJob) -> bool:
+        cursor = await self.run(
+            "UPDATE outbox SET revision = revision + 1, auth_token = ?, "
+            "requester_auth_token = ? WHERE version = ? AND module_id = ? "
+            "AND object_id = ? AND endpoints_url = ?",
+            job.receiver.auth_token,
+            job.auth_token,
+            *job.key,
+        )
+        if cursor.rowcount:
+            return True
+        await self.run(
+            "INSERT INTO outbox (version, module_id, object_id, "
+            "endpoints_url, auth_token, requester_auth_token, attempts, "
+            "next_attempt_at, revision) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            *job.key,
+            job.receiver.auth_token,
+            job.auth_token,
+            job.attempts,
+            job.next_attempt_at,
+            job.revision,
+        )
+        return False
+
+    async def lease(
+        self, limit: int, now: float, lease_until: float
+    ) -> List[OutboxJob]:
+        def execute() -> List[tuple]:
+            with self.lock, self.connection:
+                rows = self.connection.execute(
+                    "SELECT version, module_id, object_id, endpoints_url, "
+                    "auth_token, attempts, next_attempt_at, revision, "
+                    "last_error, requester_auth_token FROM outbox "
+                    "WHERE next_attempt_at <= ? "
+                    "ORDER BY next_attempt_at LIMIT ?",
+                    (now, limit),
+                ).fetchall()
+                self.connection.executemany(
+                    "UPDATE outbox SET next_attempt_at = ? "
+                    "WHERE version = ? AND module_id = ? AND object_id = ? "
+                    "AND endpoints_url = ?",
+                    [(lease_until, *row[:4]) for row in rows],
+                )
+                return rows
+
+        rows = await asyncio.to_thread(execute)
+        return [
+            OutboxJob(
+                version=VersionNumber(row[0]),
+                module_id=ModuleID(row[1]),
+                object_id=row[2],
+                receiver=Receiver(endpoints_url=row[3], auth_token=row[4]),
+                auth_token=row[9],
+                attempts=row[5],
+                next_attempt_at=lease_until,
+                revision=row[7],
+                last_error=row[8],
+            )
+            for row in rows
+        ]
+
+    async def complete(self, job: OutboxJob, now: float) -> None:
+        cursor = await self.run(
+            "DELETE FROM outbox WHERE version = ? AND module_id = ? "
+            "AND object_id = ? AND endpoints_url = ? AND revision = ?",
+            *job.key,
+            job.revision,
+        )
+        if not cursor.rowcount:
+            await self.run(
+                "UPDATE outbox SET attempts = 0, next_attempt_at = ? "
+                "WHERE version = ? AND module_id = ? AND object_id = ? "
+                "AND endpoints_url = ?",
+                now,
+                *job.key,
+            )
+
+    async def retry(self, job: OutboxJob) -> None:
+        await self.run(
+            "UPDATE outbox SET attempts = ?, next_attempt_at = ?, "
+            "last_error = ? WHERE version = ? AND module_id = ? "
+            "AND object_id = ? AND endpoints_url = ?",
+            job.attempts,
+            job.next_attempt_at,
+            job.last_error,
+            *job.key,
+        )
+
+    async def discard(self, job: OutboxJob) -> None:
+        await self.run(
+            "DELETE FROM outbox WHERE version = ? AND module_id = ? "
+            "AND object_id = ? AND endpoints_url = ?",
+            *job.key,
+        )
+
+    async def size(self) -> int:
+        cursor = await self.run("SELECT COUNT(*) FROM outbox")
+        return cursor.fetchone()[0]
+
+    async def close(self) -> None:
+        self.connection.close()
+
+
+class Outbox:
+    """
+    Queue of pushes delivered in background.
+
+    Pushes are split into jobs per receiver. Updates of the same object
+    for the same receiver are coalesced while they wait, so bursts of
+    updates result in one delivery of the latest state. Jobs which failed
+    are retried with exponential backoff, `OUTBOX_MAX_ATTEMPTS` times.
+
+    :param backend: Storage of the jobs.
+    :param crud: Crud used to load objects.
+    :param adapter: Adapter used to transform objects.
+    :param http_client_manager: Holder of the client used for delivery.
+    """
+
+    def __init__(
+        self,
+        backend: OutboxBackend,
+        crud: Crud,
+        adapter: Adapter,
+        http_client_manager: HTTPClientManager = http_client_manager,
+    ) -> None:
+        self.backend = backend
+        self.crud = crud
+        self.adapter = adapter
+        self.http_client_manager = http_client_manager
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.coalesced = 0
+        self.delivered = 0
+        self.retried = 0
+        self.discarded = 0
+
+    async def enqueue(
+        self,
+        version: VersionNumber,
+        push: Push,
+        auth_token: Optional[str] = None,
+    ) -> int:
+        """
+        Store the push for delivery to its receivers.
+
+        :param auth_token: Token of the party which requested the push.
+
+        :return: Amount of receivers the update was coalesced for.
+        """
+        coalesced = 0
+        for receiver in push.receivers:
+            job = OutboxJob(
+                version=version,
+                module_id=push.module_id,
+                object_id=push.object_id,
+                receiver=receiver,
+                auth_token=auth_token,
+            )
+            coalesced += await self.backend.put(job)
+        self.enqueued += len(push.receivers)
+        self.coalesced += coalesced
+        logger.debug(
+            "Push of `%s` `%s` enqueued for %s receivers, %s coalesced."
+            % (push.module_id, push.object_id, len(push.receivers), coalesced)
+        )
+        self.wakeup.set()
+        return coalesced
+
+    async def process(self) -> int:
+        """Deliver one batch of due jobs, return amount of jobs."""
+        now = time.time()
+        jobs = await self.backend.lease(
+            settings.OUTBOX_BATCH_SIZE,
+            now,
+            now + settings.OUTBOX_LEASE_TIMEOUT,
+        )
+        if not jobs:
+            return 0
+
+        # object is loaded and adapted once for all of its receivers
+        groups: Dict[tuple, List[OutboxJob]] = defaultdict(list)
+        for job in jobs:
+            groups[
+                (job.version, job.module_id, job.object_id, job.auth_token)
+            ].append(job)
+
+        semaphore = asyncio.Semaphore(max(settings.PUSH_CONCURRENCY, 1))
+
+        async def deliver_group(group: List[OutboxJob]) -> None:
+            async with semaphore:
+                await self.deliver(group)
+
+        await asyncio.gather(
+            *(deliver_group(group) for group in groups.values())
+        )
+        return len(jobs)
+
+    async def deliver(self, jobs: List[OutboxJob]) -> None:
+        first = jobs[0]
+        push = Push(
+            module_id=first.module_id,
+            object_id=first.object_id,
+            receivers=[job.receiver for job in jobs],
+        )
+        try:
+            result = await push_object(
+                first.version,
+                push,
+                self.crud,
+                self.adapter,
+                auth_token=first.auth_token,
+                http_client=self.http_client_manager.client,
+            )
+        except Exception as e:
+            logger.warning(
+                "Push of `%s` `%s` failed: %s"
+                % (first.module_id, first.object_id, e)
+            )
+            for job in jobs:
+                await self.retry(job, str(e))
+            return
+
+        for job, response in zip(jobs, result.receiver_responses):
+            if 200 <= response.status_code < 300:
+                await self.backend.complete(job, time.time())
+                self.delivered += 1
+            else:
+                await self.retry(
+                    job,
+                    "Receiver responded with %s status code."
+                    % response.status_code,
+                )
+
+    async def retry(self, job: OutboxJob, error: str) -> None:
+        job.attempts += 1
+        job.last_error = error
+        if job.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            logger.warning(
+                "Push of `%s` `%s` to `%s` discarded after %s attempts: %s"
+                % (
+                    job.module_id,
+                    job.object_id,
+                    job.receiver.endpoints_url,
+                    job.attempts,
+                    error,
+                )
+            )
+            await self.backend.discard(job)
+            self.discarded += 1
+            return
+
+        delay = min(
+            settings.OUTBOX_RETRY_BASE_DELAY * 2 ** (job.attempts - 1),
+            settings.OUTBOX_RETRY_MAX_DELAY,
+        )
+        job.next_attempt_at = time.time() + delay
+        await self.backend.retry(job)
+        self.retried += 1
+
+    async def run(self) -> None:
+        """Deliver jobs until the outbox is stopped."""
+        while True:
+            try:
+                processed = await self.process()
+            except Exception as e:
+                logger.warning("Outbox processing failed: %s" % e)
+                processed = 0
+            if processed:
+                continue
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self.wakeup.wait(), settings.OUTBOX_POLL_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        if self.task is None:
+            self.wakeup = asyncio.Event()
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        await self.backend.close()
+
+    async def stats(self) -> dict:
+        """Return delivery counters and amount of waiting jobs."""
+        return {
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "discarded": self.discarded,
+            "waiting": await self.backend.size(),
+        }
@@ -0,0 +1,483 @@
+import asyncio
+import codecs
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from pydantic import ValidationError
+
+from py_ocpi.core import status
+from py_ocpi.core.bulk_import import bulk_upsert, format_validation_error
+from py_ocpi.core.config import logger, settings
+from py_ocpi.core.enums import ModuleID, RoleEnum
+from py_ocpi.core.exceptions import PullError
+from py_ocpi.core.http_client import http_client_manager
+from py_ocpi.core.utils import encode_string_base64, get_module_model
+from py_ocpi.core.validation import validation_pool
+from py_ocpi.modules.versions.enums import VersionNumber
+
+LINK_NEXT = re.compile(r'<([^>]*)>\s*;\s*rel="?next"?')
+WHITESPACE = " \t\n\r"
+
+WatermarkKey = Tuple[str, str]
+
+MODULE_MODELS = {
+    ModuleID.locations: "Location",
+    ModuleID.tariffs: "Tariff",
+    ModuleID.tokens: "Token",
+    ModuleID.sessions: "Session",
+    ModuleID.cdrs: "Cdr",
+}
+
+
+class PageDecoder:
+    """
+    Incremental decoder of OCPI list responses.
+
+    Objects of `data` are decoded as soon as their bytes are received,
+    so the bytes of a page are never kept in memory as a whole. Other
+    fields of the envelope, e.g. `status_code`, are collected in
+    `envelope`, they may come before or after `data`.
+    """
+
+    def __init__(self) -> None:
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.state = "start"
+        self.key: Optional[str] = None
+        self.envelope: Dict[str, Any] = {}
+        # an incomplete value is decoded again once the buffer has doubled
+        self.retry_at = 0
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Return objects of `data` completed by the received bytes."""
+        self.buffer += self.decoder.decode(data)
+        if len(self.buffer) < self.retry_at:
+            return []
+        return self.parse(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Return the rest of objects of `data` once all bytes are received,
+        other fields of the envelope are in `envelope`.
+
+        :raises ValueError: If the response isn't a complete JSON object.
+        """
+        self.buffer += self.decoder.decode(b"", final=True)
+        items = self.parse(final=True)
+        if self.state != "end":
+            raise ValueError("Incomplete OCPI response.")
+        return items
+
+    def parse(self, final: bool) -> List[Any]:
+        items: List[Any] = []
+        buffer, position = self.buffer, 0
+        self.retry_at = 0
+        try:
+            while True:
+                position = self.skip(buffer, position)
+                if position >= len(buffer) or self.state == "end":
+                    break
+                char = buffer[position]
+                if self.state == "start":
+                    self.expect(char, "{")
+                    self.state, position = "key", position + 1
+                elif self.state == "key":
+                    if char == "}":
+                        self.state, position = "end", position + 1
+                        continue
+                    key, end = self.decode(buffer, position, final)
+                    end = self.skip(buffer, end)
+                    if end >= len(buffer):
+                        break
+                    self.expect(buffer[end], ":")
+                    value_start = self.skip(buffer, end + 1)
+                    if value_start >= len(buffer):
+                        break
+                    self.key, position = key, value_start
+                    if key == "data" and buffer[value_start] == "[":
+                        self.state, position = "items", value_start + 1
+                    else:
+                        self.state = "value"
+                elif self.state == "value":
+                    value, position = self.decode(buffer, position, final)
+                    self.envelope[self.key] = value  # type: ignore
+                    self.state = "key"
+                elif char == "]":
+                    self.state, position = "key", position + 1
+                else:
+                    item, position = self.decode(buffer, position, final)
+                    items.append(item)
+        except IncompleteValue:
+            self.retry_at = len(buffer) + len(buffer) - position
+        self.buffer = buffer[position:]
+        if final and self.buffer.strip(WHITESPACE + ","):
+            raise ValueError("Invalid OCPI response.")
+        return items
+
+    @staticmethod
+    def skip(buffer: str, position: int) -> int:
+        """Skip whitespaces and separators of objects and fields."""
+        while position < len(buffer) and buffer[position] in WHITESPACE + ",":
+            position += 1
+        return position
+
+    @staticmethod
+    def expect(char: str, expected: str) -> None:
+        if char != expected:
+            raise ValueError(f"Invalid OCPI response, `{expected}` expected.")
+
+    def decode(self, buffer: str, position: int, final: bool) -> Tuple:
+        try:
+            value, end = self.json_decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            if final:
+                raise ValueError(f"Invalid OCPI response: {e}") from e
+            raise IncompleteValue
+        # numbers at the end of the buffer may continue in the next bytes
+        if (
+            end >= len(buffer)
+            and not final
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+        ):
+            raise IncompleteValue
+        return value, end
+
+
+class IncompleteValue(Exception):
+    pass
+
+
+@dataclass
+class Page:
+    amount: int
+    total: Optional[int]
+    next_url: Optional[str]
+
+
+@dataclass
+class PullResult:
+    """
+    Result of pulling a list of the other party.
+
+    :param errors: Errors of objects which were invalid or weren't
+      stored, by object id.
+    :param date_to: Watermark stored for the next incremental pull.
+    """
+
+    module_id: ModuleID
+    received: int = 0
+    stored: int = 0
+    pages: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+    date_to: Optional[str] = None
+
+
+class PullWatermarks:
+    """
+    `date_from` of the next incremental pull per list url and module.
+
+    Watermarks are kept in memory, override `get` and `set` to persist
+    them between restarts.
+    """
+
+    def __init__(self) -> None:
+        self._watermarks: Dict[WatermarkKey, str] = {}
+
+    async def get(self, url: str, module_id: ModuleID) -> Optional[str]:
+        return self._watermarks.get((url, module_id.value))
+
+    async def set(self, url: str, module_id: ModuleID, date_to: str) -> None:
+        self._watermarks[(url, module_id.value)] = date_to
+
+
+def validate_objects(
+    module_id: ModuleID, version: VersionNumber, items: list
+) -> Dict[int, Tuple[str, str]]:
+    """
+    Validate pulled objects of the page, run in the validation pool.
+
+    :return: Object id and error of invalid objects by their index, valid
+      objects are stored as they were received.
+    """
+    schema = get_module_model(
+        MODULE_MODELS[module_id], module_id.value, version.name
+    )
+    id_field = "uid" if module_id == ModuleID.tokens else "id"
+    invalid: Dict[int, Tuple[str, str]] = {}
+    for index, item in enumerate(items):
+        object_id = None
+        try:
+            if not isinstance(item, dict):
+                raise TypeError(f"{module_id.value} object expected")
+            object_id = item.get(id_field)
+            schema(**item)
+        except ValidationError as e:
+            invalid[index] = (str(object_id), format_validation_error(e))
+        except (TypeError, ValueError) as e:
+            invalid[index] = (str(object_id), str(e))
+    return invalid
+
+
+class BatchStore:
+    """
+    Validates objects of pulled pages and stores them with
+    `crud.bulk_upsert` in batches.
+    """
+
+    def __init__(
+        self, crud: Any, result: PullResult, batch_size: int, **kwargs
+    ) -> None:
+        self.crud = crud
+        self.result = result
+        self.batch_size = batch_size
+        self.kwargs = kwargs
+        self.batch: List[dict] = []
+
+    async def add_page(self, items: list) -> None:
+        """Add objects of a page the other party answered successfully."""
+        self.result.received += len(items)
+        invalid = await validation_pool.run(
+            validate_objects,
+            self.result.module_id,
+            self.kwargs["version"],
+            items,
+        )
+        for index, item in enumerate(items):
+            if index in invalid:
+                object_id, error = invalid[index]
+                self.result.errors[object_id] = error
+                continue
+            self.batch.append(item)
+            if len(self.batch) >= self.batch_size:
+                await self.flush()
+
+    async def flush(self) -> None:
+        batch, self.batch = self.batch, []
+        if not batch:
+            return
+        module = self.result.module_id
+        failed = await bulk_upsert(self.crud, batch, module, **self.kwargs)
+        id_field = "uid" if module == ModuleID.tokens else "id"
+        for index, error in failed.items():
+            self.result.errors[str(batch[index].get(id_field))] = error
+        self.result.stored += len(batch) - len(failed)
+
+
+class PullClient:
+    """
+    Client pulling lists of objects from other parties, e.g. locations,
+    tariffs and tokens.
+
+    The first page tells the total amount of objects with
+    `X-Total-Count`, the rest of the pages are requested concurrently,
+    at most `concurrency` pages of one party at a time. Pages of parties
+    which don't send the total are requested one by one following their
+    `Link` headers. Objects are decoded while the pages are received.
+    Once the page is answered with OCPI status code 1000, its objects are
+    validated with the schema of the module and the valid ones are stored
+    with `crud.bulk_upsert` in batches, the rest are in `errors`.
+
+    Lists are requested up to the time the pull started, which is kept
+    as `date_from` of the next pull of the same url and module.
+
+    :param http_client: Client to use instead of the shared one.
+    :param watermarks: Storage of `date_from` of the next pulls.
+    """
+
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        watermarks: Optional[PullWatermarks] = None,
+        page_limit: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> None:
+        self._http_client = http_client
+        self.watermarks = watermarks or PullWatermarks()
+        self.page_limit = page_limit or settings.PULL_PAGE_LIMIT
+        self.concurrency = concurrency or settings.PULL_CONCURRENCY
+        self.batch_size = batch_size or settings.PULL_BATCH_SIZE
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        return self._http_client or http_client_manager.client
+
+    def get_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Return semaphore limiting requests to the party of the url."""
+        host = urlsplit(url).netloc
+        semaphore = self.semaphores.get(host)
+        if semaphore is None:
+            semaphore = self.semaphores[host] = asyncio.Semaphore(
+                self.concurrency
+            )
+        return semaphore
+
+    async def pull(
+        self,
+        url: str,
+        auth_token: str,
+        module_id: ModuleID,
+        version: VersionNumber,
+        crud: Any,
+        role: RoleEnum = RoleEnum.emsp,
+        incremental: bool = True,
+        **kwargs,
+    ) -> PullResult:
+        """
+        Pull the list of the other party and store its objects.
+
+        The watermark is moved only if every page was received and every
+        object stored, otherwise the next pull requests them again.
+
+        :param url: Url of the module endpoint of the other party.
+        :param auth_token: Token to authorize with the other party.
+        :param role: Role of this party, passed to crud.
+        :param incremental: If False, the whole list is pulled.
+
+        Other keyword arguments are passed to crud.
+
+        :raises PullError: If a page couldn't be received.
+        """
+        token = auth_token
+        if version.value.startswith("2.2"):
+            token = encode_string_base64(auth_token)
+        headers = {"Authorization": f"Token {token}"}
+        date_from = None
+        if incremental:
+            date_from = await self.watermarks.get(url, module_id)
+        date_to = (
+            datetime.now(timezone.utc)
+            .replace(microsecond=0)
+            .isoformat()
+            .replace("+00:00", "Z")
+        )
+        params: Dict[str, Any] = {
+            "offset": 0,
+            "limit": self.page_limit,
+            "date_to": date_to,
+        }
+        if date_from:
+            params["date_from"] = date_from
+        logger.info(
+            "Pull %s from `%s` since `%s`." % (module_id.value, url, date_from)
+        )
+
+        result = PullResult(module_id=module_id)
+        store = BatchStore(
+            crud,
+            result,
+            self.batch_size,
+            role=role,
+            version=version,
+            auth_token=auth_token,
+            **kwargs,
+        )
+        first = await self.fetch_page(url, params, headers, store)
+        # the other party may return less objects than requested
+        limit = first.amount
+        if first.total is not None and limit:
+            await self.fetch_pages(
+                url,
+                (
+                    {**params, "offset": offset, "limit": limit}
+                    for offset in range(limit, first.total, limit)
+                ),
+                headers,
+                store,
+            )
+        else:
+            next_url = first.next_url
+            while next_url:
+                next_url = (
+                    await self.fetch_page(next_url, None, headers, store)
+                ).next_url
+        await store.flush()
+
+        if not result.errors:
+            await self.watermarks.set(url, module_id, date_to)
+            result.date_to = date_to
+        logger.info(
+            "Pulled %s of %s %s in %s pages."
+            % (result.stored, result.received, module_id.value, result.pages)
+        )
+        return result
+
+    async def fetch_pages(
+        self,
+        url: str,
+        pages: Iterator[dict],
+        headers: dict,
+        store: BatchStore,
+    ) -> None:
+        """Request the pages by `concurrency` workers."""
+
+        async def work() -> None:
+            for params in pages:
+                await self.fetch_page(url, params, headers, store)
+
+        workers = [
+            asyncio.ensure_future(work()) for _ in range(self.concurrency)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    async def fetch_page(
+        self,
+        url: str,
+        params: Optional[dict],
+        headers: dict,
+        store: BatchStore,
+    ) -> Page:
+        async with self.get_semaphore(url):
+            logger.debug("Request page `%s` %s." % (url, params))
+            async with self.http_client.stream(
+                "GET", url, params=params, headers=headers
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise PullError(
+                        f"Page `{response.url}` returned status code "
+                        f"{response.status_code}: {response.text[:200]}"
+                    )
+                decoder = PageDecoder()
+                items: list = []
+                try:
+                    async for chunk in response.aiter_bytes():
+                        items += decoder.feed(chunk)
+                    items += decoder.close()
+                except ValueError as e:
+                    raise PullError(f"Page `{response.url}`: {e}") from e
+
+        envelope = decoder.envelope
+        status_code = envelope.get("status_code")
+        if status_code != status.OCPI_1000_GENERIC_SUCESS_CODE["status_code"]:
+            raise PullError(
+                f"Page `{response.url}` returned OCPI status code "
+                f"{status_code}: {envelope.get('status_message')}"
+            )
+        store.result.pages += 1
+        await store.add_page(items)
+        link = LINK_NEXT.search(response.headers.get("link", ""))
+        return Page(
+            amount=len(items),
+            total=parse_int(response.headers.get("x-total-count")),
+            next_url=link.group(1) if link else None,
+        )
+
+
+def parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value)  # type: ignore
+    except (TypeError, ValueError):
+        return None
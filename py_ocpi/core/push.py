@@ -1,7 +1,15 @@
-from typing import Union
+import asyncio
+from typing import Optional, Union
 
 import httpx
-from fastapi import APIRouter, Request, WebSocket, Depends
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Request,
+    WebSocket,
+    Depends,
+    status as fastapistatus,
+)
 
 from py_ocpi.core.adapter import Adapter
 from py_ocpi.core.authentication.verifier import (
@@ -9,9 +17,23 @@ from py_ocpi.core.authentication.verifier import (
     WSPushVerifier,
 )
 from py_ocpi.core.crud import Crud
-from py_ocpi.core.schemas import Push, PushResponse, ReceiverResponse
+from py_ocpi.core.schemas import (
+    OutboxPushResponse,
+    Push,
+    PushResponse,
+    Receiver,
+    ReceiverResponse,
+)
 from py_ocpi.core.utils import encode_string_base64, get_auth_token
-from py_ocpi.core.dependencies import get_crud, get_adapter
+from py_ocpi.core.dependencies import (
+    get_crud,
+    get_adapter,
+    get_http_client,
+    get_outbox,
+)
+from py_ocpi.core.delta import push_snapshots, supports_patch
+from py_ocpi.core.discovery import version_details_cache
+from py_ocpi.core.http_client import http_client_manager
 from py_ocpi.core.enums import ModuleID, RoleEnum
 from py_ocpi.core.config import settings, logger
 from py_ocpi.modules.versions.enums import VersionNumber
@@ -58,9 +80,31 @@ async def send_push_request(
     client_auth_token: str,
     endpoints: list,
     version: VersionNumber,
+    http_client: httpx.AsyncClient,
 ):
     data = request_data(module_id, object_data, adapter, version)
+    return await send_push_data(
+        object_id,
+        data,
+        module_id,
+        client_auth_token,
+        endpoints,
+        version,
+        http_client,
+    )
 
+
+async def send_push_data(
+    object_id: str,
+    data: dict,
+    module_id: ModuleID,
+    client_auth_token: str,
+    endpoints: list,
+    version: VersionNumber,
+    http_client: httpx.AsyncClient,
+    method: Optional[str] = None,
+    url_suffix: str = "",
+):
     base_url = ""
     for endpoint in endpoints:
         if (
@@ -74,93 +118,169 @@ async def send_push_request(
             base_url = endpoint["url"]
 
     # push object to client
-    async with httpx.AsyncClient() as client:
-        request = client.build_request(
-            client_method(module_id),
-            client_url(module_id, object_id, base_url),
-            headers={"Authorization": client_auth_token},
-            json=data,
-        )
-        response = await client.send(request)
-        return response
+    request = http_client.build_request(
+        method or client_method(module_id),
+        client_url(module_id, object_id, base_url) + url_suffix,
+        headers={"Authorization": client_auth_token},
+        json=data,
+    )
+    response = await http_client.send(request)
+    return response
 
 
-async def push_object(
+async def push_to_receiver(
     version: VersionNumber,
     push: Push,
-    crud: Crud,
-    adapter: Adapter,
-    auth_token: Union[str, None] = None,
-) -> PushResponse:
-    receiver_responses = []
-    for receiver in push.receivers:
-        # get client endpoints
-        if version.value.startswith("2.1") or version.value.startswith("2.0"):
-            token = receiver.auth_token
-        else:
-            token = encode_string_base64(receiver.auth_token)
-
-        client_auth_token = f"Token {token}"
-
-        async with httpx.AsyncClient() as client:
-            logger.info(
-                "Send request to get version details: %s"
-                % receiver.endpoints_url
-            )
-            response = await client.get(
-                receiver.endpoints_url,
-                headers={"authorization": client_auth_token},
-            )
-            logger.info("Response status_code - `%s`" % response.status_code)
-            endpoints = response.json()["data"]["endpoints"]
-            logger.debug("Endpoints response data - `%s`" % endpoints)
-
-        # get object data
-        if push.module_id == ModuleID.tokens:
-            logger.debug("Requested module with push is token.")
-            data = await crud.get(
-                push.module_id,
-                RoleEnum.emsp,
-                push.object_id,
-                auth_token=auth_token,
-                version=version,
-            )
-        else:
-            logger.debug("Requested module with push is `%s`." % push.module_id)
-            data = await crud.get(
-                push.module_id,
-                RoleEnum.cpo,
-                push.object_id,
-                auth_token=auth_token,
-                version=version,
-            )
+    receiver: Receiver,
+    data: dict,
+    http_client: httpx.AsyncClient,
+) -> ReceiverResponse:
+    # get client endpoints
+    if version.value.startswith("2.1") or version.value.startswith("2.0"):
+        token = receiver.auth_token
+    else:
+        token = encode_string_base64(receiver.auth_token)
+
+    client_auth_token = f"Token {token}"
 
-        response = await send_push_request(
+    async def get_endpoints() -> list:
+        logger.info(
+            "Send request to get version details: %s" % receiver.endpoints_url
+        )
+        response = await http_client.get(
+            receiver.endpoints_url,
+            headers={"authorization": client_auth_token},
+        )
+        logger.info("Response status_code - `%s`" % response.status_code)
+        endpoints = response.json()["data"]["endpoints"]
+        logger.debug("Endpoints response data - `%s`" % endpoints)
+        return endpoints
+
+    endpoints = await version_details_cache.get(
+        receiver.endpoints_url, client_auth_token, get_endpoints
+    )
+
+    snapshot_key = (
+        receiver.endpoints_url,
+        version.value,
+        push.module_id.value,
+        push.object_id,
+    )
+    delta = settings.PUSH_DELTA and supports_patch(version, push.module_id)
+    patches = None
+    if delta:
+        patches = push_snapshots.get_patches(snapshot_key, push.module_id, data)
+
+    if patches is None:
+        response = await send_push_data(
             push.object_id,
             data,
             push.module_id,
-            adapter,
             client_auth_token,
             endpoints,
             version,
+            http_client,
         )
-        if push.module_id == ModuleID.cdrs:
-            logger.debug("Add headers for CDR module into response.")
-            receiver_responses.append(
-                ReceiverResponse(
+    else:
+        logger.debug("Send %s PATCH requests." % len(patches))
+        for url_suffix, patch_data in patches:
+            response = await send_push_data(
+                push.object_id,
+                patch_data,
+                push.module_id,
+                client_auth_token,
+                endpoints,
+                version,
+                http_client,
+                method="PATCH",
+                url_suffix=url_suffix,
+            )
+            if not response.is_success:
+                break
+
+    if delta:
+        push_snapshots.update(snapshot_key, data, response.is_success)
+
+    if push.module_id == ModuleID.cdrs:
+        logger.debug("Add headers for CDR module into response.")
+        return ReceiverResponse(
+            endpoints_url=receiver.endpoints_url,
+            status_code=response.status_code,
+            response=response.headers,
+        )
+    return ReceiverResponse(
+        endpoints_url=receiver.endpoints_url,
+        status_code=response.status_code,
+        response=response.json(),
+    )
+
+
+async def push_object(
+    version: VersionNumber,
+    push: Push,
+    crud: Crud,
+    adapter: Adapter,
+    auth_token: Union[str, None] = None,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> PushResponse:
+    """
+    Send object to all receivers of the push.
+
+    The object is loaded and adapted once, then sent to receivers
+    concurrently, at most `PUSH_CONCURRENCY` at a time. Each receiver has
+    `PUSH_RECEIVER_TIMEOUT` seconds to respond, receivers which timed out
+    or failed are reported with 504 and 502 status codes.
+    """
+    client = http_client or http_client_manager.client
+
+    # get object data
+    if push.module_id == ModuleID.tokens:
+        logger.debug("Requested module with push is token.")
+        role = RoleEnum.emsp
+    else:
+        logger.debug("Requested module with push is `%s`." % push.module_id)
+        role = RoleEnum.cpo
+    object_data = await crud.get(
+        push.module_id,
+        role,
+        push.object_id,
+        auth_token=auth_token,
+        version=version,
+    )
+    data = request_data(push.module_id, object_data, adapter, version)
+
+    semaphore = asyncio.Semaphore(max(settings.PUSH_CONCURRENCY, 1))
+
+    async def push_receiver(receiver: Receiver) -> ReceiverResponse:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    push_to_receiver(version, push, receiver, data, client),
+                    settings.PUSH_RECEIVER_TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Push receiver `%s` timed out." % receiver.endpoints_url
+                )
+                return ReceiverResponse(
                     endpoints_url=receiver.endpoints_url,
-                    status_code=response.status_code,
-                    response=response.headers,
+                    status_code=fastapistatus.HTTP_504_GATEWAY_TIMEOUT,
+                    response={"detail": "Receiver timed out."},
                 )
-            )
-        else:
-            receiver_responses.append(
-                ReceiverResponse(
+            except Exception as e:
+                logger.warning(
+                    "Push receiver `%s` failed: %s"
+                    % (receiver.endpoints_url, e)
+                )
+                return ReceiverResponse(
                     endpoints_url=receiver.endpoints_url,
-                    status_code=response.status_code,
-                    response=response.json(),
+                    status_code=fastapistatus.HTTP_502_BAD_GATEWAY,
+                    response={"detail": str(e)},
                 )
-            )
+
+    receiver_responses = await asyncio.gather(
+        *(push_receiver(receiver) for receiver in push.receivers)
+    )
     result = PushResponse(receiver_responses=receiver_responses)
     logger.debug("Result of push operation - %s" % result.dict())
     return result
@@ -184,12 +304,40 @@ async def http_push_to_client(
     push: Push,
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ):
     logger.info("Received push http request.")
     logger.debug("Received push data - `%s`" % push.dict())
     auth_token = get_auth_token(request, version)
 
-    return await push_object(version, push, crud, adapter, auth_token)
+    return await push_object(
+        version, push, crud, adapter, auth_token, http_client
+    )
+
+
+# WARNING it's advised not to expose this endpoint
+@http_router.post(
+    "/{version}/outbox",
+    status_code=202,
+    include_in_schema=False,
+    response_model=OutboxPushResponse,
+)
+async def http_push_to_outbox(
+    request: Request,
+    version: VersionNumber,
+    push: Push,
+    outbox=Depends(get_outbox),
+):
+    logger.info("Received outbox push http request.")
+    logger.debug("Received push data - `%s`" % push.dict())
+    if outbox is None:
+        raise HTTPException(
+            fastapistatus.HTTP_404_NOT_FOUND, "Push outbox is not enabled"
+        )
+
+    auth_token = get_auth_token(request, version)
+    coalesced = await outbox.enqueue(version, push, auth_token)
+    return OutboxPushResponse(queued=len(push.receivers), coalesced=coalesced)
 
 
 websocket_router = APIRouter(
@@ -204,6 +352,7 @@ async def websocket_push_to_client(
     version: VersionNumber,
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ):
     auth_token = get_auth_token(websocket, version)
     await websocket.accept()
@@ -213,7 +362,7 @@ async def websocket_push_to_client(
         logger.debug("Received data through ws - `%s`" % data)
         push = Push(**data)
         push_response = await push_object(
-            version, push, crud, adapter, auth_token
+            version, push, crud, adapter, auth_token, http_client
         )
         logger.debug("Sending push response - `%s`" % push_response.dict())
         await websocket.send_json(push_response.dict())
@@ -0,0 +1,110 @@
+import asyncio
+import json
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from py_ocpi.core.schemas import OCPIResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+RESPONSE_PARAM_NAME = "__ocpi_response"
+
+
+def encode_default(obj: Any) -> Any:
+    """Return JSON compatible value of the object unknown to the encoder."""
+    if isinstance(obj, float):
+        # orjson doesn't serialize float subclasses, e.g. Number
+        return float(obj)
+    return jsonable_encoder(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content into JSON bytes, uses orjson if installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=encode_default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=encode_default,
+    ).encode("utf-8")
+
+
+class OCPIJSONResponse(JSONResponse):
+    """
+    JSON response which serializes OCPIResponse in a single pass.
+
+    The data of the envelope is expected to be already validated
+    (adapter output), so it's encoded as is without `.dict()` copies
+    and without response model validation.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, OCPIResponse):
+            content = {
+                "data": content.data,
+                "status_code": content.status_code,
+                "status_message": content.status_message,
+                "timestamp": content.timestamp,
+            }
+        return dumps(content)
+
+
+def enable_fast_json_response(app: FastAPI) -> None:
+    """
+    Serialize OCPIResponse of the app routes with OCPIJSONResponse.
+
+    Endpoints keep `response_model=OCPIResponse` for the OpenAPI schema,
+    but their result is turned into a response right after the endpoint
+    returns, so FastAPI neither re-validates nor re-encodes it.
+
+    :param app: FastAPI application with included OCPI routers.
+    """
+    for route in app.routes:
+        if (
+            isinstance(route, APIRoute)
+            and route.response_model is OCPIResponse
+            and asyncio.iscoroutinefunction(route.dependant.call)
+        ):
+            wrap_route_endpoint(route)
+
+
+def wrap_route_endpoint(route: APIRoute) -> None:
+    dependant = route.dependant
+    endpoint = dependant.call
+    injected = dependant.response_param_name is None
+    if injected:
+        dependant.response_param_name = RESPONSE_PARAM_NAME
+    response_param_name = dependant.response_param_name
+    default_status_code = route.status_code or 200
+
+    async def call(**values):
+        if injected:
+            sub_response = values.pop(response_param_name)
+        else:
+            sub_response = values[response_param_name]
+
+        content = await endpoint(**values)  # type: ignore
+        if not isinstance(content, OCPIResponse):
+            return content
+
+        response = OCPIJSONResponse(
+            content,
+            status_code=sub_response.status_code or default_status_code,
+        )
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    dependant.call = call
@@ -43,3 +43,20 @@ class ReceiverResponse(BaseModel):
 
 class PushResponse(BaseModel):
     receiver_responses: List[ReceiverResponse]
+
+
+class OutboxPushResponse(BaseModel):
+    queued: int
+    coalesced: int
+
+
+class BulkImportError(BaseModel):
+    index: int
+    id: Optional[str]
+    error: str
+
+
+class BulkImportResponse(BaseModel):
+    received: int
+    imported: int
+    errors: List[BulkImportError]
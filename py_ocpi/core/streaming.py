@@ -0,0 +1,108 @@
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from py_ocpi.core import status
+from py_ocpi.core.config import logger
+from py_ocpi.core.crud import iterate_list
+from py_ocpi.core.enums import ModuleID, RoleEnum
+from py_ocpi.core.responses import dumps
+from py_ocpi.core.schemas import OCPIResponse
+from py_ocpi.core.utils import get_pagination_link, set_pagination_headers
+from py_ocpi.modules.versions.enums import VersionNumber
+
+
+class OCPIStreamingResponse(StreamingResponse):
+    media_type = "application/json"
+
+
+async def iterate(objects: Iterable[Any]) -> AsyncIterator[Any]:
+    for data in objects:
+        yield data
+
+
+async def stream_envelope(
+    objects: AsyncIterator[Any],
+    adapt: Callable[[Any], BaseModel],
+    status_data: dict = status.OCPI_1000_GENERIC_SUCESS_CODE,
+) -> AsyncIterator[bytes]:
+    """
+    Yield OCPIResponse JSON envelope chunk by chunk.
+
+    Each object is adapted and encoded right before it's sent, so only
+    one object of the page is kept in memory at a time.
+
+    :param objects: Async iterator of objects returned by crud.
+    :param adapt: Adapter method turning crud object into OCPI schema.
+    :param status_data: OCPI status code and message of the response.
+    """
+    yield b'{"data":['
+    amount = 0
+    async for data in objects:
+        chunk = dumps(adapt(data).dict())
+        yield chunk if not amount else b"," + chunk
+        amount += 1
+
+    envelope = OCPIResponse(data=[], **status_data)
+    tail = dumps(
+        {
+            "status_code": envelope.status_code,
+            "status_message": envelope.status_message,
+            "timestamp": envelope.timestamp,
+        }
+    )
+    yield b"]," + tail[1:]
+    logger.debug(f"Amount of streamed objects in response: {amount}")
+
+
+async def stream_list(
+    response: Response,
+    filters: dict,
+    module: ModuleID,
+    role: RoleEnum,
+    version: VersionNumber,
+    crud,
+    adapt: Callable[[Any], BaseModel],
+    *args,
+    **kwargs,
+) -> OCPIStreamingResponse:
+    """
+    Streaming counterpart of `get_list`.
+
+    Objects are taken from `crud.list_iter` and written into the response
+    body while they are produced, pagination headers are the same
+    as the ones set by `get_list`. In cursor pagination mode raw objects
+    of a page which isn't the last one are collected first to build
+    the next page cursor, adapting and encoding is still streamed.
+    """
+    # cruds which don't subclass Crud may have no list_iter
+    list_iter = getattr(crud, "list_iter", None) or partial(iterate_list, crud)
+    objects, total, is_last_page = await list_iter(
+        module, role, filters, *args, version=version, **kwargs
+    )
+
+    last_object = None
+    if "cursor" in filters and not is_last_page:
+        # next page cursor is built from the last object of the page,
+        # which has to be known before the headers are sent
+        data_list = [data async for data in objects]
+        last_object = data_list[-1] if data_list else None
+        objects = iterate(data_list)
+
+    link = get_pagination_link(
+        filters, module, version, is_last_page, last_object
+    )
+    set_pagination_headers(response, link, total, filters["limit"])
+    logger.debug(
+        f"Stream list total / is_last_page -> {total} / {is_last_page}."
+    )
+
+    streaming_response = OCPIStreamingResponse(
+        stream_envelope(objects, adapt),
+        status_code=response.status_code or 200,
+    )
+    streaming_response.headers.raw.extend(response.headers.raw)
+    return streaming_response
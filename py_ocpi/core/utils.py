@@ -1,11 +1,16 @@
 import importlib
+import json
 import urllib
 import base64
-from typing import Union, Any
+from datetime import datetime
+from typing import Any, Callable, Tuple, Union
 
-from fastapi import Response, Request
+from fastapi import Response
 from pydantic import BaseModel
+from starlette.requests import HTTPConnection
 
+from py_ocpi.core.authentication.context import get_auth_context
+from py_ocpi.core.conditional import check_list, check_list_version
 from py_ocpi.core.config import logger
 from py_ocpi.core.enums import ModuleID, RoleEnum
 from py_ocpi.core.config import settings
@@ -22,9 +27,19 @@ def set_pagination_headers(
 
 
 def get_auth_token(
-    request: Request,
+    request: HTTPConnection,
     version: VersionNumber = VersionNumber.v_2_2_1,
 ) -> Union[str, None]:
+    """
+    Return decoded auth token of the request.
+
+    Uses the auth context resolved by the verifier when it was built for
+    the same version, otherwise parses the authorization header.
+    """
+    context = get_auth_context(request)
+    if context is not None and context.version == version:
+        return context.token
+
     headers = request.headers
     headers_token = headers.get("authorization", "Token Null")
     token = headers_token.split()[1]
@@ -35,6 +50,78 @@ def get_auth_token(
     return decode_string_base64(token)
 
 
+def get_pagination_link(
+    filters: dict,
+    module: ModuleID,
+    version: VersionNumber,
+    is_last_page: bool,
+    last_object: Any = None,
+) -> str:
+    """
+    Return Link header value pointing to the next page, if any.
+
+    In cursor pagination mode (`cursor` key is present in filters)
+    the link carries a cursor built from the last object of the page
+    instead of the next offset.
+    """
+    if is_last_page:
+        return ""
+    if "cursor" in filters:
+        if last_object is None:
+            return ""
+        params = {
+            key: value
+            for key, value in filters.items()
+            if key not in ("offset", "cursor") and value is not None
+        }
+        params["cursor"] = encode_cursor(*get_cursor_key(last_object, module))
+    else:
+        params = dict(**filters)
+        params["offset"] = filters["offset"] + filters["limit"]
+    return (
+        f"<https://{settings.OCPI_HOST}/{settings.OCPI_PREFIX}/cpo"
+        f"/{version}/{module}/"
+        f'?{urllib.parse.urlencode(params)}>; rel="next"'  # type: ignore
+    )
+
+
+def get_cursor_key(data: Any, module: ModuleID) -> Tuple[str, str]:
+    """Return (last_updated, id) of the object returned by crud."""
+    id_field = "uid" if module == ModuleID.tokens else "id"
+    if isinstance(data, dict):
+        last_updated, object_id = data["last_updated"], data[id_field]
+    else:
+        last_updated = getattr(data, "last_updated")
+        object_id = getattr(data, id_field)
+    if isinstance(last_updated, datetime):
+        last_updated = last_updated.isoformat().replace(
+            "+00:00", "Z"
+        )  # type: ignore
+    return str(last_updated), str(object_id)
+
+
+def encode_cursor(last_updated: str, id: str) -> str:
+    """Return opaque pagination cursor of the (last_updated, id) key."""
+    raw = json.dumps([last_updated, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Return (last_updated, id) key of the pagination cursor.
+
+    :raises ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("utf-8"))
+        last_updated, id = json.loads(raw)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid pagination cursor.") from e
+    if not isinstance(last_updated, str) or not isinstance(id, str):
+        raise ValueError("Invalid pagination cursor.")
+    return {"last_updated": last_updated, "id": id}
+
+
 async def get_list(
     response: Response,
     filters: dict,
@@ -45,25 +132,26 @@ async def get_list(
     *args,
     **kwargs,
 ):
+    await check_list_version(
+        crud, module, role, filters, *args, version=version, **kwargs
+    )
     data_list, total, is_last_page = await crud.list(
         module, role, filters, *args, version=version, **kwargs
     )
 
-    link = ""
-    params = dict(**filters)
-    params["offset"] = filters["offset"] + filters["limit"]
-    if not is_last_page:
-        link = (
-            f"<https://{settings.OCPI_HOST}/{settings.OCPI_PREFIX}/cpo"
-            f"/{version}/{module}/"
-            f'?{urllib.parse.urlencode(params)}>; rel="next"'  # type: ignore
-        )
-
+    link = get_pagination_link(
+        filters,
+        module,
+        version,
+        is_last_page,
+        data_list[-1] if data_list else None,
+    )
     set_pagination_headers(response, link, total, filters["limit"])
     logger.debug(
         f"List / total / is_last_page -> "
         f"{len(data_list)} / {total} / {is_last_page}."
     )
+    check_list(data_list, module, link, total)
     return data_list
 
 
@@ -72,6 +160,27 @@ def partially_update_attributes(instance: BaseModel, attributes: dict):
         setattr(instance, key, value)
 
 
+def apply_partial_update(
+    data: Any,
+    patch: BaseModel,
+    adapt: Callable[[Any], BaseModel],
+) -> dict:
+    """
+    Return object data with fields of the PATCH request merged in.
+
+    Crud data is converted with `adapt` and the changed fields are merged
+    into a shallow copy of the adapted object, so the stored object isn't
+    deep copied. Only the changed fields are serialized, they are already
+    validated by the partial update schema of the request.
+
+    :param data: The object data returned by crud.
+    :param patch: The partial update object of the request.
+    :param adapt: Adapter method turning crud data into OCPI schema.
+    """
+    changes = patch.dict(exclude_defaults=True, exclude_unset=True)
+    return adapt(data).copy(update=changes).dict()
+
+
 def encode_string_base64(input: str) -> str:
     input_bytes = base64.b64encode(bytes(input, "utf-8"))
     return input_bytes.decode("utf-8")
@@ -0,0 +1,196 @@
+import asyncio
+import inspect
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple, Type
+
+from fastapi import FastAPI
+from fastapi.dependencies.models import Dependant
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute, get_request_handler, request_response
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import SHAPE_SINGLETON
+
+from py_ocpi.core.config import logger, settings
+
+REQUEST_PARAM_NAME = "__ocpi_request"
+MISSING_BODY_ERROR = {
+    "loc": ("body",),
+    "msg": "field required",
+    "type": "value_error.missing",
+}
+
+
+class ValidationPool:
+    """
+    Pool of processes validating objects off the event loop.
+
+    Processes are started on the first use, `VALIDATION_PROCESSES`
+    of them. If it's 0 objects are validated in the default thread
+    executor of the loop. Functions run in the pool and their
+    arguments must be picklable.
+    """
+
+    def __init__(self) -> None:
+        self.executor: Optional[Executor] = None
+
+    def get_executor(self) -> Optional[Executor]:
+        if settings.VALIDATION_PROCESSES <= 0:
+            return None
+        if self.executor is None:
+            logger.debug(
+                "Start %s validation processes." % settings.VALIDATION_PROCESSES
+            )
+            self.executor = ProcessPoolExecutor(settings.VALIDATION_PROCESSES)
+        return self.executor
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.get_executor(), func, *args
+        )
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+
+validation_pool = ValidationPool()
+
+
+def validate_body(model: Type[BaseModel], body: bytes) -> Tuple[Any, list]:
+    """
+    Return the model parsed from JSON body, or errors as FastAPI does.
+
+    Errors are returned instead of raised, as dicts, so that they can be
+    sent back from the validation process.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        return None, [
+            {
+                "loc": ("body", getattr(e, "pos", 0)),
+                "msg": "JSON decode error",
+                "type": "value_error.jsondecode",
+            }
+        ]
+    try:
+        return model.parse_obj(data), []
+    except ValidationError as e:
+        return None, [
+            {**error, "loc": ("body", *error["loc"])} for error in e.errors()
+        ]
+
+
+def get_body_model(route: APIRoute) -> Optional[Tuple[str, Type[BaseModel]]]:
+    """Return name and model of the route body if it's a required model."""
+    body_params = route.dependant.body_params
+    if len(body_params) != 1:
+        return None
+    field = body_params[0]
+    if (
+        getattr(field, "shape", None) != SHAPE_SINGLETON
+        or not isinstance(field.type_, type)
+        or not issubclass(field.type_, BaseModel)
+        or getattr(field.field_info, "embed", False)
+        or not field.required
+    ):
+        return None
+    return field.name, field.type_
+
+
+def enable_offloaded_validation(app: FastAPI) -> None:
+    """
+    Validate bodies of the app routes off the event loop.
+
+    Bodies of at least `VALIDATION_OFFLOAD_MIN_SIZE` bytes are parsed and
+    validated by the validation pool, smaller ones in the endpoint as
+    before. Applies to routes with a single required body model.
+
+    Routes are wrapped using FastAPI internals, with a FastAPI version
+    which doesn't have them bodies are validated as before.
+
+    :param app: FastAPI application with included OCPI routers.
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute) and asyncio.iscoroutinefunction(
+            route.dependant.call
+        ):
+            body = get_body_model(route)
+            if body is None:
+                continue
+            if not offload_supported(route):
+                logger.warning(
+                    "Offloaded validation isn't supported by this FastAPI "
+                    "version."
+                )
+                return
+            wrap_route_body(route, *body)
+
+
+def wrap_route_body(route: APIRoute, name: str, model: Type[BaseModel]):
+    dependant = route.dependant
+    endpoint = dependant.call
+    injected = dependant.request_param_name is None
+    if injected:
+        dependant.request_param_name = REQUEST_PARAM_NAME
+    request_param_name = dependant.request_param_name
+    # body is read by the endpoint, FastAPI doesn't parse it anymore
+    dependant.body_params = []
+
+    async def call(**values):
+        if injected:
+            request = values.pop(request_param_name)
+        else:
+            request = values[request_param_name]
+
+        body = await request.body()
+        if not body:
+            value, errors = None, [MISSING_BODY_ERROR]
+        elif len(body) >= settings.VALIDATION_OFFLOAD_MIN_SIZE:
+            value, errors = await validation_pool.run(
+                validate_body, model, body
+            )
+        else:
+            value, errors = validate_body(model, body)
+        if errors:
+            raise RequestValidationError(errors, body=body)
+        values[name] = value
+        return await endpoint(**values)  # type: ignore
+
+    dependant.call = call
+    route.app = request_response(
+        get_request_handler(dependant=dependant, **request_handler_args(route))
+    )
+
+
+def request_handler_args(route: APIRoute) -> dict:
+    """Return arguments of `get_request_handler` as APIRoute passes them."""
+    return {
+        "status_code": route.status_code,
+        "response_class": route.response_class,
+        "response_field": route.secure_cloned_response_field,
+        "response_model_include": route.response_model_include,
+        "response_model_exclude": route.response_model_exclude,
+        "response_model_by_alias": route.response_model_by_alias,
+        "response_model_exclude_unset": route.response_model_exclude_unset,
+        "response_model_exclude_defaults": (
+            route.response_model_exclude_defaults
+        ),
+        "response_model_exclude_none": route.response_model_exclude_none,
+        "dependency_overrides_provider": route.dependency_overrides_provider,
+    }
+
+
+def offload_supported(route: APIRoute) -> bool:
+    """
+    Return True if FastAPI internals replaced by `wrap_route_body` are as
+    expected, they are tested with FastAPI 0.101.
+    """
+    handler_args = set(inspect.signature(get_request_handler).parameters)
+    dependant_fields = set(inspect.signature(Dependant).parameters)
+    wrapped_fields = {"body_params", "request_param_name", "call"}
+    return set(request_handler_args(route)) <= handler_args and (
+        wrapped_fields <= dependant_fields
+    )
@@ -1,18 +1,20 @@
-from typing import Any, List
+import logging
+from typing import Any, List, Optional
+
+import httpx
 
 from fastapi import FastAPI, Request, status as fastapistatus
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import ValidationError
-from starlette.middleware.base import (
-    BaseHTTPMiddleware,
-    RequestResponseEndpoint,
-)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from py_ocpi.core.endpoints import ENDPOINTS
 
 from py_ocpi.modules.versions import router as versions_router
 from py_ocpi.modules.versions.enums import VersionNumber
 from py_ocpi.modules.versions.schemas import Version
+from py_ocpi.modules.versions.responses import DiscoveryResponses
 from py_ocpi.core.dependencies import (
     get_crud,
     get_adapter,
@@ -20,61 +22,112 @@ from py_ocpi.core.dependencies import (
     get_endpoints,
     get_modules,
     get_authenticator,
+    get_list_streaming,
+    get_pagination_mode,
+    get_http_client,
+    get_outbox,
+    get_discovery_responses,
 )
 from py_ocpi.core import status
 from py_ocpi.core.adapter import BaseAdapter
-from py_ocpi.core.enums import RoleEnum, ModuleID
+from py_ocpi.core.enums import RoleEnum, ModuleID, PaginationMode
 from py_ocpi.core.config import settings, logger
 from py_ocpi.core.data_types import URL
 from py_ocpi.core.schemas import OCPIResponse
+from py_ocpi.core.responses import enable_fast_json_response
+from py_ocpi.core.conditional import enable_conditional_get
+from py_ocpi.core.http_client import (
+    HTTPClientManager,
+    http_client_manager as default_http_client_manager,
+)
+from py_ocpi.core.outbox import Outbox, OutboxBackend
+from py_ocpi.core.bulk_import import router as bulk_import_router
+from py_ocpi.core.validation import (
+    enable_offloaded_validation,
+    validation_pool,
+)
 from py_ocpi.core.exceptions import AuthorizationOCPIError, NotFoundOCPIError
 from py_ocpi.core.push import (
     http_router as http_push_router,
     websocket_router as websocket_push_router,
 )
 from py_ocpi.core.routers import ROUTERS
+from py_ocpi.modules.chargingprofiles.v_2_2_1.scheduler import (
+    charging_profile_scheduler,
+)
+
 
+class ExceptionHandlerMiddleware:
+    """
+    Pure ASGI middleware mapping OCPI exceptions into responses.
+
+    Unlike `BaseHTTPMiddleware` it doesn't spawn a task per request and
+    passes response messages straight through, so streaming responses
+    aren't buffered. Request details are formatted only when DEBUG
+    logging is enabled.
+    """
 
-class ExceptionHandlerMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ):
-        logger.debug("%s: %s" % (request.method, request.url))
-        logger.debug("Request headers - %s" % request.headers)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            request = Request(scope)
+            logger.debug("%s: %s" % (request.method, request.url))
+            logger.debug("Request headers - %s" % request.headers)
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                if debug:
+                    logger.debug(
+                        f"Response status_code -> {message['status']}."
+                    )
+            await send(message)
 
         try:
-            response = await call_next(request)
-        except AuthorizationOCPIError as e:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            if response_started:
+                raise
+            response = self.exception_response(e)
+            if debug:
+                logger.debug(f"Response status_code -> {response.status_code}.")
+            await response(scope, receive, send)
+
+    @staticmethod
+    def exception_response(exc: Exception) -> JSONResponse:
+        """Return response corresponding to the raised exception."""
+        if isinstance(exc, AuthorizationOCPIError):
             logger.warning("OCPI middleware AuthorizationOCPIError exception.")
-            response = JSONResponse(
-                content={"detail": str(e)},
+            return JSONResponse(
+                content={"detail": str(exc)},
                 status_code=fastapistatus.HTTP_403_FORBIDDEN,
             )
-        except NotFoundOCPIError as e:
+        if isinstance(exc, NotFoundOCPIError):
             logger.warning("OCPI middleware NotFoundOCPIError exception.")
-            response = JSONResponse(
-                content={"detail": str(e)},
+            return JSONResponse(
+                content={"detail": str(exc)},
                 status_code=fastapistatus.HTTP_404_NOT_FOUND,
             )
-        except ValidationError:
+        if isinstance(exc, ValidationError):
             logger.warning("OCPI middleware ValidationError exception.")
-            response = JSONResponse(
-                OCPIResponse(
-                    data=[],
-                    **status.OCPI_3000_GENERIC_SERVER_ERROR,
-                ).dict()
-            )
-        except Exception as e:
-            logger.warning(f"Unknown exception: {str(e)}.")
-            response = JSONResponse(
-                OCPIResponse(
-                    data=[],
-                    **status.OCPI_3000_GENERIC_SERVER_ERROR,
-                ).dict()
-            )
-
-        logger.debug(f"Response status_code -> {response.status_code}.")
-        return response
+        else:
+            logger.warning(f"Unknown exception: {str(exc)}.")
+        return JSONResponse(
+            OCPIResponse(
+                data=[],
+                **status.OCPI_3000_GENERIC_SERVER_ERROR,
+            ).dict()
+        )
 
 
 def get_application(
@@ -86,6 +139,14 @@ def get_application(
     adapter: Any = BaseAdapter,
     http_push: bool = False,
     websocket_push: bool = False,
+    fast_json_response: bool = False,
+    list_streaming: bool = False,
+    pagination_mode: PaginationMode = PaginationMode.offset,
+    http_client: Optional[httpx.AsyncClient] = None,
+    push_outbox: Optional[OutboxBackend] = None,
+    bulk_import: bool = False,
+    offload_validation: bool = False,
+    conditional_get: bool = False,
 ) -> FastAPI:
     """
     OCPI application initializer.
@@ -103,6 +164,30 @@ def get_application(
       corresponding client data update could be made.
     :param websocket_push: If True, add websocket endpoint where data updates
       will be shared.
+    :param fast_json_response: If True, OCPIResponse of the endpoints is
+      serialized once into bytes (with orjson if installed) without
+      response model re-validation.
+    :param list_streaming: If True, list endpoints write objects into
+      the response body while they are taken from `crud.list_iter`
+      instead of building the whole page in memory.
+    :param pagination_mode: Pagination of list endpoints. Offset mode is
+      defined by OCPI, cursor mode lets crud seek by (last_updated, id)
+      of the last object of the previous page.
+    :param http_client: Client used for requests to other OCPI parties.
+      By default a pooled client configured with `HTTP_CLIENT_*` settings
+      is created on startup and closed on shutdown.
+    :param push_outbox: Backend of the outbox delivering pushes in
+      background with retries. If given, the outbox worker is run while
+      the application is running.
+    :param bulk_import: If True, add endpoint importing locations from
+      a list or NDJSON body, validated in `VALIDATION_PROCESSES` processes
+      and stored in chunks with `crud.bulk_upsert`.
+    :param offload_validation: If True, request bodies of at least
+      `VALIDATION_OFFLOAD_MIN_SIZE` bytes are validated in
+      `VALIDATION_PROCESSES` processes instead of the event loop.
+    :param conditional_get: If True, GET responses have ETag header and
+      requests with matching `If-None-Match` or `If-Modified-Since` are
+      answered with `304 Not Modified`, before crud data is adapted.
 
     :return: FastApi application.
     """
@@ -122,6 +207,21 @@ def get_application(
     )
     _app.add_middleware(ExceptionHandlerMiddleware)
 
+    http_client_manager = HTTPClientManager(http_client)
+    _app.add_event_handler("startup", http_client_manager.startup)
+
+    outbox = None
+    if push_outbox is not None:
+        outbox = Outbox(push_outbox, crud, adapter, http_client_manager)
+        _app.add_event_handler("startup", outbox.start)
+        # outbox is stopped before the client it delivers with is closed
+        _app.add_event_handler("shutdown", outbox.stop)
+    _app.state.outbox = outbox
+
+    _app.add_event_handler("shutdown", http_client_manager.shutdown)
+    # fallback client of pushes and pulls made outside of the application
+    _app.add_event_handler("shutdown", default_http_client_manager.shutdown)
+
     _app.include_router(
         versions_router,
         prefix=f"/{settings.OCPI_PREFIX}",
@@ -139,6 +239,18 @@ def get_application(
             prefix=f"/{settings.PUSH_PREFIX}",
         )
 
+    if bulk_import:
+        _app.include_router(
+            bulk_import_router,
+            prefix=f"/{settings.IMPORT_PREFIX}",
+        )
+
+    if bulk_import or offload_validation:
+        _app.add_event_handler("shutdown", validation_pool.shutdown)
+
+    if ModuleID.charging_profile in modules:
+        _app.add_event_handler("shutdown", charging_profile_scheduler.stop)
+
     versions = []
     version_endpoints: dict[str, list] = {}
 
@@ -190,6 +302,20 @@ def get_application(
                     if endpoint:
                         version_endpoints[version].append(endpoint)
 
+    discovery_responses = DiscoveryResponses()
+    discovery_responses.render(versions, version_endpoints)
+    _app.state.discovery_responses = discovery_responses
+
+    # conditional endpoints return 304 before their response is rendered
+    if conditional_get:
+        enable_conditional_get(_app)
+
+    if fast_json_response:
+        enable_fast_json_response(_app)
+
+    if offload_validation:
+        enable_offloaded_validation(_app)
+
     def override_get_crud():
         return crud
 
@@ -220,4 +346,33 @@ def get_application(
 
     _app.dependency_overrides[get_authenticator] = override_get_authenticator()
 
+    def override_get_list_streaming():
+        return list_streaming
+
+    _app.dependency_overrides[get_list_streaming] = override_get_list_streaming
+
+    def override_get_pagination_mode():
+        return pagination_mode
+
+    _app.dependency_overrides[
+        get_pagination_mode
+    ] = override_get_pagination_mode
+
+    def override_get_discovery_responses():
+        return discovery_responses
+
+    _app.dependency_overrides[
+        get_discovery_responses
+    ] = override_get_discovery_responses
+
+    def override_get_http_client():
+        return http_client_manager.client
+
+    _app.dependency_overrides[get_http_client] = override_get_http_client
+
+    def override_get_outbox():
+        return outbox
+
+    _app.dependency_overrides[get_outbox] = override_get_outbox
+
     return _app
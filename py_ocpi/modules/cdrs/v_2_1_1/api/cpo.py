@@ -6,10 +6,16 @@ from py_ocpi.core.adapter import Adapter
 from py_ocpi.core.authentication.verifier import AuthorizationVerifier
 from py_ocpi.core.crud import Crud
 from py_ocpi.core.config import logger
-from py_ocpi.core.dependencies import get_crud, get_adapter, pagination_filters
+from py_ocpi.core.dependencies import (
+    get_crud,
+    get_adapter,
+    get_list_streaming,
+    pagination_filters,
+)
 from py_ocpi.core.enums import ModuleID, RoleEnum
 from py_ocpi.core.schemas import OCPIResponse
 from py_ocpi.core.utils import get_auth_token, get_list
+from py_ocpi.core.streaming import stream_list
 
 router = APIRouter(
     prefix="/cdrs",
@@ -24,6 +30,7 @@ async def get_cdrs(
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
     filters: dict = Depends(pagination_filters),
+    list_streaming: bool = Depends(get_list_streaming),
 ):
     """
     Get CDRs.
@@ -45,6 +52,18 @@ async def get_cdrs(
     logger.info("Received request to get cdrs.")
     auth_token = get_auth_token(request, VersionNumber.v_2_1_1)
 
+    if list_streaming:
+        return await stream_list(
+            response,
+            filters,
+            ModuleID.cdrs,
+            RoleEnum.cpo,
+            VersionNumber.v_2_1_1,
+            crud,
+            lambda data: adapter.cdr_adapter(data, VersionNumber.v_2_1_1),
+            auth_token=auth_token,
+        )
+
     data_list = await get_list(
         response,
         filters,
@@ -1,3 +1,5 @@
+import httpx
+
 from fastapi import APIRouter, BackgroundTasks, Depends, Request
 
 from py_ocpi.modules.versions.enums import VersionNumber
@@ -10,7 +12,7 @@ from py_ocpi.core.crud import Crud
 from py_ocpi.core.config import logger
 from py_ocpi.core.data_types import CiString, URL
 from py_ocpi.core.enums import ModuleID, RoleEnum, Action
-from py_ocpi.core.dependencies import get_crud, get_adapter
+from py_ocpi.core.dependencies import get_crud, get_adapter, get_http_client
 
 from py_ocpi.modules.chargingprofiles.v_2_2_1.background_tasks import (
     send_get_chargingprofile,
@@ -38,6 +40,7 @@ async def get_chargingprofile(
     background_tasks: BackgroundTasks,
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ):
     """
     Get Charging Profile.
@@ -96,6 +99,7 @@ async def get_chargingprofile(
                     auth_token=auth_token,
                     crud=crud,
                     adapter=adapter,
+                    http_client=http_client,
                 )
             return OCPIResponse(
                 data=[
@@ -135,6 +139,7 @@ async def add_or_update_chargingprofile(
     background_tasks: BackgroundTasks,
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ):
     """
     Add or Update Charging Profile.
@@ -193,6 +198,7 @@ async def add_or_update_chargingprofile(
                     auth_token=auth_token,
                     crud=crud,
                     adapter=adapter,
+                    http_client=http_client,
                 )
             return OCPIResponse(
                 data=[
@@ -232,6 +238,7 @@ async def delete_chargingprofile(
     background_tasks: BackgroundTasks,
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ):
     """
     Delete Charging Profile.
@@ -287,6 +294,7 @@ async def delete_chargingprofile(
                     auth_token=auth_token,
                     crud=crud,
                     adapter=adapter,
+                    http_client=http_client,
                 )
             return OCPIResponse(
                 data=[
@@ -0,0 +1,260 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel
+
+from py_ocpi.core.config import logger, settings
+from py_ocpi.core.crud import Crud, get_each
+from py_ocpi.core.enums import ModuleID, RoleEnum
+from py_ocpi.core.utils import encode_string_base64
+from py_ocpi.modules.chargingprofiles.v_2_2_1.schemas import (
+    ChargingProfileResult,
+    ChargingProfileResultType,
+)
+
+
+@dataclass(order=True)
+class ProfileRequest:
+    """
+    Charging profile request awaiting result from the Charge Point.
+
+    :param query: Keyword arguments of `crud.get` looking up the result.
+    :param adapt: Turns the result returned by crud into OCPI schema.
+    :param deadline: Time, by `time.monotonic`, after which the request
+      is rejected.
+    """
+
+    next_check_at: float
+    sequence: int
+    deadline: float = field(compare=False)
+    name: str = field(compare=False)
+    response_url: str = field(compare=False)
+    client_auth_token: str = field(compare=False)
+    query: dict = field(compare=False)
+    adapt: Callable[[Any], BaseModel] = field(compare=False)
+    crud: Crud = field(compare=False)
+    http_client: httpx.AsyncClient = field(compare=False)
+
+
+class ChargingProfileScheduler:
+    """
+    Scheduler of all pending charging profile requests.
+
+    Requests are kept in a heap ordered by the time of the next check.
+    Every `CHARGING_PROFILE_POLL_INTERVAL` seconds results of all due
+    requests, up to `CHARGING_PROFILE_BATCH_SIZE`, are looked up with one
+    `crud.get_many` call. Results, or rejections of requests which
+    weren't answered in `GET_ACTIVE_PROFILE_AWAIT_TIME` minutes, are sent
+    to `response_url` by `CHARGING_PROFILE_WORKERS` workers.
+    """
+
+    def __init__(self) -> None:
+        self.heap: List[ProfileRequest] = []
+        self.counter = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.results: "asyncio.Queue[Tuple[ProfileRequest, Any]]" = (
+            asyncio.Queue()
+        )
+        self.task: Optional[asyncio.Task] = None
+        self.workers: List[asyncio.Task] = []
+        self.lookups = 0
+        self.sent = 0
+        self.timed_out = 0
+        self.failed = 0
+
+    def schedule(
+        self,
+        name: str,
+        response_url: str,
+        client_auth_token: str,
+        query: dict,
+        adapt: Callable[[Any], BaseModel],
+        crud: Crud,
+        http_client: httpx.AsyncClient,
+    ) -> ProfileRequest:
+        """Track the request, its result is looked up on the next tick."""
+        now = time.monotonic()
+        request = ProfileRequest(
+            next_check_at=now,
+            sequence=next(self.counter),
+            deadline=now + settings.GET_ACTIVE_PROFILE_AWAIT_TIME * 60,
+            name=name,
+            response_url=response_url,
+            client_auth_token=client_auth_token,
+            query=query,
+            adapt=adapt,
+            crud=crud,
+            http_client=http_client,
+        )
+        self.ensure_running()
+        heapq.heappush(self.heap, request)
+        self.wakeup.set()
+        logger.debug(
+            "Scheduled %s request, pending requests: %s"
+            % (name, len(self.heap))
+        )
+        return request
+
+    def ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if (
+            self.task is not None
+            and not self.task.done()
+            and self.task.get_loop() is loop
+        ):
+            return
+        self.wakeup = asyncio.Event()
+        self.results = asyncio.Queue()
+        self.task = loop.create_task(self.run())
+        self.workers = [
+            loop.create_task(self.send_results())
+            for _ in range(max(settings.CHARGING_PROFILE_WORKERS, 1))
+        ]
+
+    async def run(self) -> None:
+        while True:
+            timeout = None
+            if self.heap:
+                timeout = self.heap[0].next_check_at - time.monotonic()
+            if timeout is None or timeout > 0:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.monotonic()
+            due: List[ProfileRequest] = []
+            while (
+                self.heap
+                and self.heap[0].next_check_at <= now
+                and len(due) < settings.CHARGING_PROFILE_BATCH_SIZE
+            ):
+                due.append(heapq.heappop(self.heap))
+            await self.check(due)
+
+    async def check(self, requests: List[ProfileRequest]) -> None:
+        """Look up results of the requests, one crud call per crud."""
+        groups: Dict[Crud, List[ProfileRequest]] = defaultdict(list)
+        for request in requests:
+            groups[request.crud].append(request)
+
+        now = time.monotonic()
+        for crud, group in groups.items():
+            self.lookups += 1
+            try:
+                # cruds which don't subclass Crud may have no get_many
+                get_many = getattr(crud, "get_many", None) or partial(
+                    get_each, crud
+                )
+                results = await get_many(
+                    ModuleID.hub_client_info,
+                    RoleEnum.cpo,
+                    [request.query for request in group],
+                )
+            except Exception as e:
+                logger.warning("Charging profile results lookup failed: %s" % e)
+                results = [None] * len(group)
+            for request, result in zip(group, results):
+                if result:
+                    logger.debug(
+                        "%s result from Charge Point - %s"
+                        % (request.name, result)
+                    )
+                    self.results.put_nowait((request, result))
+                elif now >= request.deadline:
+                    logger.debug(
+                        "%s result from Charge Point didn't arrive in time."
+                        % request.name
+                    )
+                    self.timed_out += 1
+                    self.results.put_nowait((request, None))
+                else:
+                    self.reschedule(request, now)
+
+    def reschedule(self, request: ProfileRequest, now: float) -> None:
+        request.next_check_at = now + settings.CHARGING_PROFILE_POLL_INTERVAL
+        heapq.heappush(self.heap, request)
+
+    async def send_results(self) -> None:
+        while True:
+            request, result = await self.results.get()
+            try:
+                await self.send_result(request, result)
+            except Exception as e:
+                self.failed += 1
+                logger.warning(
+                    "Sending %s result to `%s` failed: %s"
+                    % (request.name, request.response_url, e)
+                )
+            finally:
+                self.results.task_done()
+
+    async def send_result(self, request: ProfileRequest, result: Any) -> None:
+        if result:
+            data = request.adapt(result)
+        else:
+            data = ChargingProfileResult(
+                result=ChargingProfileResultType.rejected
+            )
+
+        authorization_token = (
+            f"Token {encode_string_base64(request.client_auth_token)}"
+        )
+        logger.info(
+            "Send request with %s result: %s"
+            % (request.name, request.response_url)
+        )
+        res = await request.http_client.post(
+            request.response_url,
+            json=data.dict(),
+            headers={"authorization": authorization_token},
+        )
+        self.sent += 1
+        logger.info(
+            "POST %s result data after receiving result "
+            "from Charge Point status_code: %s"
+            % (request.name, res.status_code)
+        )
+
+    async def stop(self) -> None:
+        """Cancel the scheduler and its workers, drop pending requests."""
+        loop = asyncio.get_running_loop()
+        # tasks of a loop which was already closed are gone with it
+        tasks = [
+            task
+            for task in [self.task, *self.workers]
+            if task is not None and task.get_loop() is loop
+        ]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
+        self.workers = []
+        self.heap = []
+
+    def stats(self) -> dict:
+        """Return queue depths and counters of the scheduler."""
+        return {
+            "pending": len(self.heap),
+            "results_queued": self.results.qsize(),
+            "lookups": self.lookups,
+            "sent": self.sent,
+            "timed_out": self.timed_out,
+            "failed": self.failed,
+        }
+
+
+charging_profile_scheduler = ChargingProfileScheduler()
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from py_ocpi.core.config import logger, settings
+
+
+class CommandResultRegistry:
+    """
+    Results of accepted commands keyed by their `response_url`.
+
+    Command result is sent to the eMSP as soon as the integration calls
+    `resolve` with the result received from the Charge Point. Polling
+    of crud is kept as a fallback for results stored elsewhere, e.g. by
+    another process, every `COMMAND_POLL_INTERVAL` seconds doubled after
+    each attempt up to `COMMAND_POLL_MAX_INTERVAL`.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: Dict[str, asyncio.Future] = {}
+        # results resolved before their command started waiting
+        self._early_results: Dict[str, Tuple[float, Any]] = {}
+
+    def resolve(self, response_url: str, result: Any) -> bool:
+        """
+        Pass the result of the command to the waiting coroutine.
+
+        :param response_url: `response_url` of the command.
+        :param result: Command result, as it would be returned by crud.
+        :return: True if the command was waiting for the result.
+        """
+        future = self._waiters.get(response_url)
+        if future is not None and not future.done():
+            future.set_result(result)
+            return True
+
+        logger.debug("Command `%s` isn't awaited yet." % response_url)
+        now = time.monotonic()
+        self._early_results[response_url] = (now, result)
+        # drop results of commands which will never be awaited
+        ttl = settings.COMMAND_AWAIT_TIME * 60
+        for key, (resolved_at, _) in list(self._early_results.items()):
+            if now - resolved_at > ttl:
+                del self._early_results[key]
+        return False
+
+    def is_waiting(self, response_url: str) -> bool:
+        return response_url in self._waiters
+
+    async def wait(
+        self,
+        response_url: str,
+        poll: Callable[[], Awaitable[Any]],
+        timeout: float,
+    ) -> Any:
+        """
+        Return the result of the command or None if it didn't arrive.
+
+        :param response_url: `response_url` of the command.
+        :param poll: Coroutine function returning the result from crud.
+        :param timeout: Time, in seconds, to wait for the result.
+        """
+        early_result = self._early_results.pop(response_url, None)
+        if early_result is not None:
+            return early_result[1]
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[response_url] = future
+        deadline = time.monotonic() + timeout
+        interval = settings.COMMAND_POLL_INTERVAL
+        try:
+            while True:
+                if interval > 0:
+                    result = await poll()
+                    if result:
+                        return result
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                try:
+                    return await asyncio.wait_for(
+                        asyncio.shield(future),
+                        min(interval, remaining) if interval > 0 else remaining,
+                    )
+                except asyncio.TimeoutError:
+                    interval = min(
+                        interval * 2, settings.COMMAND_POLL_MAX_INTERVAL
+                    )
+        finally:
+            if self._waiters.get(response_url) is future:
+                del self._waiters[response_url]
+
+
+command_results = CommandResultRegistry()
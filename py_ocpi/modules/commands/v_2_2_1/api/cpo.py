@@ -1,4 +1,3 @@
-from asyncio import sleep
 from typing import Union
 
 from fastapi import (
@@ -13,7 +12,7 @@ from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 import httpx
 
-from py_ocpi.core.dependencies import get_crud, get_adapter
+from py_ocpi.core.dependencies import get_crud, get_adapter, get_http_client
 from py_ocpi.core.enums import ModuleID, RoleEnum, Action
 from py_ocpi.core.authentication.verifier import AuthorizationVerifier
 from py_ocpi.core.exceptions import NotFoundOCPIError
@@ -25,6 +24,7 @@ from py_ocpi.core import status
 from py_ocpi.core.config import settings
 from py_ocpi.core.utils import encode_string_base64, get_auth_token
 from py_ocpi.modules.versions.enums import VersionNumber
+from py_ocpi.modules.commands.registry import command_results
 from py_ocpi.modules.commands.v_2_2_1.enums import CommandType
 from py_ocpi.modules.commands.v_2_2_1.schemas import (
     CancelReservation,
@@ -67,6 +67,7 @@ async def send_command_result(
     auth_token: str,
     crud: Crud,
     adapter: Adapter,
+    http_client: httpx.AsyncClient,
 ):
     client_auth_token = await crud.do(
         ModuleID.commands,
@@ -76,10 +77,9 @@ async def send_command_result(
         version=VersionNumber.v_2_2_1,
     )
 
-    command_result = None
-    for _ in range(30 * settings.COMMAND_AWAIT_TIME):
+    async def poll():
         # since command has no id, 0 is used for id parameter of crud.get
-        command_result = await crud.get(
+        return await crud.get(
             ModuleID.commands,
             RoleEnum.cpo,
             0,
@@ -88,12 +88,14 @@ async def send_command_result(
             version=VersionNumber.v_2_2_1,
             command=command,
         )
-        if command_result:
-            logger.info(
-                "Command result from Charge Point - %s" % command_result
-            )
-            break
-        await sleep(2)
+
+    command_result = await command_results.wait(
+        command_data.response_url,
+        poll,
+        settings.COMMAND_AWAIT_TIME * 60,
+    )
+    if command_result:
+        logger.info("Command result from Charge Point - %s" % command_result)
 
     if not command_result:
         logger.info("Command result from Charge Point didn't arrive in time.")
@@ -103,20 +105,19 @@ async def send_command_result(
             command_result, VersionNumber.v_2_2_1
         )
 
-    async with httpx.AsyncClient() as client:
-        authorization_token = f"Token {encode_string_base64(client_auth_token)}"
-        logger.info(
-            "Send request with command result: %s" % command_data.response_url
-        )
-        res = await client.post(
-            command_data.response_url,
-            json=command_result.dict(),
-            headers={"authorization": authorization_token},
-        )
-        logger.info(
-            "POST command data after receiving result from Charge Point"
-            " status_code: %s" % res.status_code
-        )
+    authorization_token = f"Token {encode_string_base64(client_auth_token)}"
+    logger.info(
+        "Send request with command result: %s" % command_data.response_url
+    )
+    res = await http_client.post(
+        command_data.response_url,
+        json=command_result.dict(),
+        headers={"authorization": authorization_token},
+    )
+    logger.info(
+        "POST command data after receiving result from Charge Point"
+        " status_code: %s" % res.status_code
+    )
 
 
 @router.post("/{command}", response_model=OCPIResponse)
@@ -127,6 +128,7 @@ async def receive_command(
     background_tasks: BackgroundTasks,
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ):
     """
     Receive Command.
@@ -190,6 +192,7 @@ async def receive_command(
                     auth_token=auth_token,
                     crud=crud,
                     adapter=adapter,
+                    http_client=http_client,
                 )
             return OCPIResponse(
                 data=[
@@ -10,13 +10,21 @@ from fastapi import (
 
 from py_ocpi.core import status
 from py_ocpi.core.adapter import Adapter
+from py_ocpi.core.authentication.authenticator import Authenticator
 from py_ocpi.core.authentication.verifier import (
     AuthorizationVerifier,
     CredentialsAuthorizationVerifier,
 )
 from py_ocpi.core.crud import Crud
+from py_ocpi.core.delta import push_snapshots
+from py_ocpi.core.discovery import version_details_cache
 from py_ocpi.core.config import logger
-from py_ocpi.core.dependencies import get_crud, get_adapter
+from py_ocpi.core.dependencies import (
+    get_crud,
+    get_adapter,
+    get_authenticator,
+    get_http_client,
+)
 from py_ocpi.core.enums import ModuleID, RoleEnum
 from py_ocpi.core.schemas import OCPIResponse
 from py_ocpi.core.utils import get_auth_token
@@ -70,6 +78,8 @@ async def post_credentials(
     credentials: Credentials,
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
+    authenticator: Authenticator = Depends(get_authenticator),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
     server_cred: str | dict | None = Depends(cred_dependency),
 ):
     """
@@ -110,73 +120,69 @@ async def post_credentials(
         )
 
     # Retrieve the versions and endpoints from the client
-    async with httpx.AsyncClient() as client:
-        credentials_client_token = credentials.token
-        authorization_token = f"Token {credentials_client_token}"
+    credentials_client_token = credentials.token
+    authorization_token = f"Token {credentials_client_token}"
 
-        logger.info("Send request to get versions: %s" % credentials.url)
+    logger.info("Send request to get versions: %s" % credentials.url)
 
-        response_versions = await client.get(
-            credentials.url, headers={"authorization": authorization_token}
-        )
+    response_versions = await http_client.get(
+        credentials.url, headers={"authorization": authorization_token}
+    )
 
-        logger.info(
-            "GET versions status_code: %s" % response_versions.status_code
-        )
+    logger.info("GET versions status_code: %s" % response_versions.status_code)
 
-        if response_versions.status_code == fastapistatus.HTTP_200_OK:
-            version_url = None
-            versions = response_versions.json()["data"]
+    if response_versions.status_code == fastapistatus.HTTP_200_OK:
+        version_url = None
+        versions = response_versions.json()["data"]
 
-            logger.debug("GET versions response data: %s" % versions)
+        logger.debug("GET versions response data: %s" % versions)
 
-            for version in versions:
-                if version["version"] == VersionNumber.v_2_1_1:
-                    version_url = version["url"]
+        for version in versions:
+            if version["version"] == VersionNumber.v_2_1_1:
+                version_url = version["url"]
 
-            if not version_url:
-                logger.debug(
-                    "Version %s is not supported" % VersionNumber.v_2_1_1
-                )
+        if not version_url:
+            logger.debug("Version %s is not supported" % VersionNumber.v_2_1_1)
 
-                return OCPIResponse(
-                    data=[],
-                    **status.OCPI_3002_UNSUPPORTED_VERSION,
-                )
+            return OCPIResponse(
+                data=[],
+                **status.OCPI_3002_UNSUPPORTED_VERSION,
+            )
 
-            logger.info("Send request to get version details: %s" % version_url)
+        logger.info("Send request to get version details: %s" % version_url)
 
-            response_endpoints = await client.get(
-                version_url, headers={"authorization": authorization_token}
-            )
+        response_endpoints = await http_client.get(
+            version_url, headers={"authorization": authorization_token}
+        )
 
-            logger.info(
-                "GET version details status_code: %s"
-                % response_endpoints.status_code
-            )
+        logger.info(
+            "GET version details status_code: %s"
+            % response_endpoints.status_code
+        )
+
+        if response_endpoints.status_code == fastapistatus.HTTP_200_OK:
+            # Store client credentials and generate new credentials for sender
+            endpoints = response_endpoints.json()["data"]
 
-            if response_endpoints.status_code == fastapistatus.HTTP_200_OK:
-                # Store client credentials and generate new credentials for sender
-                endpoints = response_endpoints.json()["data"]
-
-                logger.debug(
-                    "GET version details response data: %s" % endpoints
-                )
-
-                new_credentials = await crud.create(
-                    ModuleID.credentials_and_registration,
-                    RoleEnum.emsp,
-                    {"credentials": credentials.dict(), "endpoints": endpoints},
-                    auth_token=auth_token,
-                    version=VersionNumber.v_2_1_1,
-                )
-
-                return OCPIResponse(
-                    data=adapter.credentials_adapter(
-                        new_credentials, VersionNumber.v_2_1_1
-                    ).dict(),
-                    **status.OCPI_1000_GENERIC_SUCESS_CODE,
-                )
+            logger.debug("GET version details response data: %s" % endpoints)
+
+            new_credentials = await crud.create(
+                ModuleID.credentials_and_registration,
+                RoleEnum.emsp,
+                {"credentials": credentials.dict(), "endpoints": endpoints},
+                auth_token=auth_token,
+                version=VersionNumber.v_2_1_1,
+            )
+            authenticator.invalidate_token_cache()
+            version_details_cache.invalidate(version_url)
+            push_snapshots.invalidate(version_url)
+
+            return OCPIResponse(
+                data=adapter.credentials_adapter(
+                    new_credentials, VersionNumber.v_2_1_1
+                ).dict(),
+                **status.OCPI_1000_GENERIC_SUCESS_CODE,
+            )
 
     return OCPIResponse(
         data=[],
@@ -190,6 +196,8 @@ async def update_credentials(
     credentials: Credentials,
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
+    authenticator: Authenticator = Depends(get_authenticator),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
     server_cred: str | dict | None = Depends(cred_dependency),
 ):
     """
@@ -221,75 +229,71 @@ async def update_credentials(
         )
 
     # Retrieve the versions and endpoints from the client
-    async with httpx.AsyncClient() as client:
-        credentials_client_token = credentials.token
-        authorization_token = f"Token {credentials_client_token}"
+    credentials_client_token = credentials.token
+    authorization_token = f"Token {credentials_client_token}"
 
-        logger.info("Send request to get versions: %s" % credentials.url)
+    logger.info("Send request to get versions: %s" % credentials.url)
 
-        response_versions = await client.get(
-            credentials.url, headers={"authorization": authorization_token}
-        )
+    response_versions = await http_client.get(
+        credentials.url, headers={"authorization": authorization_token}
+    )
 
-        logger.info(
-            "GET versions status_code: %s" % response_versions.status_code
-        )
+    logger.info("GET versions status_code: %s" % response_versions.status_code)
 
-        if response_versions.status_code == fastapistatus.HTTP_200_OK:
-            version_url = None
-            versions = response_versions.json()["data"]
+    if response_versions.status_code == fastapistatus.HTTP_200_OK:
+        version_url = None
+        versions = response_versions.json()["data"]
 
-            logger.debug("GET versions response data: %s" % versions)
+        logger.debug("GET versions response data: %s" % versions)
 
-            for version in versions:
-                if version["version"] == VersionNumber.v_2_1_1:
-                    version_url = version["url"]
+        for version in versions:
+            if version["version"] == VersionNumber.v_2_1_1:
+                version_url = version["url"]
 
-            if not version_url:
-                logger.debug(
-                    "Version %s is not supported" % VersionNumber.v_2_1_1
-                )
+        if not version_url:
+            logger.debug("Version %s is not supported" % VersionNumber.v_2_1_1)
 
-                return OCPIResponse(
-                    data=[],
-                    **status.OCPI_3002_UNSUPPORTED_VERSION,
-                )
+            return OCPIResponse(
+                data=[],
+                **status.OCPI_3002_UNSUPPORTED_VERSION,
+            )
 
-            logger.info("Send request to get version details: %s" % version_url)
+        logger.info("Send request to get version details: %s" % version_url)
 
-            response_endpoints = await client.get(
-                version_url, headers={"authorization": authorization_token}
-            )
+        response_endpoints = await http_client.get(
+            version_url, headers={"authorization": authorization_token}
+        )
 
-            logger.info(
-                "GET version details status_code: %s"
-                % response_endpoints.status_code
-            )
+        logger.info(
+            "GET version details status_code: %s"
+            % response_endpoints.status_code
+        )
+
+        if response_endpoints.status_code == fastapistatus.HTTP_200_OK:
+            # Update server credentials to access client's
+            # system and generate new credentials token
+            endpoints = response_endpoints.json()["data"]
 
-            if response_endpoints.status_code == fastapistatus.HTTP_200_OK:
-                # Update server credentials to access client's
-                # system and generate new credentials token
-                endpoints = response_endpoints.json()["data"]
-
-                logger.debug(
-                    "GET version details response data: %s" % endpoints
-                )
-
-                new_credentials = await crud.update(
-                    ModuleID.credentials_and_registration,
-                    RoleEnum.emsp,
-                    {"credentials": credentials.dict(), "endpoints": endpoints},
-                    None,
-                    auth_token=auth_token,
-                    version=VersionNumber.v_2_1_1,
-                )
-
-                return OCPIResponse(
-                    data=adapter.credentials_adapter(
-                        new_credentials, VersionNumber.v_2_1_1
-                    ).dict(),
-                    **status.OCPI_1000_GENERIC_SUCESS_CODE,
-                )
+            logger.debug("GET version details response data: %s" % endpoints)
+
+            new_credentials = await crud.update(
+                ModuleID.credentials_and_registration,
+                RoleEnum.emsp,
+                {"credentials": credentials.dict(), "endpoints": endpoints},
+                None,
+                auth_token=auth_token,
+                version=VersionNumber.v_2_1_1,
+            )
+            authenticator.invalidate_token_cache()
+            version_details_cache.invalidate(version_url)
+            push_snapshots.invalidate(version_url)
+
+            return OCPIResponse(
+                data=adapter.credentials_adapter(
+                    new_credentials, VersionNumber.v_2_1_1
+                ).dict(),
+                **status.OCPI_1000_GENERIC_SUCESS_CODE,
+            )
 
     return OCPIResponse(
         data=[],
@@ -306,6 +310,7 @@ async def remove_credentials(
     request: Request,
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
+    authenticator: Authenticator = Depends(get_authenticator),
 ):
     """
     Remove credentials.
@@ -345,6 +350,9 @@ async def remove_credentials(
         auth_token=auth_token,
         version=VersionNumber.v_2_1_1,
     )
+    authenticator.invalidate_token_cache()
+    version_details_cache.invalidate()
+    push_snapshots.invalidate()
 
     return OCPIResponse(
         data=[],
@@ -0,0 +1,267 @@
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from py_ocpi.core.adapter import Adapter
+from py_ocpi.core.config import logger
+from py_ocpi.core.crud import overrides
+from py_ocpi.core.enums import ModuleID, RoleEnum
+from py_ocpi.core.exceptions import NotFoundOCPIError
+from py_ocpi.core.utils import partially_update_attributes
+from py_ocpi.modules.versions.enums import VersionNumber
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+def index_by(items: Optional[list], key: str) -> Dict[str, Any]:
+    return {getattr(item, key): item for item in items or []}
+
+
+async def load_location(
+    crud: Any,
+    adapter: Adapter,
+    version: VersionNumber,
+    location_id: str,
+    **kwargs,
+) -> BaseModel:
+    data = await crud.get(
+        ModuleID.locations,
+        RoleEnum.emsp,
+        location_id,
+        version=version,
+        **kwargs,
+    )
+    if not data:
+        logger.debug("Location with id `%s` was not found." % location_id)
+        raise NotFoundOCPIError
+    return adapter.location_adapter(data, version)
+
+
+async def save_location(
+    crud: Any,
+    version: VersionNumber,
+    location: BaseModel,
+    location_id: str,
+    **kwargs,
+) -> None:
+    await crud.update(
+        ModuleID.locations,
+        RoleEnum.emsp,
+        location.dict(),
+        location_id,
+        version=version,
+        **kwargs,
+    )
+
+
+def find_evse(location: BaseModel, evse_uid: str) -> BaseModel:
+    evse = index_by(location.evses, "uid").get(evse_uid)  # type: ignore
+    if evse is None:
+        logger.debug("Evse with id `%s` was not found." % evse_uid)
+        raise NotFoundOCPIError
+    return evse
+
+
+def find_connector(evse: BaseModel, connector_id: str) -> BaseModel:
+    connector = index_by(evse.connectors, "id").get(  # type: ignore
+        connector_id
+    )
+    if connector is None:
+        logger.debug("Connector with id `%s` was not found." % connector_id)
+        raise NotFoundOCPIError
+    return connector
+
+
+def validate(schema: Type[Model], data: Any) -> Model:
+    if not data:
+        raise NotFoundOCPIError
+    if isinstance(data, schema):
+        return data
+    return schema(**data)
+
+
+async def fetch_evse(
+    crud: Any,
+    adapter: Adapter,
+    version: VersionNumber,
+    schema: Type[BaseModel],
+    location_id: str,
+    evse_uid: str,
+    **kwargs,
+) -> BaseModel:
+    """Return EVSE, from `crud.get_evse` or from the whole location."""
+    if not overrides(crud, "get_evse"):
+        location = await load_location(
+            crud, adapter, version, location_id, **kwargs
+        )
+        return find_evse(location, evse_uid)
+    data = await crud.get_evse(
+        ModuleID.locations,
+        RoleEnum.emsp,
+        location_id,
+        evse_uid,
+        version=version,
+        **kwargs,
+    )
+    return validate(schema, data)
+
+
+async def fetch_connector(
+    crud: Any,
+    adapter: Adapter,
+    version: VersionNumber,
+    schema: Type[BaseModel],
+    location_id: str,
+    evse_uid: str,
+    connector_id: str,
+    **kwargs,
+) -> BaseModel:
+    """Return connector, from `crud.get_connector` or the whole location."""
+    if not overrides(crud, "get_connector"):
+        location = await load_location(
+            crud, adapter, version, location_id, **kwargs
+        )
+        return find_connector(find_evse(location, evse_uid), connector_id)
+    data = await crud.get_connector(
+        ModuleID.locations,
+        RoleEnum.emsp,
+        location_id,
+        evse_uid,
+        connector_id,
+        version=version,
+        **kwargs,
+    )
+    return validate(schema, data)
+
+
+async def upsert_evse(
+    crud: Any,
+    adapter: Adapter,
+    version: VersionNumber,
+    evse: Model,
+    location_id: str,
+    evse_uid: str,
+    **kwargs,
+) -> Model:
+    """Store EVSE with `crud.upsert_evse` or as part of the location."""
+    if not overrides(crud, "upsert_evse"):
+        location = await load_location(
+            crud, adapter, version, location_id, **kwargs
+        )
+        evses = index_by(location.evses, "uid")  # type: ignore
+        if evse_uid in evses:
+            logger.debug("Update evse with id - %s" % evse_uid)
+        evses[evse_uid] = evse
+        location.evses = list(evses.values())  # type: ignore
+        await save_location(crud, version, location, location_id, **kwargs)
+        return evse
+    data = await crud.upsert_evse(
+        ModuleID.locations,
+        RoleEnum.emsp,
+        evse.dict(),
+        location_id,
+        evse_uid,
+        version=version,
+        **kwargs,
+    )
+    return validate(type(evse), data)
+
+
+async def upsert_connector(
+    crud: Any,
+    adapter: Adapter,
+    version: VersionNumber,
+    connector: Model,
+    location_id: str,
+    evse_uid: str,
+    connector_id: str,
+    **kwargs,
+) -> Model:
+    """Store connector with `crud.upsert_connector` or as part of the location."""
+    if not overrides(crud, "upsert_connector"):
+        location = await load_location(
+            crud, adapter, version, location_id, **kwargs
+        )
+        evse = find_evse(location, evse_uid)
+        connectors = index_by(evse.connectors, "id")  # type: ignore
+        if connector_id in connectors:
+            logger.debug("Update connector with id - %s" % connector_id)
+        connectors[connector_id] = connector
+        evse.connectors = list(connectors.values())  # type: ignore
+        await save_location(crud, version, location, location_id, **kwargs)
+        return connector
+    data = await crud.upsert_connector(
+        ModuleID.locations,
+        RoleEnum.emsp,
+        connector.dict(),
+        location_id,
+        evse_uid,
+        connector_id,
+        version=version,
+        **kwargs,
+    )
+    return validate(type(connector), data)
+
+
+async def patch_evse(
+    crud: Any,
+    adapter: Adapter,
+    version: VersionNumber,
+    schema: Type[BaseModel],
+    patch: dict,
+    location_id: str,
+    evse_uid: str,
+    **kwargs,
+) -> BaseModel:
+    """Update EVSE fields with `crud.patch_evse` or in the location."""
+    if not overrides(crud, "patch_evse"):
+        location = await load_location(
+            crud, adapter, version, location_id, **kwargs
+        )
+        evse = find_evse(location, evse_uid)
+        partially_update_attributes(evse, patch)
+        await save_location(crud, version, location, location_id, **kwargs)
+        return evse
+    data = await crud.patch_evse(
+        ModuleID.locations,
+        RoleEnum.emsp,
+        patch,
+        location_id,
+        evse_uid,
+        version=version,
+        **kwargs,
+    )
+    return validate(schema, data)
+
+
+async def patch_connector(
+    crud: Any,
+    adapter: Adapter,
+    version: VersionNumber,
+    schema: Type[BaseModel],
+    patch: dict,
+    location_id: str,
+    evse_uid: str,
+    connector_id: str,
+    **kwargs,
+) -> BaseModel:
+    """Update connector fields with `crud.patch_connector` or in the location."""
+    if not overrides(crud, "patch_connector"):
+        location = await load_location(
+            crud, adapter, version, location_id, **kwargs
+        )
+        connector = find_connector(find_evse(location, evse_uid), connector_id)
+        partially_update_attributes(connector, patch)
+        await save_location(crud, version, location, location_id, **kwargs)
+        return connector
+    data = await crud.patch_connector(
+        ModuleID.locations,
+        RoleEnum.emsp,
+        patch,
+        location_id,
+        evse_uid,
+        connector_id,
+        version=version,
+        **kwargs,
+    )
+    return validate(schema, data)
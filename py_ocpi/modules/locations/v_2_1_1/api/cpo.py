@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, Response, Request
 
 from py_ocpi.modules.versions.enums import VersionNumber
 from py_ocpi.core.utils import get_list, get_auth_token
+from py_ocpi.core.conditional import check_object
+from py_ocpi.core.streaming import stream_list
 from py_ocpi.core import status
 from py_ocpi.core.schemas import OCPIResponse
 from py_ocpi.core.adapter import Adapter
@@ -11,7 +13,12 @@ from py_ocpi.core.config import logger
 from py_ocpi.core.data_types import String
 from py_ocpi.core.enums import ModuleID, RoleEnum
 from py_ocpi.core.exceptions import NotFoundOCPIError
-from py_ocpi.core.dependencies import get_crud, get_adapter, pagination_filters
+from py_ocpi.core.dependencies import (
+    get_crud,
+    get_adapter,
+    get_list_streaming,
+    pagination_filters,
+)
 
 router = APIRouter(
     prefix="/locations",
@@ -26,6 +33,7 @@ async def get_locations(
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
     filters: dict = Depends(pagination_filters),
+    list_streaming: bool = Depends(get_list_streaming),
 ):
     """
     Get locations.
@@ -46,6 +54,18 @@ async def get_locations(
     logger.info("Received request to get locations.")
     auth_token = get_auth_token(request, VersionNumber.v_2_1_1)
 
+    if list_streaming:
+        return await stream_list(
+            response,
+            filters,
+            ModuleID.locations,
+            RoleEnum.cpo,
+            VersionNumber.v_2_1_1,
+            crud,
+            lambda data: adapter.location_adapter(data, VersionNumber.v_2_1_1),
+            auth_token=auth_token,
+        )
+
     data_list = await get_list(
         response,
         filters,
@@ -100,6 +120,7 @@ async def get_location(
         version=VersionNumber.v_2_1_1,
     )
     if data:
+        check_object(data, ModuleID.locations)
         return OCPIResponse(
             data=[adapter.location_adapter(data, VersionNumber.v_2_1_1).dict()],
             **status.OCPI_1000_GENERIC_SUCESS_CODE,
@@ -151,6 +172,7 @@ async def get_evse(
         location = adapter.location_adapter(data, VersionNumber.v_2_1_1)
         for evse in location.evses:
             if evse.uid == evse_uid:
+                check_object(evse, ModuleID.locations, "uid")
                 return OCPIResponse(
                     data=[evse.dict()],
                     **status.OCPI_1000_GENERIC_SUCESS_CODE,
@@ -211,6 +233,7 @@ async def get_connector(
             if evse.uid == evse_uid:
                 for connector in evse.connectors:
                     if connector.id == connector_id:
+                        check_object(connector, ModuleID.locations)
                         return OCPIResponse(
                             data=[connector.dict()],
                             **status.OCPI_1000_GENERIC_SUCESS_CODE,
@@ -1,8 +1,6 @@
-import copy
-
 from fastapi import APIRouter, Depends, Request
 
-from py_ocpi.core.utils import get_auth_token, partially_update_attributes
+from py_ocpi.core.utils import get_auth_token, apply_partial_update
 from py_ocpi.core import status
 from py_ocpi.core.schemas import OCPIResponse
 from py_ocpi.core.adapter import Adapter
@@ -14,6 +12,14 @@ from py_ocpi.core.enums import ModuleID, RoleEnum
 from py_ocpi.core.exceptions import NotFoundOCPIError
 from py_ocpi.core.dependencies import get_crud, get_adapter
 from py_ocpi.modules.versions.enums import VersionNumber
+from py_ocpi.modules.locations.utils import (
+    fetch_connector,
+    fetch_evse,
+    patch_connector,
+    patch_evse,
+    upsert_connector,
+    upsert_evse,
+)
 from py_ocpi.modules.locations.v_2_2_1.schemas import (
     Location,
     LocationPartialUpdate,
@@ -117,26 +123,21 @@ async def get_evse(
     )
     auth_token = get_auth_token(request)
 
-    data = await crud.get(
-        ModuleID.locations,
-        RoleEnum.emsp,
+    evse = await fetch_evse(
+        crud,
+        adapter,
+        VersionNumber.v_2_2_1,
+        EVSE,
         location_id,
+        evse_uid,
         auth_token=auth_token,
         country_code=country_code,
         party_id=party_id,
-        version=VersionNumber.v_2_2_1,
     )
-    if data:
-        location = adapter.location_adapter(data)
-        for evse in location.evses:
-            if evse.uid == evse_uid:
-                return OCPIResponse(
-                    data=[evse.dict()],
-                    **status.OCPI_1000_GENERIC_SUCESS_CODE,
-                )
-        logger.debug("Evse with id `%s` was not found." % evse_uid)
-    logger.debug("Location with id `%s` was not found." % location_id)
-    raise NotFoundOCPIError
+    return OCPIResponse(
+        data=[evse.dict()],
+        **status.OCPI_1000_GENERIC_SUCESS_CODE,
+    )
 
 
 @router.get(
@@ -182,31 +183,22 @@ async def get_connector(
     )
     auth_token = get_auth_token(request)
 
-    data = await crud.get(
-        ModuleID.locations,
-        RoleEnum.emsp,
+    connector = await fetch_connector(
+        crud,
+        adapter,
+        VersionNumber.v_2_2_1,
+        Connector,
         location_id,
+        evse_uid,
+        connector_id,
         auth_token=auth_token,
         country_code=country_code,
         party_id=party_id,
-        version=VersionNumber.v_2_2_1,
     )
-    if data:
-        location = adapter.location_adapter(data)
-        for evse in location.evses:
-            if evse.uid == evse_uid:
-                for connector in evse.connectors:
-                    if connector.id == connector_id:
-                        return OCPIResponse(
-                            data=[connector.dict()],
-                            **status.OCPI_1000_GENERIC_SUCESS_CODE,
-                        )
-                logger.debug(
-                    "Connector with id `%s` was not found." % connector_id
-                )
-        logger.debug("Evse with id `%s` was not found." % evse_uid)
-    logger.debug("Location with id `%s` was not found." % location_id)
-    raise NotFoundOCPIError
+    return OCPIResponse(
+        data=[connector.dict()],
+        **status.OCPI_1000_GENERIC_SUCESS_CODE,
+    )
 
 
 @router.put(
@@ -328,44 +320,21 @@ async def add_or_update_evse(
     logger.debug("Evse data to update - %s" % evse.dict())
     auth_token = get_auth_token(request)
 
-    old_data = await crud.get(
-        ModuleID.locations,
-        RoleEnum.emsp,
+    evse = await upsert_evse(
+        crud,
+        adapter,
+        VersionNumber.v_2_2_1,
+        evse,
         location_id,
+        evse_uid,
         auth_token=auth_token,
         country_code=country_code,
         party_id=party_id,
-        version=VersionNumber.v_2_2_1,
     )
-    if old_data:
-        old_location = adapter.location_adapter(old_data)
-        new_location = copy.deepcopy(old_location)
-
-        for old_evse in old_location.evses:
-            if old_evse.uid == evse_uid:
-                logger.debug("Update evse with id - %s" % evse_uid)
-                new_location.evses.remove(old_evse)
-                break
-
-        new_location.evses.append(evse)
-
-        await crud.update(
-            ModuleID.locations,
-            RoleEnum.emsp,
-            new_location.dict(),
-            location_id,
-            auth_token=auth_token,
-            country_code=country_code,
-            party_id=party_id,
-            version=VersionNumber.v_2_2_1,
-        )
-
-        return OCPIResponse(
-            data=[evse.dict()],
-            **status.OCPI_1000_GENERIC_SUCESS_CODE,
-        )
-    logger.debug("Location with id `%s` was not found." % location_id)
-    raise NotFoundOCPIError
+    return OCPIResponse(
+        data=[evse.dict()],
+        **status.OCPI_1000_GENERIC_SUCESS_CODE,
+    )
 
 
 @router.put(
@@ -414,51 +383,22 @@ async def add_or_update_connector(
     logger.debug("Connector data to update - %s" % connector.dict())
     auth_token = get_auth_token(request)
 
-    old_data = await crud.get(
-        ModuleID.locations,
-        RoleEnum.emsp,
+    connector = await upsert_connector(
+        crud,
+        adapter,
+        VersionNumber.v_2_2_1,
+        connector,
         location_id,
+        evse_uid,
+        connector_id,
         auth_token=auth_token,
         country_code=country_code,
         party_id=party_id,
-        version=VersionNumber.v_2_2_1,
     )
-    if old_data:
-        old_location = adapter.location_adapter(old_data)
-        new_location = copy.deepcopy(old_location)
-
-        for old_evse in old_location.evses:
-            if old_evse.uid == evse_uid:
-                new_location.evses.remove(old_evse)
-                new_evse = copy.deepcopy(old_evse)
-                for old_connector in old_evse.connectors:
-                    if old_connector.id == connector_id:
-                        logger.debug(
-                            "Update connector with id - %s" % connector_id
-                        )
-                        new_evse.connectors.remove(old_connector)
-                        break
-                new_evse.connectors.append(connector)
-                new_location.evses.append(new_evse)
-
-                await crud.update(
-                    ModuleID.locations,
-                    RoleEnum.emsp,
-                    new_location.dict(),
-                    location_id,
-                    auth_token=auth_token,
-                    country_code=country_code,
-                    party_id=party_id,
-                    version=VersionNumber.v_2_2_1,
-                )
-
-                return OCPIResponse(
-                    data=[connector.dict()],
-                    **status.OCPI_1000_GENERIC_SUCESS_CODE,
-                )
-        logger.debug("Evse with id `%s` was not found." % evse_uid)
-    logger.debug("Location with id `%s` was not found." % location_id)
-    raise NotFoundOCPIError
+    return OCPIResponse(
+        data=[connector.dict()],
+        **status.OCPI_1000_GENERIC_SUCESS_CODE,
+    )
 
 
 @router.patch(
@@ -510,18 +450,14 @@ async def partial_update_location(
         version=VersionNumber.v_2_2_1,
     )
     if old_data:
-        old_location = adapter.location_adapter(old_data)
-        new_location = copy.deepcopy(old_location)
-
-        partially_update_attributes(
-            new_location,
-            location.dict(exclude_defaults=True, exclude_unset=True),
+        new_location = apply_partial_update(
+            old_data, location, adapter.location_adapter
         )
 
         data = await crud.update(
             ModuleID.locations,
             RoleEnum.emsp,
-            new_location.dict(),
+            new_location,
             location_id,
             auth_token=auth_token,
             country_code=country_code,
@@ -581,46 +517,22 @@ async def partial_update_evse(
     logger.debug("Evse data to update - %s" % evse.dict())
     auth_token = get_auth_token(request)
 
-    old_data = await crud.get(
-        ModuleID.locations,
-        RoleEnum.emsp,
+    new_evse = await patch_evse(
+        crud,
+        adapter,
+        VersionNumber.v_2_2_1,
+        EVSE,
+        evse.dict(exclude_defaults=True, exclude_unset=True),
         location_id,
+        evse_uid,
         auth_token=auth_token,
         country_code=country_code,
         party_id=party_id,
-        version=VersionNumber.v_2_2_1,
     )
-    if old_data:
-        old_location = adapter.location_adapter(old_data)
-        new_location = copy.deepcopy(old_location)
-
-        for old_evse in old_location.evses:
-            if old_evse.uid == evse_uid:
-                new_location.evses.remove(old_evse)
-                new_evse = copy.deepcopy(old_evse)
-                partially_update_attributes(
-                    new_evse,
-                    evse.dict(exclude_defaults=True, exclude_unset=True),
-                )
-                new_location.evses.append(new_evse)
-
-                await crud.update(
-                    ModuleID.locations,
-                    RoleEnum.emsp,
-                    new_location.dict(),
-                    location_id,
-                    auth_token=auth_token,
-                    country_code=country_code,
-                    party_id=party_id,
-                    version=VersionNumber.v_2_2_1,
-                )
-                return OCPIResponse(
-                    data=[new_evse.dict()],
-                    **status.OCPI_1000_GENERIC_SUCESS_CODE,
-                )
-        logger.debug("Evse with id `%s` was not found." % evse_uid)
-    logger.debug("Location with id `%s` was not found." % location_id)
-    raise NotFoundOCPIError
+    return OCPIResponse(
+        data=[new_evse.dict()],
+        **status.OCPI_1000_GENERIC_SUCESS_CODE,
+    )
 
 
 @router.patch(
@@ -671,49 +583,20 @@ async def partial_update_connector(
     logger.debug("Connector data to update - %s" % connector.dict())
     auth_token = get_auth_token(request)
 
-    old_data = await crud.get(
-        ModuleID.locations,
-        RoleEnum.emsp,
+    new_connector = await patch_connector(
+        crud,
+        adapter,
+        VersionNumber.v_2_2_1,
+        Connector,
+        connector.dict(exclude_defaults=True, exclude_unset=True),
         location_id,
+        evse_uid,
+        connector_id,
         auth_token=auth_token,
         country_code=country_code,
         party_id=party_id,
-        version=VersionNumber.v_2_2_1,
     )
-    if old_data:
-        old_location = adapter.location_adapter(old_data)
-
-        for old_evse in old_location.evses:
-            if old_evse.uid == evse_uid:
-                for old_connector in old_evse.connectors:
-                    if old_connector.id == connector_id:
-                        new_connector = old_connector
-                        partially_update_attributes(
-                            new_connector,
-                            connector.dict(
-                                exclude_defaults=True, exclude_unset=True
-                            ),
-                        )
-                        new_location = old_location
-
-                        await crud.update(
-                            ModuleID.locations,
-                            RoleEnum.emsp,
-                            new_location.dict(),
-                            location_id,
-                            auth_token=auth_token,
-                            country_code=country_code,
-                            party_id=party_id,
-                            version=VersionNumber.v_2_2_1,
-                        )
-
-                        return OCPIResponse(
-                            data=[new_connector.dict()],
-                            **status.OCPI_1000_GENERIC_SUCESS_CODE,
-                        )
-                logger.debug(
-                    "Connector with id `%s` was not found." % connector_id
-                )
-        logger.debug("Evse with id `%s` was not found." % evse_uid)
-    logger.debug("Location with id `%s` was not found." % location_id)
-    raise NotFoundOCPIError
+    return OCPIResponse(
+        data=[new_connector.dict()],
+        **status.OCPI_1000_GENERIC_SUCESS_CODE,
+    )
@@ -1,4 +1,4 @@
-from copy import deepcopy
+from functools import partial
 
 from fastapi import APIRouter, Depends, Request
 
@@ -14,7 +14,7 @@ from py_ocpi.core.exceptions import NotFoundOCPIError
 from py_ocpi.core.schemas import OCPIResponse
 from py_ocpi.core.utils import (
     get_auth_token,
-    partially_update_attributes,
+    apply_partial_update,
 )
 from py_ocpi.modules.sessions.v_2_1_1.schemas import (
     SessionPartialUpdate,
@@ -197,17 +197,16 @@ async def partial_update_session(
         version=VersionNumber.v_2_1_1,
     )
     if old_data:
-        old_session = adapter.session_adapter(old_data, VersionNumber.v_2_1_1)
-
-        new_session = deepcopy(old_session)
-        partially_update_attributes(
-            new_session, session.dict(exclude_defaults=True, exclude_unset=True)
+        new_session = apply_partial_update(
+            old_data,
+            session,
+            partial(adapter.session_adapter, version=VersionNumber.v_2_1_1),
         )
 
         data = await crud.update(
             ModuleID.sessions,
             RoleEnum.emsp,
-            new_session.dict(),
+            new_session,
             session_id,
             auth_token=auth_token,
             country_code=country_code,
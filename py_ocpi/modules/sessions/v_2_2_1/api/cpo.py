@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, Response, Request
 from py_ocpi.modules.sessions.v_2_2_1.schemas import ChargingPreferences
 from py_ocpi.modules.versions.enums import VersionNumber
 from py_ocpi.core.utils import get_list, get_auth_token
+from py_ocpi.core.streaming import stream_list
 from py_ocpi.core import status
 from py_ocpi.core.schemas import OCPIResponse
 from py_ocpi.core.adapter import Adapter
@@ -11,7 +12,12 @@ from py_ocpi.core.crud import Crud
 from py_ocpi.core.config import logger
 from py_ocpi.core.data_types import CiString
 from py_ocpi.core.enums import ModuleID, RoleEnum
-from py_ocpi.core.dependencies import get_crud, get_adapter, pagination_filters
+from py_ocpi.core.dependencies import (
+    get_crud,
+    get_adapter,
+    get_list_streaming,
+    pagination_filters,
+)
 
 router = APIRouter(
     prefix="/sessions",
@@ -26,6 +32,7 @@ async def get_sessions(
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
     filters: dict = Depends(pagination_filters),
+    list_streaming: bool = Depends(get_list_streaming),
 ):
     """
     Get sessions.
@@ -46,6 +53,18 @@ async def get_sessions(
     logger.info("Received request to get sessions.")
     auth_token = get_auth_token(request)
 
+    if list_streaming:
+        return await stream_list(
+            response,
+            filters,
+            ModuleID.sessions,
+            RoleEnum.cpo,
+            VersionNumber.v_2_2_1,
+            crud,
+            adapter.session_adapter,
+            auth_token=auth_token,
+        )
+
     data_list = await get_list(
         response,
         filters,
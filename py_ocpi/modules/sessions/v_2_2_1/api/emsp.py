@@ -1,5 +1,3 @@
-import copy
-
 from fastapi import APIRouter, Depends, Request
 
 from py_ocpi.modules.sessions.v_2_2_1.schemas import (
@@ -7,7 +5,7 @@ from py_ocpi.modules.sessions.v_2_2_1.schemas import (
     Session,
 )
 from py_ocpi.modules.versions.enums import VersionNumber
-from py_ocpi.core.utils import get_auth_token, partially_update_attributes
+from py_ocpi.core.utils import get_auth_token, apply_partial_update
 from py_ocpi.core import status
 from py_ocpi.core.schemas import OCPIResponse
 from py_ocpi.core.adapter import Adapter
@@ -194,17 +192,14 @@ async def partial_update_session(
         version=VersionNumber.v_2_2_1,
     )
     if old_data:
-        old_session = adapter.session_adapter(old_data)
-
-        new_session = copy.deepcopy(old_session)
-        partially_update_attributes(
-            new_session, session.dict(exclude_defaults=True, exclude_unset=True)
+        new_session = apply_partial_update(
+            old_data, session, adapter.session_adapter
         )
 
         data = await crud.update(
             ModuleID.sessions,
             RoleEnum.emsp,
-            new_session.dict(),
+            new_session,
             session_id,
             auth_token=auth_token,
             country_code=country_code,
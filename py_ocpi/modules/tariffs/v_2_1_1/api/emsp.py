@@ -1,4 +1,4 @@
-import copy
+from functools import partial
 
 from fastapi import APIRouter, Depends, Request
 
@@ -14,7 +14,7 @@ from py_ocpi.core.exceptions import NotFoundOCPIError
 from py_ocpi.core.schemas import OCPIResponse
 from py_ocpi.core.utils import (
     get_auth_token,
-    partially_update_attributes,
+    apply_partial_update,
 )
 from py_ocpi.modules.tariffs.v_2_1_1.schemas import Tariff, TariffPartialUpdate
 from py_ocpi.modules.versions.enums import VersionNumber
@@ -194,17 +194,16 @@ async def partial_update_tariff(
         version=VersionNumber.v_2_1_1,
     )
     if old_data:
-        old_tariff = adapter.tariff_adapter(old_data, VersionNumber.v_2_1_1)
-        new_tariff = copy.deepcopy(old_tariff)
-
-        partially_update_attributes(
-            new_tariff, tariff.dict(exclude_defaults=True, exclude_unset=True)
+        new_tariff = apply_partial_update(
+            old_data,
+            tariff,
+            partial(adapter.tariff_adapter, version=VersionNumber.v_2_1_1),
         )
 
         data = await crud.update(
             ModuleID.tariffs,
             RoleEnum.emsp,
-            new_tariff.dict(),
+            new_tariff,
             tariff_id,
             auth_token=auth_token,
             country_code=country_code,
@@ -1,4 +1,4 @@
-from copy import deepcopy
+from functools import partial
 
 from fastapi import APIRouter, Request, Depends
 
@@ -13,7 +13,7 @@ from py_ocpi.core.crud import Crud
 from py_ocpi.core.config import logger
 from py_ocpi.core.utils import (
     get_auth_token,
-    partially_update_attributes,
+    apply_partial_update,
 )
 from py_ocpi.core.dependencies import get_crud, get_adapter
 from py_ocpi.modules.versions.enums import VersionNumber
@@ -195,17 +195,16 @@ async def partial_update_token(
         logger.debug("Token with id `%s` was not found." % token_uid)
 
         raise NotFoundOCPIError
-    old_token = adapter.token_adapter(old_data, VersionNumber.v_2_1_1)
-
-    new_token = deepcopy(old_token)
-    partially_update_attributes(
-        new_token, token.dict(exclude_defaults=True, exclude_unset=True)
+    new_token = apply_partial_update(
+        old_data,
+        token,
+        partial(adapter.token_adapter, version=VersionNumber.v_2_1_1),
     )
 
     data = await crud.update(
         ModuleID.tokens,
         RoleEnum.cpo,
-        new_token.dict(),
+        new_token,
         token_uid,
         auth_token=auth_token,
         country_code=country_code,
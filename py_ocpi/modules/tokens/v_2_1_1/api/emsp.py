@@ -4,6 +4,7 @@ from py_ocpi.modules.tokens.v_2_1_1.enums import TokenType
 from py_ocpi.modules.tokens.v_2_1_1.schemas import LocationReference
 from py_ocpi.modules.versions.enums import VersionNumber
 from py_ocpi.core.utils import get_list, get_auth_token
+from py_ocpi.core.streaming import stream_list
 from py_ocpi.core import status
 from py_ocpi.core.schemas import OCPIResponse
 from py_ocpi.core.adapter import Adapter
@@ -13,7 +14,12 @@ from py_ocpi.core.config import logger
 from py_ocpi.core.exceptions import NotFoundOCPIError
 from py_ocpi.core.data_types import String
 from py_ocpi.core.enums import ModuleID, RoleEnum, Action
-from py_ocpi.core.dependencies import get_crud, get_adapter, pagination_filters
+from py_ocpi.core.dependencies import (
+    get_crud,
+    get_adapter,
+    get_list_streaming,
+    pagination_filters,
+)
 
 router = APIRouter(
     prefix="/tokens",
@@ -28,6 +34,7 @@ async def get_tokens(
     crud: Crud = Depends(get_crud),
     adapter: Adapter = Depends(get_adapter),
     filters: dict = Depends(pagination_filters),
+    list_streaming: bool = Depends(get_list_streaming),
 ):
     """
     Get Tokens.
@@ -48,6 +55,18 @@ async def get_tokens(
     logger.info("Received request to get tokens")
     auth_token = get_auth_token(request, VersionNumber.v_2_1_1)
 
+    if list_streaming:
+        return await stream_list(
+            response,
+            filters,
+            ModuleID.tokens,
+            RoleEnum.emsp,
+            VersionNumber.v_2_1_1,
+            crud,
+            lambda data: adapter.token_adapter(data, VersionNumber.v_2_1_1),
+            auth_token=auth_token,
+        )
+
     data_list = await get_list(
         response,
         filters,
@@ -1,5 +1,3 @@
-import copy
-
 from fastapi import APIRouter, Request, Depends
 
 from py_ocpi.core import status
@@ -11,7 +9,7 @@ from py_ocpi.core.adapter import Adapter
 from py_ocpi.core.authentication.verifier import AuthorizationVerifier
 from py_ocpi.core.crud import Crud
 from py_ocpi.core.config import logger
-from py_ocpi.core.utils import get_auth_token, partially_update_attributes
+from py_ocpi.core.utils import get_auth_token, apply_partial_update
 from py_ocpi.core.dependencies import get_crud, get_adapter
 from py_ocpi.modules.versions.enums import VersionNumber
 from py_ocpi.modules.tokens.v_2_2_1.enums import TokenType
@@ -210,17 +208,12 @@ async def partial_update_token(
         logger.debug("Token with id `%s` was not found." % token_uid)
 
         raise NotFoundOCPIError
-    old_token = adapter.token_adapter(old_data)
-
-    new_token = copy.deepcopy(old_token)
-    partially_update_attributes(
-        new_token, token.dict(exclude_defaults=True, exclude_unset=True)
-    )
+    new_token = apply_partial_update(old_data, token, adapter.token_adapter)
 
     data = await crud.update(
         ModuleID.tokens,
         RoleEnum.cpo,
-        new_token.dict(),
+        new_token,
         token_uid,
         token_type=token_type,
         auth_token=auth_token,
@@ -9,14 +9,15 @@ from fastapi import (
 from py_ocpi.core.authentication.verifier import (
     VersionsAuthorizationVerifier,
 )
-from py_ocpi.core import status
 from py_ocpi.core.config import logger
 from py_ocpi.core.crud import Crud
 from py_ocpi.core.dependencies import (
     get_versions as get_versions_,
     get_crud,
+    get_discovery_responses,
 )
 from py_ocpi.core.schemas import OCPIResponse
+from py_ocpi.modules.versions.responses import DiscoveryResponses
 
 
 router = APIRouter()
@@ -28,6 +29,7 @@ async def get_versions(
     request: Request,
     versions=Depends(get_versions_),
     crud: Crud = Depends(get_crud),
+    responses: DiscoveryResponses = Depends(get_discovery_responses),
     server_cred: str | dict | None = Depends(cred_dependency),
 ):
     """
@@ -45,7 +47,4 @@ async def get_versions(
             fastapistatus.HTTP_401_UNAUTHORIZED,
             "Unauthorized",
         )
-    return OCPIResponse(
-        data=versions,
-        **status.OCPI_1000_GENERIC_SUCESS_CODE,
-    )
+    return responses.versions.response(versions)
@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Response
+
+from py_ocpi.core import status
+from py_ocpi.core.conditional import make_etag
+from py_ocpi.core.config import logger
+from py_ocpi.core.responses import dumps
+from py_ocpi.modules.versions.enums import VersionNumber
+from py_ocpi.modules.versions.v_2_1_1.schemas import (
+    VersionDetail as VersionDetail_2_1_1,
+)
+from py_ocpi.modules.versions.v_2_2_1.schemas import (
+    VersionDetail as VersionDetail_2_2_1,
+)
+
+
+class PrerenderedResponse:
+    """
+    Successful OCPIResponse with data rendered into JSON bytes once.
+
+    Per request only the timestamp is added to the rendered envelope,
+    ETag of the data is sent for conditional requests.
+    The data is rendered again only when the endpoint gets another data
+    object, e.g. when `get_endpoints` dependency is overridden. Data
+    changed in place is rendered again by `DiscoveryResponses.render`.
+
+    :param build: Turns endpoint data into the response data, it's
+      called (and validated) only when the data is rendered.
+    """
+
+    def __init__(self, build: Callable[[Any], Any] = lambda data: data):
+        self.build = build
+        self.data: Optional[list] = None
+        self.head: Optional[bytes] = None
+        self.etag: Optional[str] = None
+
+    def render(self, data: list, force: bool = False) -> None:
+        if data is self.data and not force:
+            return
+        logger.debug("Render discovery response.")
+        response_data = self.build(data)
+        body = dumps(
+            {"data": response_data, **status.OCPI_1000_GENERIC_SUCESS_CODE}
+        )
+        self.data = data
+        self.head = body[:-1] + b',"timestamp":"'
+        self.etag = make_etag(response_data)
+
+    def response(self, data: list) -> Response:
+        self.render(data)
+        timestamp = (
+            datetime.now(tz=timezone.utc)
+            .isoformat(timespec="seconds")
+            .replace("+00:00", "Z")
+        )
+        return Response(
+            content=self.head + timestamp.encode() + b'"}',  # type: ignore
+            media_type="application/json",
+            headers={"ETag": self.etag},  # type: ignore
+        )
+
+
+class DiscoveryResponses:
+    """Versions and version details responses of one application."""
+
+    def __init__(self) -> None:
+        self.versions = PrerenderedResponse()
+        self.version_details: Dict[str, PrerenderedResponse] = {
+            VersionNumber.v_2_1_1: PrerenderedResponse(
+                lambda endpoints: VersionDetail_2_1_1(
+                    version=VersionNumber.v_2_1_1, endpoints=endpoints
+                ).dict()
+            ),
+            VersionNumber.v_2_2_1: PrerenderedResponse(
+                lambda endpoints: VersionDetail_2_2_1(
+                    version=VersionNumber.v_2_2_1, endpoints=endpoints
+                ).dict()
+            ),
+        }
+
+    def render(
+        self, versions: list, version_endpoints: Dict[str, list]
+    ) -> None:
+        """
+        Render the responses, called when the application is initialized.
+        Call it again after changing the versions or endpoints in place.
+
+        :param versions: Data of the versions endpoint.
+        :param version_endpoints: Endpoints of each supported version.
+        """
+        self.versions.render(versions, force=True)
+        for version, endpoints in version_endpoints.items():
+            details_response = self.version_details.get(version)
+            if details_response is not None:
+                details_response.render(endpoints, force=True)
@@ -10,16 +10,17 @@ from py_ocpi.core.authentication.verifier import (
     VersionsAuthorizationVerifier,
 )
 from py_ocpi.core.crud import Crud
-from py_ocpi.core import status
 from py_ocpi.core.config import logger
 from py_ocpi.core.schemas import OCPIResponse
-from py_ocpi.core.dependencies import get_endpoints, get_crud
-
-from py_ocpi.modules.versions.v_2_1_1.schemas import (
-    VersionDetail,
-    VersionNumber,
+from py_ocpi.core.dependencies import (
+    get_endpoints,
+    get_crud,
+    get_discovery_responses,
 )
 
+from py_ocpi.modules.versions.v_2_1_1.schemas import VersionNumber
+from py_ocpi.modules.versions.responses import DiscoveryResponses
+
 router = APIRouter()
 cred_dependency = VersionsAuthorizationVerifier(VersionNumber.v_2_1_1)
 
@@ -29,6 +30,7 @@ async def get_version_details(
     request: Request,
     endpoints=Depends(get_endpoints),
     crud: Crud = Depends(get_crud),
+    responses: DiscoveryResponses = Depends(get_discovery_responses),
     server_cred: str | dict | None = Depends(cred_dependency),
 ):
     """
@@ -44,10 +46,6 @@ async def get_version_details(
         logger.debug("Unauthorized request.")
         raise HTTPException(fastapistatus.HTTP_401_UNAUTHORIZED, "Unauthorized")
 
-    return OCPIResponse(
-        data=VersionDetail(
-            version=VersionNumber.v_2_1_1,
-            endpoints=endpoints[VersionNumber.v_2_1_1],
-        ).dict(),
-        **status.OCPI_1000_GENERIC_SUCESS_CODE,
+    return responses.version_details[VersionNumber.v_2_1_1].response(
+        endpoints[VersionNumber.v_2_1_1]
     )
@@ -0,0 +1,4 @@
+from .engine import CompiledTariff, SessionCosts
+from .estimator import RunningCost, RunningCosts
+from .periods import ChargingPeriods
+from .reconciliation import CdrReconciler, Discrepancy, ReconciliationReport
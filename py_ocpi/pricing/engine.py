@@ -0,0 +1,436 @@
+from typing import Any, Dict, Optional, Tuple
+
+from py_ocpi.pricing.periods import (
+    ChargingPeriods,
+    get_field,
+    np,
+    parse_date,
+    parse_time,
+    require_numpy,
+)
+
+# columns of the price tables
+ENERGY, TIME, PARKING_TIME, FLAT = range(4)
+DIMENSION_COLUMNS = {
+    "ENERGY": ENERGY,
+    "TIME": TIME,
+    "PARKING_TIME": PARKING_TIME,
+    "FLAT": FLAT,
+}
+# step_size of energy is defined in Wh, of time in seconds
+STEP_UNITS = {ENERGY: 1000.0, TIME: 3600.0, PARKING_TIME: 3600.0}
+WEEKDAYS = {
+    "MONDAY": 0,
+    "TUESDAY": 1,
+    "WEDNESDAY": 2,
+    "THURSDAY": 3,
+    "FRIDAY": 4,
+    "SATURDAY": 5,
+    "SUNDAY": 6,
+}
+ALL_WEEKDAYS = 0b1111111
+MINUTES_IN_DAY = 1440
+PRICE_DECIMALS = 4
+
+Bounds = Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]
+
+
+def value_of(data: Any) -> Any:
+    return getattr(data, "value", data)
+
+
+class CompiledTariff:
+    """
+    Tariff elements compiled into arrays of restrictions and prices.
+
+    A tariff is compiled once and rates charging periods of any amount
+    of sessions at once. For each period and dimension the price of the
+    first tariff element, which restrictions match the period start and
+    which has a price component of the dimension, is used, as OCPI
+    defines. Restrictions of time and date are checked in the local
+    time of the periods. Elements restricted to reservations are not
+    used for charging periods.
+
+    :param tariff: Tariff of OCPI 2.2.1 or 2.1.1, model or dict.
+    """
+
+    def __init__(self, tariff: Any) -> None:
+        require_numpy()
+        elements = get_field(tariff, "elements") or []
+        size = len(elements)
+        self.id = get_field(tariff, "id")
+        self.currency = get_field(tariff, "currency")
+
+        self.start_minute = np.zeros(size)
+        self.end_minute = np.full(size, MINUTES_IN_DAY)
+        self.weekdays = np.full(size, ALL_WEEKDAYS, dtype=np.int64)
+        self.reservation = np.zeros(size, dtype=bool)
+        self.day_bounds = self.empty_bounds(size)
+        self.energy_bounds = self.empty_bounds(size)
+        self.power_bounds = self.empty_bounds(size)
+        self.current_bounds = self.empty_bounds(size)
+        self.duration_bounds = self.empty_bounds(size)
+
+        self.has_price = np.zeros((size, 4), dtype=bool)
+        self.price = np.zeros((size, 4))
+        self.vat = np.zeros((size, 4))
+        self.step_size = np.zeros((size, 4))
+
+        for index, element in enumerate(elements):
+            for component in get_field(element, "price_components") or []:
+                column = DIMENSION_COLUMNS[
+                    value_of(get_field(component, "type"))
+                ]
+                # first component of a dimension in the element is used
+                if self.has_price[index, column]:
+                    continue
+                self.has_price[index, column] = True
+                self.price[index, column] = float(get_field(component, "price"))
+                self.vat[index, column] = float(
+                    get_field(component, "vat") or 0
+                )
+                self.step_size[index, column] = get_field(
+                    component, "step_size"
+                )
+            restrictions = get_field(element, "restrictions")
+            if restrictions is not None:
+                self.compile_restrictions(index, restrictions)
+
+        self.min_price = self.compile_price(get_field(tariff, "min_price"))
+        self.max_price = self.compile_price(get_field(tariff, "max_price"))
+        # the same restrictions as Python values, to match single periods
+        self.rows = list(
+            zip(
+                self.has_price.tolist(),
+                self.reservation.tolist(),
+                self.start_minute.tolist(),
+                self.end_minute.tolist(),
+                self.weekdays.tolist(),
+                zip(
+                    *(
+                        zip(*(bound.tolist() for bound in bounds))
+                        for bounds in (
+                            self.day_bounds,
+                            self.energy_bounds,
+                            self.power_bounds,
+                            self.current_bounds,
+                            self.duration_bounds,
+                        )
+                    )
+                ),
+            )
+        )
+
+    @staticmethod
+    def empty_bounds(size: int) -> Bounds:
+        """Return (has min, min, has max, max) arrays of unset bounds."""
+        return (
+            np.zeros(size, dtype=bool),
+            np.zeros(size),
+            np.zeros(size, dtype=bool),
+            np.zeros(size),
+        )
+
+    @staticmethod
+    def set_bounds(
+        bounds: Bounds, index: int, minimum: Any, maximum: Any
+    ) -> None:
+        if minimum is not None:
+            bounds[0][index] = True
+            bounds[1][index] = minimum
+        if maximum is not None:
+            bounds[2][index] = True
+            bounds[3][index] = maximum
+
+    @staticmethod
+    def compile_price(price: Any) -> Optional[Tuple[float, float]]:
+        if not price:
+            return None
+        excl_vat = float(get_field(price, "excl_vat"))
+        incl_vat = get_field(price, "incl_vat")
+        return excl_vat, excl_vat if incl_vat is None else float(incl_vat)
+
+    def compile_restrictions(self, index: int, restrictions: Any) -> None:
+        start_time = get_field(restrictions, "start_time")
+        end_time = get_field(restrictions, "end_time")
+        if start_time:
+            self.start_minute[index] = parse_time(start_time)
+        if end_time:
+            self.end_minute[index] = parse_time(end_time)
+        if start_time and end_time and start_time == end_time:
+            self.start_minute[index], self.end_minute[index] = 0, MINUTES_IN_DAY
+
+        day_of_week = get_field(restrictions, "day_of_week") or []
+        if day_of_week:
+            self.weekdays[index] = sum(
+                1 << WEEKDAYS[value_of(day)] for day in set(day_of_week)
+            )
+        self.reservation[index] = bool(get_field(restrictions, "reservation"))
+
+        start_date = get_field(restrictions, "start_date")
+        end_date = get_field(restrictions, "end_date")
+        self.set_bounds(
+            self.day_bounds,
+            index,
+            parse_date(start_date) if start_date else None,
+            parse_date(end_date) if end_date else None,
+        )
+        for bounds, name in (
+            (self.energy_bounds, "kwh"),
+            (self.power_bounds, "power"),
+            (self.current_bounds, "current"),
+            (self.duration_bounds, "duration"),
+        ):
+            self.set_bounds(
+                bounds,
+                index,
+                get_field(restrictions, f"min_{name}"),
+                get_field(restrictions, f"max_{name}"),
+            )
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @staticmethod
+    def within(values: "np.ndarray", bounds: Bounds) -> "np.ndarray":
+        """Return (periods, elements) matrix of min <= value < max."""
+        has_min, minimum, has_max, maximum = bounds
+        values = values[:, None]
+        return (~has_min | (values >= minimum)) & (
+            ~has_max | (values < maximum)
+        )
+
+    def match(self, periods: ChargingPeriods) -> "np.ndarray":
+        """Return (periods, elements) matrix of matching restrictions."""
+        minute = periods.minute_of_day[:, None]
+        start, end = self.start_minute, self.end_minute
+        # time ranges with end before start span over midnight
+        matches = np.where(
+            start <= end,
+            (minute >= start) & (minute < end),
+            (minute >= start) | (minute < end),
+        )
+        matches &= ((self.weekdays >> periods.weekday[:, None]) & 1).astype(
+            bool
+        )
+        matches &= ~self.reservation
+        matches &= self.within(periods.day, self.day_bounds)
+        matches &= self.within(periods.energy_before, self.energy_bounds)
+        matches &= self.within(periods.power, self.power_bounds)
+        matches &= self.within(periods.current, self.current_bounds)
+        matches &= self.within(periods.duration_before, self.duration_bounds)
+        return matches
+
+    def period_element(self, column: int, period: Tuple[float, ...]) -> int:
+        """
+        Return index of the element used for a dimension of one period,
+        -1 if there's none. The same as `element_of` of `match` without
+        array operations, which is faster for a few periods.
+
+        :param column: Dimension of the price tables.
+        :param period: Minute of day, weekday, day, energy before, power,
+          current and duration before of the period.
+        """
+        minute, weekday, *values = period
+        for index, row in enumerate(self.rows):
+            has_price, reservation, start, end, weekdays, bounds = row
+            if not has_price[column] or reservation:
+                continue
+            if start <= end:
+                if not start <= minute < end:
+                    continue
+            elif not (minute >= start or minute < end):
+                continue
+            if not (weekdays >> int(weekday)) & 1:
+                continue
+            if all(
+                (not has_min or value >= minimum)
+                and (not has_max or value < maximum)
+                for value, (has_min, minimum, has_max, maximum) in zip(
+                    values, bounds
+                )
+            ):
+                return index
+        return -1
+
+    def rate(self, periods: ChargingPeriods) -> "SessionCosts":
+        """Return costs of each session of the charging periods."""
+        costs = SessionCosts(periods.sessions)
+        costs.total_energy = self.sum(periods, periods.energy)
+        costs.total_parking_time = self.sum(periods, periods.parking_time)
+        costs.total_time = (
+            self.sum(periods, periods.time) + costs.total_parking_time
+        )
+        if not len(periods) or not len(self):
+            costs.apply_price_limits(self.min_price, self.max_price)
+            return costs
+
+        matches = self.match(periods)
+        for column, volume in (
+            (ENERGY, periods.energy),
+            (TIME, periods.time),
+            (PARKING_TIME, periods.parking_time),
+        ):
+            costs.set(
+                column, *self.rate_dimension(periods, matches, column, volume)
+            )
+        costs.set(FLAT, *self.rate_flat(periods, matches))
+        costs.apply_price_limits(self.min_price, self.max_price)
+        return costs
+
+    @staticmethod
+    def sum(periods: ChargingPeriods, values: "np.ndarray") -> "np.ndarray":
+        return np.bincount(
+            periods.session, weights=values, minlength=periods.sessions
+        )
+
+    def element_of(
+        self, matches: "np.ndarray", column: int
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Return index of the used element of each row and if it's found."""
+        usable = matches & self.has_price[:, column]
+        element = usable.argmax(axis=1)
+        found = usable[np.arange(len(usable)), element]
+        return element, found
+
+    def rate_dimension(
+        self,
+        periods: ChargingPeriods,
+        matches: "np.ndarray",
+        column: int,
+        volume: "np.ndarray",
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        element, found = self.element_of(matches, column)
+        price = np.where(found, self.price[element, column], 0.0)
+        vat = np.where(found, self.vat[element, column], 0.0)
+        excl_vat = self.sum(periods, volume * price)
+        incl_vat = self.sum(periods, volume * price * (1 + vat / 100))
+
+        # total volume is billed in steps of the last used element
+        billed = found & (volume > 0)
+        last = np.full(periods.sessions, -1)
+        np.maximum.at(last, periods.session[billed], np.flatnonzero(billed))
+        session = np.flatnonzero(last >= 0)
+        total = self.sum(periods, np.where(found, volume, 0.0))[session]
+        extra_excl_vat, extra_incl_vat = self.round_steps(
+            element[last[session]], column, total
+        )
+        excl_vat[session] += extra_excl_vat
+        incl_vat[session] += extra_incl_vat
+        return excl_vat, incl_vat
+
+    def round_steps(
+        self, element: "np.ndarray", column: int, total: "np.ndarray"
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Return price of rounding the total volumes up to whole steps.
+
+        :param element: Last element used for the dimension of each total.
+        :param column: Dimension of the totals.
+        :param total: Total billed volumes.
+        """
+        step = self.step_size[element, column] / STEP_UNITS[column]
+        steps = np.ceil(
+            np.round(
+                np.divide(
+                    total, step, where=step > 0, out=np.zeros_like(total)
+                ),
+                9,
+            )
+        )
+        extra = np.where(step > 0, steps * step - total, 0.0)
+        excl_vat = extra * self.price[element, column]
+        return excl_vat, excl_vat * (1 + self.vat[element, column] / 100)
+
+    def rate_flat(
+        self, periods: ChargingPeriods, matches: "np.ndarray"
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Flat fee of the element matching the first period of sessions."""
+        element, found = self.element_of(matches[periods.first_periods()], FLAT)
+        found &= periods.has_periods()
+        excl_vat = np.where(found, self.price[element, FLAT], 0.0)
+        incl_vat = excl_vat * (
+            1 + np.where(found, self.vat[element, FLAT], 0.0) / 100
+        )
+        return excl_vat, incl_vat
+
+
+class SessionCosts:
+    """
+    Costs and totals of rated sessions, one array item per session.
+
+    Costs are `(excl_vat, incl_vat)` pairs of arrays. `total_time` is
+    charging and parking time in hours, as OCPI defines for CDRs.
+    """
+
+    def __init__(self, sessions: int) -> None:
+        require_numpy()
+        self.sessions = sessions
+        zeros = np.zeros(sessions)
+        self.costs: Dict[int, Tuple["np.ndarray", "np.ndarray"]] = {
+            column: (zeros, zeros) for column in DIMENSION_COLUMNS.values()
+        }
+        self.total_cost = (zeros, zeros)
+        self.total_energy = zeros
+        self.total_time = zeros
+        self.total_parking_time = zeros
+
+    def __len__(self) -> int:
+        return self.sessions
+
+    def set(
+        self, column: int, excl_vat: "np.ndarray", incl_vat: "np.ndarray"
+    ) -> None:
+        self.costs[column] = (excl_vat, incl_vat)
+
+    def apply_price_limits(
+        self,
+        min_price: Optional[Tuple[float, float]],
+        max_price: Optional[Tuple[float, float]],
+    ) -> None:
+        zeros = np.zeros(self.sessions)
+        excl_vat = sum((costs[0] for costs in self.costs.values()), zeros)
+        incl_vat = sum((costs[1] for costs in self.costs.values()), zeros)
+        if min_price is not None:
+            excl_vat = np.maximum(excl_vat, min_price[0])
+            incl_vat = np.maximum(incl_vat, min_price[1])
+        if max_price is not None:
+            excl_vat = np.minimum(excl_vat, max_price[0])
+            incl_vat = np.minimum(incl_vat, max_price[1])
+        self.total_cost = (excl_vat, incl_vat)
+
+    @property
+    def total_fixed_cost(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        return self.costs[FLAT]
+
+    @property
+    def total_energy_cost(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        return self.costs[ENERGY]
+
+    @property
+    def total_time_cost(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        return self.costs[TIME]
+
+    @property
+    def total_parking_cost(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        return self.costs[PARKING_TIME]
+
+    def totals(self, index: int) -> dict:
+        """Return totals of the session as CDR fields."""
+
+        def price(costs: Tuple["np.ndarray", "np.ndarray"]) -> dict:
+            return {
+                "excl_vat": round(float(costs[0][index]), PRICE_DECIMALS),
+                "incl_vat": round(float(costs[1][index]), PRICE_DECIMALS),
+            }
+
+        return {
+            "total_cost": price(self.total_cost),
+            "total_fixed_cost": price(self.total_fixed_cost),
+            "total_energy": float(self.total_energy[index]),
+            "total_energy_cost": price(self.total_energy_cost),
+            "total_time": float(self.total_time[index]),
+            "total_time_cost": price(self.total_time_cost),
+            "total_parking_time": float(self.total_parking_time[index]),
+            "total_parking_cost": price(self.total_parking_cost),
+        }
@@ -0,0 +1,207 @@
+import math
+from datetime import timezone, tzinfo
+from typing import Any, Dict, Iterable, Sequence, Tuple
+
+from py_ocpi.pricing.engine import (
+    ENERGY,
+    FLAT,
+    PARKING_TIME,
+    STEP_UNITS,
+    TIME,
+    CompiledTariff,
+    SessionCosts,
+)
+from py_ocpi.pricing.periods import (
+    get_field,
+    local_time,
+    np,
+    parse_timestamp,
+    period_volumes,
+    require_numpy,
+)
+
+DIMENSIONS = (ENERGY, TIME, PARKING_TIME)
+FINISHED_STATUSES = ("COMPLETED", "INVALID")
+
+
+class RunningCost:
+    """
+    Running cost of an active session.
+
+    Keeps what pricing of the already received charging periods has
+    accumulated: billed volumes and costs of each dimension, the last
+    element used for it, the flat fee and the charged energy. Only
+    charging periods appended since the previous update are rated, one
+    by one without array operations, so an update costs the same however
+    long the session is. Received periods are not rated again, `update`
+    with fewer periods than received before starts over.
+
+    :param tariff: Compiled tariff of the session.
+    :param start_date_time: Start of the session.
+    :param tz: Time zone of the charging location.
+    """
+
+    def __init__(
+        self,
+        tariff: CompiledTariff,
+        start_date_time: Any,
+        tz: tzinfo = timezone.utc,
+    ) -> None:
+        require_numpy()
+        self.tariff = tariff
+        self.session_start = parse_timestamp(start_date_time)
+        self.tz = tz
+        self.reset()
+
+    def reset(self) -> None:
+        self.periods = 0
+        self.energy = 0.0
+        self.time = 0.0
+        self.parking_time = 0.0
+        # per price table column
+        self.volume = [0.0] * 4
+        self.excl_vat = [0.0] * 4
+        self.incl_vat = [0.0] * 4
+        self.last_element = [-1] * 4
+
+    def update(self, charging_periods: Sequence[Any]) -> SessionCosts:
+        """Rate periods after the received ones and return the costs."""
+        received = self.periods
+        if len(charging_periods) < received:
+            self.reset()
+            received = 0
+        return self.append(charging_periods[received:])
+
+    def append(self, charging_periods: Iterable[Any]) -> SessionCosts:
+        """Rate new charging periods and return the costs."""
+        for period in charging_periods:
+            self.rate(period)
+        return self.costs()
+
+    def rate(self, period: Any) -> None:
+        tariff = self.tariff
+        start, energy, time, parking_time, power, current = period_volumes(
+            period
+        )
+        day, minute, weekday = local_time(start, self.tz)
+        restricted = (
+            minute,
+            weekday,
+            day,
+            self.energy,
+            power,
+            current,
+            start - self.session_start,
+        )
+        if not self.periods:
+            self.add(FLAT, tariff.period_element(FLAT, restricted), 1.0)
+        for column, volume in (
+            (ENERGY, energy),
+            (TIME, time),
+            (PARKING_TIME, parking_time),
+        ):
+            self.add(column, tariff.period_element(column, restricted), volume)
+
+        self.periods += 1
+        self.energy += energy
+        self.time += time
+        self.parking_time += parking_time
+
+    def add(self, column: int, element: int, volume: float) -> None:
+        if element < 0:
+            return
+        price = self.tariff.price[element, column]
+        self.excl_vat[column] += volume * price
+        self.incl_vat[column] += (
+            volume * price * (1 + self.tariff.vat[element, column] / 100)
+        )
+        if column != FLAT:
+            self.volume[column] += volume
+            if volume > 0:
+                self.last_element[column] = element
+
+    def round_steps(self, column: int) -> Tuple[float, float]:
+        """Return price of rounding the volume up to whole steps."""
+        element = self.last_element[column]
+        if element < 0 or not self.tariff.step_size[element, column]:
+            return 0.0, 0.0
+        step = self.tariff.step_size[element, column] / STEP_UNITS[column]
+        total = self.volume[column]
+        extra = math.ceil(round(total / step, 9)) * step - total
+        excl_vat = extra * self.tariff.price[element, column]
+        return excl_vat, excl_vat * (1 + self.tariff.vat[element, column] / 100)
+
+    def costs(self) -> SessionCosts:
+        """Return costs of the received periods, as a single session."""
+        costs = SessionCosts(1)
+        for column in DIMENSIONS + (FLAT,):
+            excl_vat = np.array([self.excl_vat[column]])
+            incl_vat = np.array([self.incl_vat[column]])
+            if column != FLAT:
+                extra_excl_vat, extra_incl_vat = self.round_steps(column)
+                excl_vat += extra_excl_vat
+                incl_vat += extra_incl_vat
+            costs.set(column, excl_vat, incl_vat)
+        costs.total_energy = np.array([self.energy])
+        costs.total_parking_time = np.array([self.parking_time])
+        costs.total_time = np.array([self.time + self.parking_time])
+        costs.apply_price_limits(self.tariff.min_price, self.tariff.max_price)
+        return costs
+
+
+class RunningCosts:
+    """
+    Running costs of active sessions, e.g. to show drivers live costs.
+
+    Sessions are identified by country code, party id and id. Costs of a
+    session are forgotten when it's finished, or started again when the
+    session gets another tariff or start.
+    """
+
+    def __init__(self) -> None:
+        self.sessions: Dict[Tuple[str, str, str], RunningCost] = {}
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    @staticmethod
+    def key_of(session: Any) -> Tuple[str, str, str]:
+        return (
+            str(get_field(session, "country_code")).upper(),
+            str(get_field(session, "party_id")).upper(),
+            str(get_field(session, "id")),
+        )
+
+    def update(
+        self,
+        session: Any,
+        tariff: CompiledTariff,
+        tz: tzinfo = timezone.utc,
+    ) -> SessionCosts:
+        """
+        Return costs of the session with its new charging periods.
+
+        :param session: Session, model or dict, with all charging periods.
+        :param tariff: Compiled tariff of the session.
+        :param tz: Time zone of the charging location.
+        """
+        key = self.key_of(session)
+        start_date_time = get_field(session, "start_date_time")
+        running = self.sessions.get(key)
+        if (
+            running is None
+            or running.tariff is not tariff
+            or running.session_start != parse_timestamp(start_date_time)
+        ):
+            running = self.sessions[key] = RunningCost(
+                tariff, start_date_time, tz
+            )
+        costs = running.update(get_field(session, "charging_periods") or [])
+
+        status = get_field(session, "status")
+        if getattr(status, "value", status) in FINISHED_STATUSES:
+            self.discard(session)
+        return costs
+
+    def discard(self, session: Any) -> None:
+        self.sessions.pop(self.key_of(session), None)
@@ -0,0 +1,242 @@
+from datetime import date, datetime, timezone, tzinfo
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
+
+SECONDS_IN_DAY = 86400
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# 1970-01-01 was Thursday, weekdays are counted from Monday
+EPOCH_WEEKDAY = 3
+
+ENERGY_DIMENSIONS = ("ENERGY", "ENERGY_IMPORT")
+POWER_DIMENSIONS = ("MAX_POWER", "MIN_POWER")
+CURRENT_DIMENSIONS = ("MAX_CURRENT", "MIN_CURRENT")
+
+
+def require_numpy() -> None:
+    if np is None:  # pragma: no cover
+        raise ImportError(
+            "NumPy is required for pricing, "
+            "install it with `pip install extrawest_ocpi[pricing]`."
+        )
+
+
+def get_field(data: Any, name: str, default: Any = None) -> Any:
+    """Return field of crud data, which can be a dict or a model."""
+    if isinstance(data, dict):
+        return data.get(name, default)
+    return getattr(data, name, default)
+
+
+def parse_timestamp(value: Any) -> float:
+    """Return POSIX timestamp of OCPI DateTime, naive values are UTC."""
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def parse_date(value: str) -> int:
+    """Return days since epoch of `YYYY-MM-DD` date."""
+    return date.fromisoformat(value).toordinal() - EPOCH_ORDINAL
+
+
+def parse_time(value: str) -> int:
+    """Return minutes since midnight of `HH:MM` time."""
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def utc_offsets(start: "np.ndarray", tz: tzinfo) -> "np.ndarray":
+    """
+    Return UTC offsets, in seconds, of the timestamps in the time zone.
+
+    Offsets are looked up once per distinct hour, so zones with daylight
+    saving time cost as much as fixed ones.
+    """
+    if isinstance(tz, timezone):
+        offset = tz.utcoffset(None).total_seconds()
+        return np.full(len(start), offset)
+    hours, inverse = np.unique(start // 3600, return_inverse=True)
+    offsets = np.array(
+        [
+            datetime.fromtimestamp(hour * 3600, tz)
+            .utcoffset()
+            .total_seconds()  # type: ignore
+            for hour in hours.tolist()
+        ]
+    )
+    return offsets[inverse]
+
+
+class ChargingPeriods:
+    """
+    Charging periods of many sessions as columns of NumPy arrays.
+
+    Periods of a session are consecutive, `session` holds the index of
+    the session of each period. Volumes are taken from the dimensions:
+    `energy` in kWh, `time` and `parking_time` in hours, `power` in kW
+    and `current` in A (NaN when the period doesn't have them).
+
+    Columns used by tariff restrictions are derived from the start of
+    the periods in the local time of the charging location:
+    `minute_of_day`, `day` (days since epoch), `weekday` (0 is Monday),
+    `duration_before` (seconds since the session start) and
+    `energy_before` (kWh charged before the period).
+
+    :param sessions: Amount of sessions.
+    :param session: Session index of each period.
+    :param start: POSIX timestamps of the periods start.
+    :param session_start: POSIX timestamps of the sessions start.
+    :param tz: Time zone of the charging location.
+    """
+
+    def __init__(
+        self,
+        sessions: int,
+        session: "ArrayLike",
+        start: "ArrayLike",
+        session_start: "ArrayLike",
+        energy: "ArrayLike",
+        time: "ArrayLike",
+        parking_time: "ArrayLike",
+        power: Optional["ArrayLike"] = None,
+        current: Optional["ArrayLike"] = None,
+        tz: tzinfo = timezone.utc,
+    ) -> None:
+        require_numpy()
+        self.sessions = sessions
+        self.session = np.asarray(session, dtype=np.int64)
+        self.start = np.asarray(start, dtype=np.float64)
+        self.session_start = np.asarray(session_start, dtype=np.float64)
+        self.energy = np.asarray(energy, dtype=np.float64)
+        self.time = np.asarray(time, dtype=np.float64)
+        self.parking_time = np.asarray(parking_time, dtype=np.float64)
+        size = len(self.session)
+        self.power = (
+            np.full(size, np.nan)
+            if power is None
+            else np.asarray(power, dtype=np.float64)
+        )
+        self.current = (
+            np.full(size, np.nan)
+            if current is None
+            else np.asarray(current, dtype=np.float64)
+        )
+
+        local = self.start + utc_offsets(self.start, tz)
+        self.day = np.floor_divide(local, SECONDS_IN_DAY).astype(np.int64)
+        self.minute_of_day = (local - self.day * SECONDS_IN_DAY) // 60
+        self.weekday = (self.day + EPOCH_WEEKDAY) % 7
+        self.duration_before = self.start - self.session_start[self.session]
+        charged_before = np.cumsum(self.energy) - self.energy
+        self.energy_before = (
+            charged_before - charged_before[self.first_periods()][self.session]
+            if size
+            else charged_before
+        )
+
+    def __len__(self) -> int:
+        return len(self.session)
+
+    def first_periods(self) -> "np.ndarray":
+        """Return index of the first period of each session."""
+        first = np.searchsorted(self.session, np.arange(self.sessions))
+        # sessions without periods point to the next session period
+        return np.minimum(first, max(len(self) - 1, 0))
+
+    def has_periods(self) -> "np.ndarray":
+        return np.bincount(self.session, minlength=self.sessions) > 0
+
+    @classmethod
+    def from_sessions(
+        cls, sessions: Iterable[Any], tz: tzinfo = timezone.utc
+    ) -> "ChargingPeriods":
+        """
+        Collect charging periods of sessions or CDRs.
+
+        :param sessions: Sessions or CDRs, models or dicts, with
+          `start_date_time` and `charging_periods`.
+        :param tz: Time zone of the charging location.
+        """
+        require_numpy()
+        session, start, session_start = [], [], []
+        energy, time, parking_time, power, current = [], [], [], [], []
+        amount = 0
+        for index, item in enumerate(sessions):
+            amount += 1
+            session_start.append(
+                parse_timestamp(get_field(item, "start_date_time"))
+            )
+            for period in get_field(item, "charging_periods") or []:
+                volumes = period_volumes(period)
+                session.append(index)
+                start.append(volumes[0])
+                energy.append(volumes[1])
+                time.append(volumes[2])
+                parking_time.append(volumes[3])
+                power.append(volumes[4])
+                current.append(volumes[5])
+        return cls(
+            amount,
+            session,
+            start,
+            session_start,
+            energy,
+            time,
+            parking_time,
+            power,
+            current,
+            tz=tz,
+        )
+
+
+def period_volumes(period: Any) -> Tuple[float, ...]:
+    """
+    Return start timestamp, energy, time, parking time, power and current
+    of a charging period.
+    """
+    volumes = {}
+    if isinstance(period, dict):
+        # dicts from storage, without a call per field
+        for dimension in period.get("dimensions") or []:
+            type_ = dimension["type"]
+            volumes[getattr(type_, "value", type_)] = float(dimension["volume"])
+        start = period["start_date_time"]
+    else:
+        for dimension in period.dimensions or []:
+            volumes[dimension.type.value] = float(dimension.volume)
+        start = period.start_date_time
+    return (
+        parse_timestamp(start),
+        first_volume(volumes, ENERGY_DIMENSIONS, 0.0),
+        volumes.get("TIME", 0.0),
+        volumes.get("PARKING_TIME", 0.0),
+        first_volume(volumes, POWER_DIMENSIONS),
+        first_volume(volumes, CURRENT_DIMENSIONS),
+    )
+
+
+def local_time(timestamp: float, tz: tzinfo) -> Tuple[int, int, int]:
+    """Return day since epoch, minute of day and weekday of a timestamp."""
+    offset = datetime.fromtimestamp(timestamp, tz).utcoffset()
+    local = timestamp + offset.total_seconds()  # type: ignore
+    day = int(local // SECONDS_IN_DAY)
+    minute = int((local - day * SECONDS_IN_DAY) // 60)
+    return day, minute, (day + EPOCH_WEEKDAY) % 7
+
+
+def first_volume(
+    volumes: dict, types: Iterable[str], default: float = float("nan")
+) -> float:
+    for type_ in types:
+        if type_ in volumes:
+            return volumes[type_]
+    return default
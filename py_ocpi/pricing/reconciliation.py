@@ -0,0 +1,296 @@
+from dataclasses import asdict, dataclass, field
+from datetime import timezone, tzinfo
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from py_ocpi.pricing.engine import CompiledTariff, SessionCosts
+from py_ocpi.pricing.periods import (
+    ChargingPeriods,
+    get_field,
+    np,
+    parse_timestamp,
+    require_numpy,
+)
+
+# id of the compiled tariff and time zone of CDRs rated together
+GroupKey = Tuple[int, Optional[tzinfo]]
+
+VOLUME_FIELDS = ("total_energy", "total_time", "total_parking_time")
+PRICE_FIELDS = (
+    "total_cost",
+    "total_fixed_cost",
+    "total_energy_cost",
+    "total_time_cost",
+    "total_parking_cost",
+)
+PRICES = ("excl_vat", "incl_vat")
+
+
+@dataclass(frozen=True)
+class Discrepancy:
+    """
+    Total of a CDR which differs from the one computed from its charging
+    periods and tariff.
+
+    :param field: CDR field, prices with `.excl_vat` or `.incl_vat`.
+    """
+
+    cdr_id: str
+    field: str
+    reported: float
+    expected: float
+
+
+@dataclass
+class ReconciliationReport:
+    """
+    Result of CDRs reconciliation.
+
+    Every discrepancy is counted in `fields`, only the first
+    `max_discrepancies` are kept in `discrepancies`.
+
+    :param mismatched: Amount of CDRs with at least one discrepancy.
+    :param unpriced: Amount of CDRs without tariffs, only their volumes
+      are checked.
+    """
+
+    checked: int = 0
+    mismatched: int = 0
+    unpriced: int = 0
+    fields: Dict[str, int] = field(default_factory=dict)
+    discrepancies: List[Discrepancy] = field(default_factory=list)
+    max_discrepancies: int = 1000
+
+    def add(
+        self,
+        name: str,
+        cdrs: List[Any],
+        mismatches: "np.ndarray",
+        reported: "np.ndarray",
+        expected: "np.ndarray",
+    ) -> None:
+        indexes = np.flatnonzero(mismatches)
+        if not len(indexes):
+            return
+        self.fields[name] = self.fields.get(name, 0) + len(indexes)
+        free = self.max_discrepancies - len(self.discrepancies)
+        for index in indexes[:free].tolist():
+            self.discrepancies.append(
+                Discrepancy(
+                    cdr_id=str(get_field(cdrs[index], "id")),
+                    field=name,
+                    reported=float(reported[index]),
+                    expected=round(float(expected[index]), 4),
+                )
+            )
+
+    def dict(self) -> dict:
+        return asdict(self)
+
+
+class CdrReconciler:
+    """
+    Verifies totals of CDRs against their charging periods and tariffs.
+
+    CDRs are read from any iterable in chunks of `chunk_size`, so memory
+    used doesn't depend on the amount of CDRs. CDRs of a chunk are
+    grouped by tariff and time zone and each group is rated at once with
+    a compiled tariff. Compiled tariffs are reused for the next chunks.
+
+    A CDR is rated with the embedded tariff referenced by its first
+    charging period, or its first embedded tariff. Reported
+    `total_reservation_cost` is added to the expected `total_cost`.
+    `total_cost` of OCPI 2.1.1 is compared with the price excluding VAT.
+    Expected `total_time` of CDRs without TIME or PARKING_TIME volumes in
+    their charging periods, e.g. with energy only tariffs, is the time
+    from `start_date_time` to `end_date_time`.
+
+    :param get_time_zone: Return time zone of the charging location of a
+      CDR, UTC by default.
+    :param price_tolerance: Allowed difference of prices.
+    :param volume_tolerance: Allowed difference of kWh and hours.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 10000,
+        get_time_zone: Optional[Callable[[Any], tzinfo]] = None,
+        price_tolerance: float = 0.01,
+        volume_tolerance: float = 0.001,
+        max_discrepancies: int = 1000,
+        max_tariffs: int = 10000,
+    ) -> None:
+        require_numpy()
+        self.chunk_size = chunk_size
+        self.get_time_zone = get_time_zone
+        self.price_tolerance = price_tolerance
+        self.volume_tolerance = volume_tolerance
+        self.max_discrepancies = max_discrepancies
+        self.max_tariffs = max_tariffs
+        self.tariffs: Dict[Hashable, CompiledTariff] = {}
+        self.no_tariff = CompiledTariff({"elements": []})
+
+    def reconcile(self, cdrs: Iterable[Any]) -> ReconciliationReport:
+        """Return report of discrepancies of CDRs, models or dicts."""
+        report = ReconciliationReport(max_discrepancies=self.max_discrepancies)
+        iterator = iter(cdrs)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return report
+            self.reconcile_chunk(chunk, report)
+
+    def reconcile_chunk(
+        self, cdrs: List[Any], report: ReconciliationReport
+    ) -> None:
+        groups: Dict[GroupKey, List[Any]] = {}
+        tariffs: Dict[GroupKey, Optional[CompiledTariff]] = {}
+        for cdr in cdrs:
+            tariff = self.tariff_of(cdr)
+            tz = self.get_time_zone(cdr) if self.get_time_zone else None
+            key = (id(tariff), tz)
+            groups.setdefault(key, []).append(cdr)
+            tariffs[key] = tariff
+        for key, group in groups.items():
+            self.check(group, tariffs[key], key[1] or timezone.utc, report)
+
+    def tariff_of(self, cdr: Any) -> Optional[CompiledTariff]:
+        tariffs = get_field(cdr, "tariffs") or []
+        if not tariffs:
+            return None
+        tariff = tariffs[0]
+        periods = get_field(cdr, "charging_periods") or []
+        tariff_id = get_field(periods[0], "tariff_id") if periods else None
+        if tariff_id:
+            tariff = next(
+                (
+                    item
+                    for item in tariffs
+                    if get_field(item, "id") == tariff_id
+                ),
+                tariff,
+            )
+
+        key = tuple(
+            str(get_field(tariff, name))
+            for name in ("country_code", "party_id", "id", "last_updated")
+        )
+        compiled = self.tariffs.get(key)
+        if compiled is None:
+            if len(self.tariffs) >= self.max_tariffs:
+                self.tariffs.clear()
+            compiled = self.tariffs[key] = CompiledTariff(tariff)
+        return compiled
+
+    def check(
+        self,
+        cdrs: List[Any],
+        tariff: Optional[CompiledTariff],
+        tz: tzinfo,
+        report: ReconciliationReport,
+    ) -> None:
+        costs = (tariff or self.no_tariff).rate(
+            ChargingPeriods.from_sessions(cdrs, tz=tz)
+        )
+        mismatched = np.zeros(len(cdrs), dtype=bool)
+        for name, reported, expected, tolerance in self.compared(
+            cdrs, costs, tariff is not None
+        ):
+            # missing values are NaN and never differ
+            mismatches = np.abs(reported - expected) > tolerance
+            mismatched |= mismatches
+            report.add(name, cdrs, mismatches, reported, expected)
+
+        report.checked += len(cdrs)
+        report.mismatched += int(mismatched.sum())
+        if tariff is None:
+            report.unpriced += len(cdrs)
+
+    def compared(
+        self, cdrs: List[Any], costs: SessionCosts, priced: bool
+    ) -> Iterable[tuple]:
+        """Yield name, reported, expected and tolerance of the totals."""
+        reported = reported_values(cdrs, priced)
+        for name in VOLUME_FIELDS:
+            expected = getattr(costs, name)
+            if name == "total_time":
+                expected = np.where(expected > 0, expected, durations(cdrs))
+            yield (
+                name,
+                reported[name],
+                expected,
+                self.volume_tolerance,
+            )
+        if not priced:
+            return
+        for name in PRICE_FIELDS:
+            for index, price in enumerate(PRICES):
+                expected = getattr(costs, name)[index]
+                if name == "total_cost":
+                    expected = expected + np.nan_to_num(
+                        reported[f"total_reservation_cost.{price}"]
+                    )
+                yield (
+                    f"{name}.{price}",
+                    reported[f"{name}.{price}"],
+                    expected,
+                    self.price_tolerance,
+                )
+
+
+def reported_values(cdrs: List[Any], prices: bool) -> Dict[str, "np.ndarray"]:
+    """
+    Return columns of CDR totals, NaN when they're missing. Prices are
+    split into `<field>.excl_vat` and `<field>.incl_vat` columns.
+    """
+    nan = float("nan")
+    price_fields = PRICE_FIELDS + ("total_reservation_cost",) if prices else ()
+    rows = []
+    for cdr in cdrs:
+        row = []
+        for name in VOLUME_FIELDS:
+            value = get_field(cdr, name)
+            row.append(nan if value is None else value)
+        for name in price_fields:
+            value = get_field(cdr, name)
+            if value is None:
+                row += (nan, nan)
+            elif isinstance(value, (int, float)):
+                # OCPI 2.1.1 costs are numbers
+                row += (value, nan)
+            else:
+                excl_vat = get_field(value, "excl_vat")
+                incl_vat = get_field(value, "incl_vat")
+                row += (
+                    nan if excl_vat is None else excl_vat,
+                    nan if incl_vat is None else incl_vat,
+                )
+        rows.append(row)
+
+    names = list(VOLUME_FIELDS) + [
+        f"{name}.{price}" for name in price_fields for price in PRICES
+    ]
+    table = np.array(rows, dtype=np.float64).reshape(len(cdrs), len(names))
+    return {name: table[:, index] for index, name in enumerate(names)}
+
+
+def durations(cdrs: List[Any]) -> "np.ndarray":
+    """Return hours from start to end of CDRs, NaN without the end."""
+    hours = []
+    for cdr in cdrs:
+        end = get_field(cdr, "end_date_time")
+        if end is None:
+            hours.append(float("nan"))
+            continue
+        start = parse_timestamp(get_field(cdr, "start_date_time"))
+        hours.append((parse_timestamp(end) - start) / 3600)
+    return np.array(hours, dtype=np.float64)
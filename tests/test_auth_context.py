@@ -0,0 +1,43 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.utils import decode_string_base64
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_modules.utils import (
+    ClientAuthenticator,
+    ENCODED_AUTH_TOKEN,
+    AUTH_TOKEN_V_2_2_1,
+)
+
+
+@patch(
+    "py_ocpi.core.authentication.verifier.decode_string_base64",
+    side_effect=decode_string_base64,
+)
+@patch("py_ocpi.core.utils.decode_string_base64")
+def test_token_decoded_once_per_request(utils_decode, verifier_decode):
+    crud = AsyncMock()
+    crud.list.return_value = [], 0, True
+
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=crud,
+        adapter=MagicMock(),
+        authenticator=ClientAuthenticator,
+        modules=[enums.ModuleID.locations],
+    )
+
+    client = TestClient(app)
+    client.get(
+        "/ocpi/cpo/2.2.1/locations",
+        headers={"Authorization": f"Token {ENCODED_AUTH_TOKEN}"},
+    )
+
+    verifier_decode.assert_called_once()
+    utils_decode.assert_not_called()
+    assert crud.list.await_args.kwargs["auth_token"] == AUTH_TOKEN_V_2_2_1
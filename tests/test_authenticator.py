@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from py_ocpi.core.authentication.authenticator import Authenticator, TOKEN_C
+from py_ocpi.core.config import settings
+from py_ocpi.core.exceptions import AuthorizationOCPIError
+
+
+def get_authenticator_class():
+    class CountingAuthenticator(Authenticator):
+        calls = {"a": 0, "c": 0}
+
+        @classmethod
+        async def get_valid_token_c(cls):
+            cls.calls["c"] += 1
+            return ["token_c"]
+
+        @classmethod
+        async def get_valid_token_a(cls):
+            cls.calls["a"] += 1
+            return ["token_a"]
+
+    return CountingAuthenticator
+
+
+def test_authenticate_without_cache(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TOKEN_CACHE_TTL", 0)
+    authenticator = get_authenticator_class()
+
+    asyncio.run(authenticator.authenticate("token_c"))
+    asyncio.run(authenticator.authenticate("token_c"))
+
+    assert authenticator.calls["c"] == 2
+
+
+def test_authenticate_with_cache(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TOKEN_CACHE_TTL", 60)
+    authenticator = get_authenticator_class()
+
+    asyncio.run(authenticator.authenticate("token_c"))
+    asyncio.run(authenticator.authenticate("token_c"))
+    with pytest.raises(AuthorizationOCPIError):
+        asyncio.run(authenticator.authenticate("token_a"))
+
+    assert authenticator.calls["c"] == 1
+    stats = authenticator.token_cache_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["refreshes"] == 1
+
+
+def test_authenticate_credentials_with_cache(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TOKEN_CACHE_TTL", 60)
+    authenticator = get_authenticator_class()
+
+    assert asyncio.run(authenticator.authenticate_credentials("token_a")) == {}
+    assert (
+        asyncio.run(authenticator.authenticate_credentials("token_c"))
+        == "token_c"
+    )
+    assert asyncio.run(authenticator.authenticate_credentials("foo")) is None
+
+    assert authenticator.calls == {"a": 1, "c": 1}
+
+
+def test_invalidate_token_cache(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TOKEN_CACHE_TTL", 60)
+    authenticator = get_authenticator_class()
+
+    asyncio.run(authenticator.authenticate("token_c"))
+    authenticator.invalidate_token_cache(TOKEN_C)
+    asyncio.run(authenticator.authenticate("token_c"))
+
+    assert authenticator.calls["c"] == 2
+
+
+def test_token_cache_max_size(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TOKEN_CACHE_TTL", 60)
+    monkeypatch.setattr(settings, "AUTH_TOKEN_CACHE_MAX_SIZE", 0)
+    authenticator = get_authenticator_class()
+
+    asyncio.run(authenticator.authenticate("token_c"))
+    asyncio.run(authenticator.authenticate("token_c"))
+
+    assert authenticator.calls["c"] == 2
@@ -0,0 +1,149 @@
+import copy
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.config import settings
+from py_ocpi.core.crud import Crud
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_modules.utils import ClientAuthenticator, ENCODED_AUTH_TOKEN
+from tests.test_push import LOCATIONS
+
+IMPORT_URL = "/import/2.2.1/locations"
+AUTH_HEADERS = {"Authorization": f"Token {ENCODED_AUTH_TOKEN}"}
+
+
+class BulkCrud(Crud):
+    chunks: list = []
+
+    @classmethod
+    async def bulk_upsert(cls, module, role, data, *args, **kwargs):
+        cls.chunks.append(data)
+        return {
+            index: "duplicate"
+            for index, location in enumerate(data)
+            if location["name"] == "duplicate"
+        }
+
+
+def get_locations(amount: int) -> list:
+    locations = []
+    for i in range(amount):
+        location = copy.deepcopy(LOCATIONS[0])
+        location["id"] = str(i)
+        locations.append(location)
+    return locations
+
+
+def get_client(crud) -> TestClient:
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.emsp],
+        crud=crud,
+        authenticator=ClientAuthenticator,
+        modules=[],
+        bulk_import=True,
+    )
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_IMPORT_CHUNK_SIZE", 2)
+    monkeypatch.setattr(settings, "VALIDATION_PROCESSES", 0)
+    BulkCrud.chunks = []
+
+
+def test_import_ndjson_in_chunks():
+    locations = get_locations(5)
+    locations[1]["name"] = "duplicate"
+    del locations[3]["address"]
+    body = "\n".join(json.dumps(location) for location in locations)
+    body = body.replace("\n", "\nnot json\n", 1)
+
+    response = get_client(BulkCrud).post(
+        IMPORT_URL,
+        content=body,
+        headers={**AUTH_HEADERS, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["received"] == 6
+    assert result["imported"] == 3
+    assert [(e["index"], e["id"]) for e in result["errors"]] == [
+        (1, None),
+        (2, "1"),
+        (4, "3"),
+    ]
+    assert result["errors"][2]["error"] == "address: field required"
+    assert [len(chunk) for chunk in BulkCrud.chunks] == [1, 2, 1]
+    assert BulkCrud.chunks[0][0]["last_updated"] == "2022-01-02T00:00:00Z"
+
+
+class UpsertCrud(Crud):
+    calls: list = []
+
+    @classmethod
+    async def get(cls, module, role, id, *args, **kwargs):
+        if id == "2":
+            raise Exception("db error")
+        return {"id": id} if id == "1" else None
+
+    @classmethod
+    async def create(cls, module, role, data, *args, **kwargs):
+        cls.calls.append(("create", data["id"], kwargs["country_code"]))
+
+    @classmethod
+    async def update(cls, module, role, data, id, *args, **kwargs):
+        cls.calls.append(("update", id, kwargs["country_code"]))
+
+
+class DuckUpsertCrud:
+    """Crud which doesn't subclass Crud, as accepted by get_application."""
+
+    get = UpsertCrud.get
+    create = UpsertCrud.create
+    update = UpsertCrud.update
+
+
+@pytest.mark.parametrize("crud", [UpsertCrud, DuckUpsertCrud])
+def test_import_list_without_bulk_upsert(crud):
+    UpsertCrud.calls = []
+
+    response = get_client(crud).post(
+        IMPORT_URL, json=get_locations(3), headers=AUTH_HEADERS
+    )
+
+    result = response.json()
+    assert result["imported"] == 2
+    assert result["errors"] == [{"index": 2, "id": "2", "error": "db error"}]
+    assert sorted(UpsertCrud.calls) == [
+        ("create", "0", "us"),
+        ("update", "1", "us"),
+    ]
+
+
+def test_import_in_validation_processes(monkeypatch):
+    monkeypatch.setattr(settings, "VALIDATION_PROCESSES", 2)
+
+    with get_client(BulkCrud) as client:
+        response = client.post(
+            IMPORT_URL, json=get_locations(7), headers=AUTH_HEADERS
+        )
+
+    assert response.json()["imported"] == 7
+    assert sum(len(chunk) for chunk in BulkCrud.chunks) == 7
+    assert [location["id"] for location in BulkCrud.chunks[-1]] == ["6"]
+
+
+def test_import_invalid_body():
+    response = get_client(BulkCrud).post(
+        IMPORT_URL, json={"id": "1"}, headers=AUTH_HEADERS
+    )
+
+    assert response.status_code == 400
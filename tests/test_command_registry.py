@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+from py_ocpi.core.config import settings
+from py_ocpi.modules.commands.registry import CommandResultRegistry
+
+RESPONSE_URL = "https://example.com/commands/START_SESSION/1"
+RESULT = {"result": "ACCEPTED"}
+
+
+def test_resolve_wakes_waiting_command(monkeypatch):
+    monkeypatch.setattr(settings, "COMMAND_POLL_INTERVAL", 10.0)
+    registry = CommandResultRegistry()
+    polls = []
+
+    async def poll():
+        polls.append(1)
+        return None
+
+    async def run():
+        waiter = asyncio.create_task(registry.wait(RESPONSE_URL, poll, 30))
+        await asyncio.sleep(0.01)
+        assert registry.resolve(RESPONSE_URL, RESULT)
+        started = time.monotonic()
+        result = await waiter
+        return result, time.monotonic() - started
+
+    result, elapsed = asyncio.run(run())
+
+    assert result == RESULT
+    assert elapsed < 1
+    assert len(polls) == 1
+    assert not registry.is_waiting(RESPONSE_URL)
+
+
+def test_result_resolved_before_wait():
+    registry = CommandResultRegistry()
+
+    async def poll():
+        raise AssertionError("Crud shouldn't be polled.")
+
+    assert not registry.resolve(RESPONSE_URL, RESULT)
+
+    assert asyncio.run(registry.wait(RESPONSE_URL, poll, 30)) == RESULT
+
+
+def test_polling_fallback_with_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "COMMAND_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(settings, "COMMAND_POLL_MAX_INTERVAL", 0.02)
+    registry = CommandResultRegistry()
+    polls = []
+
+    async def poll():
+        polls.append(time.monotonic())
+        return RESULT if len(polls) == 4 else None
+
+    result = asyncio.run(registry.wait(RESPONSE_URL, poll, 5))
+
+    assert result == RESULT
+    assert len(polls) == 4
+
+
+def test_wait_timeout_without_polling(monkeypatch):
+    monkeypatch.setattr(settings, "COMMAND_POLL_INTERVAL", 0)
+    registry = CommandResultRegistry()
+
+    async def poll():
+        raise AssertionError("Crud shouldn't be polled.")
+
+    assert asyncio.run(registry.wait(RESPONSE_URL, poll, 0.05)) is None
+    assert not registry.is_waiting(RESPONSE_URL)
@@ -0,0 +1,176 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.crud import Crud
+from py_ocpi.modules.locations.v_2_2_1.schemas import Location
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_modules.utils import ClientAuthenticator, ENCODED_AUTH_TOKEN
+from tests.test_push import LOCATIONS
+
+LOCATIONS_URL = "/ocpi/cpo/2.2.1/locations"
+LOCATION_URL = f"{LOCATIONS_URL}/{LOCATIONS[0]['id']}"
+AUTH_HEADERS = {"Authorization": f"Token {ENCODED_AUTH_TOKEN}"}
+
+
+class VersionedCrud(Crud):
+    version = "1"
+    list = AsyncMock(return_value=(LOCATIONS, 1, True))
+
+    @classmethod
+    async def list_version(cls, module, role, filters, *args, **kwargs):
+        return cls.version
+
+
+def get_client(crud, fast_json_response: bool = False):
+    adapter = MagicMock()
+    adapter.location_adapter.return_value = Location(**LOCATIONS[0])
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=crud,
+        adapter=adapter,
+        authenticator=ClientAuthenticator,
+        modules=[enums.ModuleID.locations],
+        fast_json_response=fast_json_response,
+        conditional_get=True,
+    )
+    return TestClient(app), adapter
+
+
+def get_crud():
+    crud = AsyncMock()
+    crud.list.return_value = LOCATIONS, 1, True
+    crud.get.return_value = LOCATIONS[0]
+    crud.list_version.return_value = None
+    return crud
+
+
+@pytest.mark.parametrize("fast_json_response", [False, True])
+def test_list_not_modified_before_adapting(fast_json_response):
+    client, adapter = get_client(get_crud(), fast_json_response)
+
+    response = client.get(LOCATIONS_URL, headers=AUTH_HEADERS)
+    etag = response.headers["ETag"]
+    adapter.location_adapter.reset_mock()
+    not_modified = client.get(
+        LOCATIONS_URL, headers={**AUTH_HEADERS, "If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert "Last-Modified" not in response.headers
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    assert not_modified.content == b""
+    adapter.location_adapter.assert_not_called()
+
+
+def test_list_modified():
+    crud = get_crud()
+    client, _ = get_client(crud)
+
+    etag = client.get(LOCATIONS_URL, headers=AUTH_HEADERS).headers["ETag"]
+    crud.list.return_value = [], 0, True
+    response = client.get(
+        LOCATIONS_URL, headers={**AUTH_HEADERS, "If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_list_version_skips_crud_list():
+    VersionedCrud.list.reset_mock()
+    client, _ = get_client(VersionedCrud)
+
+    etag = client.get(LOCATIONS_URL, headers=AUTH_HEADERS).headers["ETag"]
+    not_modified = client.get(
+        LOCATIONS_URL, headers={**AUTH_HEADERS, "If-None-Match": f"W/{etag}"}
+    )
+    VersionedCrud.version = "2"
+    modified = client.get(
+        LOCATIONS_URL, headers={**AUTH_HEADERS, "If-None-Match": etag}
+    )
+
+    assert not_modified.status_code == 304
+    assert modified.status_code == 200
+    assert VersionedCrud.list.await_count == 2
+
+
+def test_object_not_modified_since():
+    client, adapter = get_client(get_crud())
+
+    response = client.get(LOCATION_URL, headers=AUTH_HEADERS)
+    adapter.location_adapter.reset_mock()
+    not_modified = client.get(
+        LOCATION_URL,
+        headers={
+            **AUTH_HEADERS,
+            "If-Modified-Since": response.headers["Last-Modified"],
+        },
+    )
+    modified = client.get(
+        LOCATION_URL,
+        headers={
+            **AUTH_HEADERS,
+            "If-Modified-Since": "Sat, 01 Jan 2022 00:00:00 GMT",
+        },
+    )
+
+    assert response.headers["Last-Modified"] == "Sun, 02 Jan 2022 00:00:00 GMT"
+    assert not_modified.status_code == 304
+    assert modified.status_code == 200
+    adapter.location_adapter.assert_called_once()
+
+
+def test_evse_etag():
+    client, _ = get_client(get_crud())
+    evse_url = f"{LOCATION_URL}/{LOCATIONS[0]['evses'][0]['uid']}"
+
+    location_etag = client.get(LOCATION_URL, headers=AUTH_HEADERS).headers[
+        "ETag"
+    ]
+    response = client.get(evse_url, headers=AUTH_HEADERS)
+    not_modified = client.get(
+        evse_url,
+        headers={**AUTH_HEADERS, "If-None-Match": response.headers["ETag"]},
+    )
+    unknown = client.get(
+        f"{LOCATION_URL}/unknown",
+        headers={**AUTH_HEADERS, "If-None-Match": location_etag},
+    )
+
+    assert response.headers["ETag"] != location_etag
+    assert not_modified.status_code == 304
+    assert unknown.status_code == 404
+    assert "ETag" not in unknown.headers
+
+
+def test_unknown_connector_not_answered_with_etag():
+    client, _ = get_client(get_crud())
+    evse_url = f"{LOCATION_URL}/{LOCATIONS[0]['evses'][0]['uid']}"
+
+    evse_etag = client.get(evse_url, headers=AUTH_HEADERS).headers["ETag"]
+    response = client.get(
+        f"{evse_url}/unknown",
+        headers={**AUTH_HEADERS, "If-None-Match": evse_etag},
+    )
+
+    assert response.status_code == 404
+
+
+def test_response_data_etag():
+    client, _ = get_client(get_crud())
+
+    response = client.get("/ocpi/versions", headers=AUTH_HEADERS)
+    not_modified = client.get(
+        "/ocpi/versions",
+        headers={**AUTH_HEADERS, "If-None-Match": response.headers["ETag"]},
+    )
+
+    assert response.status_code == 200
+    assert not_modified.status_code == 304
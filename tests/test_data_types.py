@@ -0,0 +1,80 @@
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from py_ocpi.core.config import settings
+from py_ocpi.core.data_types import URL, CiString, DateTime, String
+
+
+class Model(BaseModel):
+    name: String(5)  # type: ignore
+    code: CiString(3)  # type: ignore
+    url: URL
+
+
+def test_string_types_are_memoized():
+    assert String(5) is String(5)
+    assert CiString(3) is CiString(3)
+    assert String(5) is not String(6)
+    assert String(5) is not CiString(5)
+    assert String() is String(255)
+
+
+def test_string_validation(monkeypatch):
+    monkeypatch.setattr(settings, "CI_STRING_LOWERCASE_PREFERENCE", False)
+    model = Model(name="näme", code="ab", url="https://example.com")
+
+    assert type(model.name) is String(5)
+    assert model.code == "AB"
+    assert type(model.url) is URL
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"name": "toolong"},
+        {"name": "\ud800"},
+        {"name": 1},
+        {"code": "abcd"},
+        {"code": "äb"},
+        {"url": "https://example.com/" + "a" * 255},
+    ],
+)
+def test_string_validation_errors(data):
+    with pytest.raises(ValidationError):
+        Model(**{"name": "name", "code": "ab", "url": "https://a.b", **data})
+
+
+def test_validated_values_are_reused():
+    model = Model(name="name", code="ab", url="https://example.com")
+
+    copy = Model(**model.dict())
+
+    assert copy.name is model.name
+    assert copy.url is model.url
+    with pytest.raises(ValidationError):
+        Model(name=String(5)("toolong"), code="ab", url="https://a.b")
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2022-01-02T00:00:00Z", "2022-01-02T00:00:00Z"),
+        ("2022-01-02 00:00:00+00:00", "2022-01-02T00:00:00Z"),
+        ("2022-01-02T00:00:00.123Z", "2022-01-02T00:00:00Z"),
+        ("2022-01-02T10:11:12", "2022-01-02T10:11:12"),
+        ("2022-01-02T10:11:12+02:00", "2022-01-02T10:11:12+02:00"),
+    ],
+)
+def test_datetime_validation(value, expected):
+    result = DateTime.validate(value)
+
+    assert type(result) is DateTime
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "value", ["2022-02-30T00:00:00Z", "2022-01-02T25:00:00Z", "yesterday"]
+)
+def test_datetime_validation_errors(value):
+    with pytest.raises(ValueError):
+        DateTime.validate(value)
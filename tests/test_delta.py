@@ -0,0 +1,130 @@
+import asyncio
+import copy
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+
+from py_ocpi.core import enums, schemas
+from py_ocpi.core.config import settings
+from py_ocpi.core.delta import get_patches, push_snapshots
+from py_ocpi.core.push import push_object
+from py_ocpi.modules.locations.v_2_2_1.schemas import Location
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_push import LOCATIONS
+
+LOCATION = Location(**LOCATIONS[0]).dict()
+
+
+def get_changed_location() -> dict:
+    location = copy.deepcopy(LOCATION)
+    evse = location["evses"][0]
+    evse["connectors"][0]["max_voltage"] = 220
+    evse["connectors"][0]["last_updated"] = "2022-01-03T00:00:00+00:00"
+    evse["last_updated"] = "2022-01-03T00:00:00+00:00"
+    location["last_updated"] = "2022-01-03T00:00:00+00:00"
+    return location
+
+
+def test_location_patches_changed_connector():
+    location = get_changed_location()
+    evse = location["evses"][0]
+    connector = evse["connectors"][0]
+
+    patches = get_patches(enums.ModuleID.locations, LOCATION, location)
+
+    assert patches == [
+        (
+            f"/{evse['uid']}/{connector['id']}",
+            {"max_voltage": 220, "last_updated": connector["last_updated"]},
+        )
+    ]
+
+
+def test_location_patches_changed_evse_status():
+    location = copy.deepcopy(LOCATION)
+    location["evses"][0]["status"] = "CHARGING"
+    location["name"] = "new name"
+
+    patches = get_patches(enums.ModuleID.locations, LOCATION, location)
+
+    assert [patch[0] for patch in patches] == [
+        "",
+        f"/{location['evses'][0]['uid']}",
+    ]
+    assert patches[0][1]["name"] == "new name"
+    assert "evses" not in patches[0][1]
+    assert patches[1][1]["status"] == "CHARGING"
+    assert "connectors" not in patches[1][1]
+
+
+def test_location_patches_need_full_object_for_new_evse():
+    location = copy.deepcopy(LOCATION)
+    location["evses"].append({**location["evses"][0], "uid": "new"})
+
+    assert get_patches(enums.ModuleID.locations, LOCATION, location) is None
+
+
+def get_recording_client(requests: list) -> httpx.AsyncClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        if request.url.path == "/details":
+            return httpx.Response(
+                200,
+                json={
+                    "data": {
+                        "endpoints": [
+                            {
+                                "identifier": "locations",
+                                "role": "RECEIVER",
+                                "url": "http://a.com/locations/",
+                            }
+                        ]
+                    }
+                },
+            )
+        return httpx.Response(200, json={})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_push_object_sends_patch_after_full_object(monkeypatch):
+    monkeypatch.setattr(settings, "PUSH_DELTA", True)
+    push_snapshots.invalidate()
+    crud = AsyncMock()
+    crud.get.side_effect = [LOCATION, get_changed_location()]
+    adapter = MagicMock()
+    adapter.location_adapter.side_effect = lambda data, version: Location(
+        **data
+    )
+    requests: list = []
+    http_client = get_recording_client(requests)
+    push = schemas.Push(
+        module_id=enums.ModuleID.locations,
+        object_id="1",
+        receivers=[
+            schemas.Receiver(
+                endpoints_url="http://a.com/details", auth_token="token"
+            )
+        ],
+    )
+
+    async def run():
+        for _ in range(2):
+            await push_object(
+                VersionNumber.v_2_2_1,
+                push,
+                crud,
+                adapter,
+                http_client=http_client,
+            )
+
+    asyncio.run(run())
+    push_snapshots.invalidate()
+
+    object_url = f"/locations/{settings.COUNTRY_CODE}/{settings.PARTY_ID}/1"
+    evse = LOCATION["evses"][0]
+    assert [request for request in requests if request[0] != "GET"] == [
+        ("PUT", object_url),
+        ("PATCH", f"{object_url}/{evse['uid']}/{evse['connectors'][0]['id']}"),
+    ]
@@ -0,0 +1,164 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+
+from py_ocpi.core import enums, schemas
+from py_ocpi.core.config import settings
+from py_ocpi.core.discovery import VersionDetailsCache, version_details_cache
+from py_ocpi.core.push import push_object
+from py_ocpi.modules.locations.v_2_2_1.schemas import Location
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_push import LOCATIONS
+
+
+def get_fetch(calls: list, delay: float = 0):
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return [{"identifier": "locations", "call": len(calls)}]
+
+    return fetch
+
+
+def test_cache_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "PUSH_ENDPOINTS_CACHE_TTL", 0)
+    cache, calls = VersionDetailsCache(), []
+
+    async def run():
+        await cache.get("url", "token", get_fetch(calls))
+        await cache.get("url", "token", get_fetch(calls))
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
+
+
+def test_cache_hit(monkeypatch):
+    monkeypatch.setattr(settings, "PUSH_ENDPOINTS_CACHE_TTL", 60)
+    cache, calls = VersionDetailsCache(), []
+
+    async def run():
+        await cache.get("url", "token", get_fetch(calls))
+        await cache.get("url", "token", get_fetch(calls))
+        await cache.get("url", "other_token", get_fetch(calls))
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_concurrent_misses_share_request(monkeypatch):
+    monkeypatch.setattr(settings, "PUSH_ENDPOINTS_CACHE_TTL", 60)
+    cache, calls = VersionDetailsCache(), []
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                cache.get("url", "token", get_fetch(calls, 0.01))
+                for _ in range(5)
+            )
+        )
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+
+
+def test_cache_stale_while_revalidate(monkeypatch):
+    monkeypatch.setattr(settings, "PUSH_ENDPOINTS_CACHE_TTL", 0.05)
+    monkeypatch.setattr(settings, "PUSH_ENDPOINTS_CACHE_STALE_TTL", 60)
+    cache, calls = VersionDetailsCache(), []
+
+    async def run():
+        first = await cache.get("url", "token", get_fetch(calls))
+        await asyncio.sleep(0.06)
+        stale = await cache.get("url", "token", get_fetch(calls))
+        await asyncio.sleep(0.01)
+        refreshed = await cache.get("url", "token", get_fetch(calls))
+        monkeypatch.setattr(settings, "PUSH_ENDPOINTS_CACHE_STALE_TTL", 0)
+        await asyncio.sleep(0.06)
+        expired = await cache.get("url", "token", get_fetch(calls))
+        return first, stale, refreshed, expired
+
+    first, stale, refreshed, expired = asyncio.run(run())
+
+    assert stale == first
+    assert refreshed[0]["call"] == 2
+    assert expired[0]["call"] == 3
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_cache_invalidate(monkeypatch):
+    monkeypatch.setattr(settings, "PUSH_ENDPOINTS_CACHE_TTL", 60)
+    cache, calls = VersionDetailsCache(), []
+
+    async def run():
+        await cache.get("url", "token", get_fetch(calls))
+        await cache.get("other_url", "token", get_fetch(calls))
+        cache.invalidate("url")
+        await cache.get("url", "token", get_fetch(calls))
+        await cache.get("other_url", "token", get_fetch(calls))
+
+    asyncio.run(run())
+
+    assert len(calls) == 3
+
+
+def test_push_object_uses_cached_endpoints(monkeypatch):
+    monkeypatch.setattr(settings, "PUSH_ENDPOINTS_CACHE_TTL", 60)
+    version_details_cache.invalidate()
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.method)
+        if request.method == "GET":
+            return httpx.Response(
+                200,
+                json={
+                    "data": {
+                        "endpoints": [
+                            {
+                                "identifier": "locations",
+                                "role": "RECEIVER",
+                                "url": "http://a.com/locations/",
+                            }
+                        ]
+                    }
+                },
+            )
+        return httpx.Response(200, json={})
+
+    crud = AsyncMock()
+    crud.get.return_value = LOCATIONS[0]
+    adapter = MagicMock()
+    adapter.location_adapter.return_value = Location(**LOCATIONS[0])
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    push = schemas.Push(
+        module_id=enums.ModuleID.locations,
+        object_id="1",
+        receivers=[
+            schemas.Receiver(
+                endpoints_url="http://a.com/details", auth_token="token"
+            )
+        ],
+    )
+
+    async def run():
+        for _ in range(3):
+            await push_object(
+                VersionNumber.v_2_2_1,
+                push,
+                crud,
+                adapter,
+                http_client=http_client,
+            )
+
+    asyncio.run(run())
+    version_details_cache.invalidate()
+
+    assert requests == ["GET", "PUT", "PUT", "PUT"]
@@ -0,0 +1,126 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.crud import Crud
+from py_ocpi.core.dependencies import get_endpoints, get_versions
+from py_ocpi.modules.versions.enums import VersionNumber
+from py_ocpi.modules.versions import responses
+from py_ocpi.modules.versions.responses import PrerenderedResponse
+
+from tests.test_modules.utils import (
+    AUTH_TOKEN,
+    ENCODED_AUTH_TOKEN,
+    ClientAuthenticator,
+)
+
+AUTH_HEADERS = {"Authorization": f"Token {ENCODED_AUTH_TOKEN}"}
+
+
+class MockCrud(Crud):
+    @classmethod
+    async def do(cls, *args, **kwargs):
+        return AUTH_TOKEN
+
+
+def get_app(modules: list):
+    return get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=MockCrud,
+        authenticator=ClientAuthenticator,
+        modules=modules,
+    )
+
+
+def test_prerendered_response_rendered_once():
+    build = MagicMock(side_effect=lambda data: data)
+    prerendered = PrerenderedResponse(build)
+    versions = [{"version": "2.2.1", "url": "https://example.com"}]
+
+    first = prerendered.response(versions)
+    second = prerendered.response(versions)
+    third = prerendered.response(
+        [{**versions[0], "url": "https://example.org"}]
+    )
+
+    assert build.call_count == 2
+    assert json.loads(first.body)["data"] == json.loads(second.body)["data"]
+    assert json.loads(first.body)["status_code"] == 1000
+    assert json.loads(first.body)["timestamp"].endswith("Z")
+    assert json.loads(third.body)["data"][0]["url"] == "https://example.org"
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert first.headers["ETag"] != third.headers["ETag"]
+
+
+def test_version_details_of_each_application():
+    locations = TestClient(get_app([enums.ModuleID.locations])).get(
+        "/ocpi/2.2.1/details", headers=AUTH_HEADERS
+    )
+    tariffs = TestClient(get_app([enums.ModuleID.tariffs])).get(
+        "/ocpi/2.2.1/details", headers=AUTH_HEADERS
+    )
+
+    assert locations.status_code == 200
+    assert locations.json()["data"]["endpoints"][0]["identifier"] == (
+        "locations"
+    )
+    assert tariffs.json()["data"]["endpoints"][0]["identifier"] == "tariffs"
+
+
+def test_version_details_rendered_again_when_endpoints_change():
+    app = get_app([enums.ModuleID.locations, enums.ModuleID.tariffs])
+    client = TestClient(app)
+    endpoints = app.dependency_overrides[get_endpoints]()
+
+    before = client.get("/ocpi/2.2.1/details", headers=AUTH_HEADERS)
+    app.dependency_overrides[get_endpoints] = lambda: {
+        VersionNumber.v_2_2_1: endpoints[VersionNumber.v_2_2_1][:1]
+    }
+    after = client.get("/ocpi/2.2.1/details", headers=AUTH_HEADERS)
+
+    assert len(before.json()["data"]["endpoints"]) == 2
+    assert len(after.json()["data"]["endpoints"]) == 1
+
+
+def test_version_details_rendered_again_after_in_place_change():
+    app = get_app([enums.ModuleID.locations])
+    client = TestClient(app)
+    versions = app.dependency_overrides[get_versions]()
+    endpoints = app.dependency_overrides[get_endpoints]()
+
+    endpoints[VersionNumber.v_2_2_1][0].url = "https://example.org/locations"
+    before = client.get("/ocpi/2.2.1/details", headers=AUTH_HEADERS)
+    app.state.discovery_responses.render(versions, endpoints)
+    after = client.get("/ocpi/2.2.1/details", headers=AUTH_HEADERS)
+
+    # data isn't compared per request
+    assert before.json()["data"]["endpoints"][0]["url"] != (
+        "https://example.org/locations"
+    )
+    assert after.json()["data"]["endpoints"][0]["url"] == (
+        "https://example.org/locations"
+    )
+
+
+def test_discovery_responses_kept_per_application():
+    locations_app = get_app([enums.ModuleID.locations])
+    tariffs_app = get_app([enums.ModuleID.tariffs])
+    locations = TestClient(locations_app)
+    tariffs = TestClient(tariffs_app)
+    locations.get("/ocpi/2.2.1/details", headers=AUTH_HEADERS)
+    tariffs.get("/ocpi/2.2.1/details", headers=AUTH_HEADERS)
+
+    with patch.object(responses, "dumps", side_effect=responses.dumps) as dumps:
+        for _ in range(2):
+            locations.get("/ocpi/2.2.1/details", headers=AUTH_HEADERS)
+            tariffs.get("/ocpi/2.2.1/details", headers=AUTH_HEADERS)
+
+    assert dumps.call_count == 0
+    assert (
+        locations_app.state.discovery_responses
+        is not tariffs_app.state.discovery_responses
+    )
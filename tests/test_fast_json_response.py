@@ -0,0 +1,72 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi.testclient import TestClient
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.responses import OCPIJSONResponse
+from py_ocpi.core.schemas import OCPIResponse
+from py_ocpi.modules.locations.v_2_2_1.schemas import Location
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_modules.utils import ClientAuthenticator, ENCODED_AUTH_TOKEN
+from tests.test_push import LOCATIONS
+
+
+def get_client(fast_json_response: bool) -> TestClient:
+    crud = AsyncMock()
+    crud.list.return_value = LOCATIONS, 1, True
+    adapter = MagicMock()
+    adapter.location_adapter.return_value = Location(**LOCATIONS[0])
+
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=crud,
+        adapter=adapter,
+        authenticator=ClientAuthenticator,
+        modules=[enums.ModuleID.locations],
+        fast_json_response=fast_json_response,
+    )
+    return TestClient(app)
+
+
+def test_fast_json_response_matches_default_response():
+    responses = [
+        get_client(fast_json_response).get(
+            "/ocpi/cpo/2.2.1/locations",
+            headers={"Authorization": f"Token {ENCODED_AUTH_TOKEN}"},
+        )
+        for fast_json_response in (False, True)
+    ]
+    default, fast = (response.json() for response in responses)
+    default.pop("timestamp")
+    fast.pop("timestamp")
+
+    assert responses[1].status_code == 200
+    assert fast == default
+    assert responses[1].headers["X-Total-Count"] == "1"
+    assert responses[1].headers["X-Limit"] == "50"
+
+
+def test_fast_json_response_keeps_openapi_schema():
+    client = get_client(fast_json_response=True)
+
+    schema = client.get("/ocpi/openapi.json").json()
+
+    assert "OCPIResponse" in schema["components"]["schemas"]
+
+
+def test_ocpi_json_response_render():
+    response = OCPIJSONResponse(
+        OCPIResponse(
+            data=[{"id": "1"}],
+            status_code=1000,
+            timestamp="2024-01-01T00:00:00Z",
+        )
+    )
+
+    assert response.body == (
+        b'{"data":[{"id":"1"}],"status_code":1000,'
+        b'"status_message":null,"timestamp":"2024-01-01T00:00:00Z"}'
+    )
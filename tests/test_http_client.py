@@ -0,0 +1,138 @@
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.config import settings
+from py_ocpi.core.dependencies import get_http_client
+from py_ocpi.core.http_client import (
+    HTTPClientManager,
+    PerHostLimitTransport,
+    create_http_client,
+    http_client_manager,
+)
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_modules.utils import ClientAuthenticator
+
+
+def get_app(**kwargs):
+    return get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=None,
+        authenticator=ClientAuthenticator,
+        modules=[],
+        **kwargs,
+    )
+
+
+def test_http_client_manager_lifespan():
+    manager = HTTPClientManager()
+
+    async def run():
+        await manager.startup()
+        client = manager.client
+        assert manager.client is client
+        await manager.shutdown()
+        return client
+
+    client = asyncio.run(run())
+
+    assert client.is_closed
+
+
+def test_http_client_manager_keeps_given_client_open():
+    client = httpx.AsyncClient()
+    manager = HTTPClientManager(client)
+
+    asyncio.run(manager.shutdown())
+
+    assert manager.client is client
+    assert not client.is_closed
+
+
+def test_get_application_http_client():
+    client = httpx.AsyncClient()
+    app = get_app(http_client=client)
+
+    assert app.dependency_overrides[get_http_client]() is client
+
+
+def test_get_application_shared_http_client_lifespan():
+    app = get_app()
+
+    with TestClient(app):
+        client = app.dependency_overrides[get_http_client]()
+        assert app.dependency_overrides[get_http_client]() is client
+        assert not client.is_closed
+
+    assert client.is_closed
+
+
+def test_get_application_closes_default_http_client():
+    app = get_app()
+
+    with TestClient(app):
+        client = http_client_manager.client
+
+    assert client.is_closed
+    assert not http_client_manager.client.is_closed
+    asyncio.run(http_client_manager.shutdown())
+
+
+def test_create_http_client_per_host_limit(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST", 2)
+
+    client = create_http_client()
+
+    assert isinstance(client._transport, PerHostLimitTransport)
+
+
+def test_per_host_limit_transport():
+    active = {"current": 0, "max": 0}
+
+    async def handler(request):
+        active["current"] += 1
+        active["max"] = max(active["max"], active["current"])
+        await asyncio.sleep(0.01)
+        active["current"] -= 1
+        return httpx.Response(200, json={})
+
+    async def run():
+        transport = PerHostLimitTransport(httpx.MockTransport(handler), 2)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await asyncio.gather(
+                *(client.get("http://example.com/") for _ in range(6)),
+                client.get("http://example.org/"),
+            )
+        return transport
+
+    transport = asyncio.run(run())
+
+    assert active["max"] <= 3
+    for semaphore in transport.semaphores.values():
+        assert not semaphore.locked()
+
+
+def test_per_host_limit_transport_releases_streamed_response():
+    class Stream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"{}"
+
+    def handler(request):
+        return httpx.Response(200, stream=Stream())
+
+    async def run():
+        transport = PerHostLimitTransport(httpx.MockTransport(handler), 1)
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream("GET", "http://example.com/") as response:
+                semaphore = transport.semaphores[("http", "example.com", None)]
+                assert semaphore.locked()
+                await response.aread()
+            assert not semaphore.locked()
+            await client.get("http://example.com/")
+
+    asyncio.run(asyncio.wait_for(run(), 5))
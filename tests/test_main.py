@@ -1,8 +1,12 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi.testclient import TestClient
+
 from py_ocpi import get_application
 from py_ocpi.core import enums
 from py_ocpi.modules.versions.enums import VersionNumber
 
-from tests.test_modules.utils import ClientAuthenticator
+from tests.test_modules.utils import ClientAuthenticator, ENCODED_AUTH_TOKEN
 
 
 def test_get_application():
@@ -22,3 +26,26 @@ def test_get_application():
     )
 
     assert app.url_path_for("get_versions") == "/ocpi/versions"
+
+
+def test_exception_handler_middleware_unknown_exception():
+    crud = AsyncMock()
+    crud.list.side_effect = RuntimeError("boom")
+
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=crud,
+        modules=[enums.ModuleID.locations],
+        adapter=MagicMock(),
+        authenticator=ClientAuthenticator,
+    )
+
+    client = TestClient(app)
+    response = client.get(
+        "/ocpi/cpo/2.2.1/locations",
+        headers={"Authorization": f"Token {ENCODED_AUTH_TOKEN}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["status_code"] == 3000
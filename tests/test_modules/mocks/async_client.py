@@ -1,3 +1,5 @@
+import httpx
+
 from py_ocpi.core.dependencies import get_versions
 from py_ocpi.core.endpoints import ENDPOINTS
 from py_ocpi.core.enums import RoleEnum, ModuleID
@@ -42,9 +44,21 @@ class MockAsyncClientVersionsAndEndpoints:
         return MockResponse(fake_endpoints_data, 200)
 
 
-class MockAsyncClientGeneratorVersionsAndEndpoints:
-    async def __aenter__(self):
-        return MockAsyncClientVersionsAndEndpoints
+# Shared HTTP client stubs
+
+
+class RecordingHandler:
+    def __init__(self, status_code: int = 200, json_data=None):
+        self.status_code = status_code
+        self.json_data = json_data if json_data is not None else {}
+        self.requests: list = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(self.status_code, json=self.json_data)
+
 
-    async def __aexit__(self, *args, **kwargs):
-        pass
+def get_stub_http_client(handler=None) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(handler or RecordingHandler())
+    )
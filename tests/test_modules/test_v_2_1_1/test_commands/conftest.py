@@ -6,17 +6,27 @@ from py_ocpi.main import get_application
 from py_ocpi.core import enums
 from py_ocpi.modules.versions.enums import VersionNumber
 
+from tests.test_modules.mocks.async_client import (
+    RecordingHandler,
+    get_stub_http_client,
+)
 from .utils import Crud, ClientAuthenticator
 
 
 @pytest.fixture
-def command_cpo_v_2_1_1():
+def http_handler():
+    return RecordingHandler()
+
+
+@pytest.fixture
+def command_cpo_v_2_1_1(http_handler):
     return get_application(
         version_numbers=[VersionNumber.v_2_1_1],
         roles=[enums.RoleEnum.cpo],
         crud=Crud,
         authenticator=ClientAuthenticator,
         modules=[enums.ModuleID.commands, enums.ModuleID.sessions],
+        http_client=get_stub_http_client(http_handler),
     )
 
 
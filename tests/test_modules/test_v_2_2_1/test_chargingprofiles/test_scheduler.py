@@ -0,0 +1,197 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+
+from py_ocpi.core.config import settings
+from py_ocpi.core.crud import Crud
+from py_ocpi.core.enums import ModuleID
+from py_ocpi.modules.chargingprofiles.v_2_2_1.scheduler import (
+    ChargingProfileScheduler,
+    charging_profile_scheduler,
+)
+from py_ocpi.modules.chargingprofiles.v_2_2_1.schemas import (
+    ChargingProfileResult,
+)
+
+from tests.test_modules.mocks.async_client import (
+    RecordingHandler,
+    get_stub_http_client,
+)
+
+
+class BatchCrud(Crud):
+    calls: list = []
+    answered: set = set()
+
+    @classmethod
+    async def get_many(cls, module, role, queries):
+        cls.calls.append((module, len(queries)))
+        return [
+            {"result": "ACCEPTED"}
+            if query["response_url"] in cls.answered
+            else None
+            for query in queries
+        ]
+
+
+class UnansweredCrud(Crud):
+    calls: list = []
+
+    @classmethod
+    async def get(cls, module, role, id, *args, **kwargs):
+        cls.calls.append((module, id, kwargs))
+        return None
+
+
+class AcceptingCrud(Crud):
+    @classmethod
+    async def get(cls, module, role, id, *args, **kwargs):
+        return {"result": "ACCEPTED"}
+
+
+class DuckCrud:
+    """Crud which doesn't subclass Crud, as accepted by get_application."""
+
+    @classmethod
+    async def get(cls, module, role, id, *args, **kwargs):
+        return {"result": "ACCEPTED"}
+
+
+def schedule(scheduler, crud, http_client, response_url):
+    scheduler.schedule(
+        "charging profile",
+        response_url,
+        "token",
+        query={"id": 0, "response_url": response_url},
+        adapt=lambda result: ChargingProfileResult(**result),
+        crud=crud,
+        http_client=http_client,
+    )
+
+
+async def wait_sent(scheduler, amount):
+    for _ in range(200):
+        if scheduler.sent + scheduler.failed >= amount:
+            return
+        await asyncio.sleep(0.01)
+
+
+def test_scheduler_batches_lookups(monkeypatch):
+    monkeypatch.setattr(settings, "CHARGING_PROFILE_POLL_INTERVAL", 0.05)
+    monkeypatch.setattr(settings, "CHARGING_PROFILE_WORKERS", 2)
+    BatchCrud.calls, BatchCrud.answered = [], set()
+    scheduler = ChargingProfileScheduler()
+    handler = RecordingHandler()
+    http_client = get_stub_http_client(handler)
+    urls = [f"https://example.com/profiles/{i}" for i in range(20)]
+
+    async def run():
+        for url in urls:
+            schedule(scheduler, BatchCrud, http_client, url)
+        await asyncio.sleep(0.02)
+        assert scheduler.stats()["pending"] == 20
+        BatchCrud.answered.update(urls)
+        await wait_sent(scheduler, 20)
+        stats = scheduler.stats()
+        await scheduler.stop()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert BatchCrud.calls == [
+        (ModuleID.hub_client_info, 20),
+        (ModuleID.hub_client_info, 20),
+    ]
+    assert stats["pending"] == 0
+    assert stats["sent"] == 20
+    assert sorted(str(r.url) for r in handler.requests) == sorted(urls)
+
+
+def test_scheduler_rejects_after_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "GET_ACTIVE_PROFILE_AWAIT_TIME", 0)
+    scheduler = ChargingProfileScheduler()
+    handler = RecordingHandler()
+    UnansweredCrud.calls = []
+
+    async def run():
+        schedule(
+            scheduler,
+            UnansweredCrud,
+            get_stub_http_client(handler),
+            "https://example.com/profiles/1",
+        )
+        await wait_sent(scheduler, 1)
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    # crud without own get_many is looked up with get
+    assert UnansweredCrud.calls == [
+        (
+            ModuleID.hub_client_info,
+            0,
+            {"response_url": "https://example.com/profiles/1"},
+        )
+    ]
+    assert scheduler.timed_out == 1
+    assert handler.requests[0].read() == b'{"result": "REJECTED"}'
+
+
+def test_scheduler_sends_adapted_result():
+    scheduler = ChargingProfileScheduler()
+    adapt = MagicMock(return_value=ChargingProfileResult(result="ACCEPTED"))
+    handler = RecordingHandler()
+
+    async def run():
+        scheduler.schedule(
+            "clear profile",
+            "https://example.com/profiles/1",
+            "token",
+            query={"id": 0},
+            adapt=adapt,
+            crud=AcceptingCrud,
+            http_client=get_stub_http_client(handler),
+        )
+        await wait_sent(scheduler, 1)
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    adapt.assert_called_once()
+    assert handler.requests[0].headers["authorization"].startswith("Token ")
+
+
+def test_scheduler_crud_without_get_many():
+    scheduler = ChargingProfileScheduler()
+    handler = RecordingHandler()
+
+    async def run():
+        schedule(
+            scheduler,
+            DuckCrud,
+            get_stub_http_client(handler),
+            "https://example.com/profiles/1",
+        )
+        await wait_sent(scheduler, 1)
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    assert scheduler.timed_out == 0
+    assert handler.requests[0].read() == b'{"result": "ACCEPTED"}'
+
+
+def test_scheduler_stopped_on_shutdown(chargingprofile_cpo_v_2_2_1):
+    with TestClient(chargingprofile_cpo_v_2_2_1) as client:
+        client.portal.call(
+            schedule,
+            charging_profile_scheduler,
+            UnansweredCrud,
+            get_stub_http_client(RecordingHandler()),
+            "https://example.com/profiles/1",
+        )
+        assert charging_profile_scheduler.task is not None
+
+    assert charging_profile_scheduler.task is None
+    assert charging_profile_scheduler.stats()["pending"] == 0
@@ -51,7 +51,9 @@ def test_cpo_receive_command_start_session_not_authenticated(
     assert response.status_code == 403
 
 
-def test_cpo_receive_command_start_session_v_2_2_1(client_cpo_v_2_2_1):
+def test_cpo_receive_command_start_session_v_2_2_1(
+    client_cpo_v_2_2_1, http_handler
+):
     data = {
         "response_url": "https://dummy.restapiexample.com/api/v1/create",
         "token": {
@@ -77,6 +79,9 @@ def test_cpo_receive_command_start_session_v_2_2_1(client_cpo_v_2_2_1):
     assert response.status_code == 200
     assert len(response.json()["data"]) == 1
     assert response.json()["data"][0]["result"] == COMMAND_RESPONSE["result"]
+    assert len(http_handler.requests) == 1
+    assert http_handler.requests[0].method == "POST"
+    assert http_handler.requests[0].url == data["response_url"]
 
 
 def test_cpo_receive_command_stop_session_v_2_2_1(client_cpo_v_2_2_1):
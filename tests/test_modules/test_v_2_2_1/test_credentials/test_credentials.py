@@ -1,6 +1,5 @@
 import functools
 from uuid import uuid4
-from unittest.mock import patch
 from typing import Any
 
 import pytest
@@ -47,8 +46,7 @@ def test_cpo_get_credentials_v_2_2_1():
 
 
 @pytest.mark.asyncio
-@patch("py_ocpi.modules.credentials.v_2_2_1.api.cpo.httpx.AsyncClient")
-async def test_cpo_post_credentials_v_2_2_1(async_client):
+async def test_cpo_post_credentials_v_2_2_1():
     class MockCrud(Crud):
         @classmethod
         async def do(
@@ -83,14 +81,13 @@ async def test_cpo_post_credentials_v_2_2_1(async_client):
 
     app_1.dependency_overrides[get_versions] = override_get_versions
 
-    async_client.return_value = AsyncClient(app=app_1, base_url="http://test")
-
     app_2 = get_application(
         version_numbers=[VersionNumber.v_2_2_1],
         roles=[enums.RoleEnum.cpo],
         crud=MockCrud,
         authenticator=ClientAuthenticator,
         modules=[enums.ModuleID.credentials_and_registration],
+        http_client=AsyncClient(app=app_1, base_url="http://test"),
     )
 
     async with AsyncClient(app=app_2, base_url="http://test") as client:
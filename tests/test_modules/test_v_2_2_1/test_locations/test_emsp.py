@@ -2,9 +2,22 @@ import pytest
 
 from uuid import uuid4
 
-from py_ocpi.core.config import settings
+from fastapi.testclient import TestClient
 
-from .utils import EMSP_BASE_URL, AUTH_HEADERS, LOCATIONS, WRONG_AUTH_HEADERS
+from py_ocpi.main import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.config import settings
+from py_ocpi.core.crud import Crud as BaseCrud
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from .utils import (
+    EMSP_BASE_URL,
+    AUTH_HEADERS,
+    LOCATIONS,
+    WRONG_AUTH_HEADERS,
+    ClientAuthenticator,
+    Crud,
+)
 
 LOCATION_URL = (
     f"{EMSP_BASE_URL}{settings.COUNTRY_CODE}/{settings.PARTY_ID}/"
@@ -172,3 +185,153 @@ def test_emsp_patch_connector_v_2_2_1(client_emsp_v_2_2_1):
     assert response.status_code == 200
     assert len(response.json()["data"]) == 1
     assert response.json()["data"][0]["id"] == patch_data["id"]
+
+
+class HookCrud(Crud, BaseCrud):
+    calls: list = []
+
+    @classmethod
+    async def get(cls, module, role, id, *args, **kwargs):
+        cls.calls.append(("get", id))
+        return await super().get(module, role, id, *args, **kwargs)
+
+    @classmethod
+    async def update(cls, module, role, data, id, *args, **kwargs):
+        cls.calls.append(("update", id))
+        return data
+
+    @classmethod
+    async def get_evse(cls, module, role, location_id, evse_uid, **kwargs):
+        cls.calls.append(("get_evse", evse_uid))
+        return LOCATIONS[0]["evses"][0]
+
+    @classmethod
+    async def patch_connector(
+        cls, module, role, data, location_id, evse_uid, connector_id, **kwargs
+    ):
+        cls.calls.append(("patch_connector", data))
+        return {**LOCATIONS[0]["evses"][0]["connectors"][0], **data}
+
+
+def get_hook_client() -> TestClient:
+    HookCrud.calls = []
+    return TestClient(
+        get_application(
+            version_numbers=[VersionNumber.v_2_2_1],
+            roles=[enums.RoleEnum.emsp],
+            crud=HookCrud,
+            authenticator=ClientAuthenticator,
+            modules=[enums.ModuleID.locations],
+        )
+    )
+
+
+def test_emsp_get_evse_crud_hook_v_2_2_1():
+    client = get_hook_client()
+
+    response = client.get(EVSE_URL, headers=AUTH_HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["data"][0]["uid"] == LOCATIONS[0]["evses"][0]["uid"]
+    assert HookCrud.calls == [("get_evse", LOCATIONS[0]["evses"][0]["uid"])]
+
+
+def test_emsp_patch_connector_crud_hook_v_2_2_1():
+    client = get_hook_client()
+
+    response = client.patch(
+        CONNECTOR_URL, json={"max_voltage": 220}, headers=AUTH_HEADERS
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"][0]["max_voltage"] == 220
+    assert HookCrud.calls == [("patch_connector", {"max_voltage": 220})]
+
+
+def test_emsp_crud_hook_errors_not_hidden_v_2_2_1():
+    class BrokenHookCrud(HookCrud):
+        @classmethod
+        async def get_evse(cls, *args, **kwargs):
+            raise NotImplementedError
+
+    client = TestClient(
+        get_application(
+            version_numbers=[VersionNumber.v_2_2_1],
+            roles=[enums.RoleEnum.emsp],
+            crud=BrokenHookCrud,
+            authenticator=ClientAuthenticator,
+            modules=[enums.ModuleID.locations],
+        )
+    )
+    HookCrud.calls = []
+
+    response = client.get(EVSE_URL, headers=AUTH_HEADERS)
+
+    assert response.json()["status_code"] == 3000
+    # the whole location isn't loaded instead
+    assert HookCrud.calls == []
+
+
+class LocationCrud(Crud, BaseCrud):
+    calls: list = []
+
+    @classmethod
+    async def get(cls, module, role, id, *args, **kwargs):
+        cls.calls.append(("get", id))
+        return await super().get(module, role, id, *args, **kwargs)
+
+    @classmethod
+    async def update(cls, module, role, data, id, *args, **kwargs):
+        cls.calls.append(("update", data))
+        return data
+
+
+def test_emsp_crud_default_hooks_use_whole_location_v_2_2_1():
+    location_id = LOCATIONS[0]["id"]
+    connector = LOCATIONS[0]["evses"][0]["connectors"][0]
+    LocationCrud.calls = []
+    client = TestClient(
+        get_application(
+            version_numbers=[VersionNumber.v_2_2_1],
+            roles=[enums.RoleEnum.emsp],
+            crud=LocationCrud,
+            authenticator=ClientAuthenticator,
+            modules=[enums.ModuleID.locations],
+        )
+    )
+
+    found = client.get(CONNECTOR_URL, headers=AUTH_HEADERS)
+    patched = client.patch(
+        CONNECTOR_URL, json={"max_voltage": 110}, headers=AUTH_HEADERS
+    )
+
+    assert found.json()["data"][0]["id"] == connector["id"]
+    assert patched.json()["data"][0]["max_voltage"] == 110
+    # stored location isn't changed in place
+    assert connector["max_voltage"] != 110
+    assert LocationCrud.calls[:2] == [("get", location_id)] * 2
+    stored = LocationCrud.calls[2][1]
+    assert stored["evses"][0]["connectors"][0]["max_voltage"] == 110
+
+
+def test_emsp_patch_evse_crud_fallback_v_2_2_1():
+    client = get_hook_client()
+
+    response = client.patch(
+        EVSE_URL, json={"status": "CHARGING"}, headers=AUTH_HEADERS
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"][0]["status"] == "CHARGING"
+    assert HookCrud.calls == [
+        ("get", LOCATIONS[0]["id"]),
+        ("update", LOCATIONS[0]["id"]),
+    ]
+
+
+def test_emsp_get_evse_not_found_v_2_2_1(client_emsp_v_2_2_1):
+    response = client_emsp_v_2_2_1.get(
+        f"{LOCATION_URL}/unknown", headers=AUTH_HEADERS
+    )
+
+    assert response.status_code == 404
@@ -0,0 +1,148 @@
+import copy
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.config import settings
+from py_ocpi.core import validation
+from py_ocpi.core.validation import validation_pool
+from py_ocpi.modules.locations.v_2_2_1.schemas import Location
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_modules.test_v_2_2_1.test_locations.utils import (
+    AUTH_HEADERS,
+    EMSP_BASE_URL,
+    LOCATIONS,
+    ClientAuthenticator,
+)
+
+LOCATION_URL = f"{EMSP_BASE_URL}us/AAA/{LOCATIONS[0]['id']}"
+
+
+def get_client(crud, offload_validation: bool = True) -> TestClient:
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.emsp],
+        crud=crud,
+        authenticator=ClientAuthenticator,
+        modules=[enums.ModuleID.locations],
+        offload_validation=offload_validation,
+    )
+    return TestClient(app)
+
+
+def get_crud() -> AsyncMock:
+    crud = AsyncMock()
+    crud.get.return_value = None
+    crud.create.return_value = LOCATIONS[0]
+    return crud
+
+
+@pytest.fixture(autouse=True)
+def offload_all_bodies(monkeypatch):
+    monkeypatch.setattr(settings, "VALIDATION_OFFLOAD_MIN_SIZE", 0)
+    monkeypatch.setattr(settings, "VALIDATION_PROCESSES", 0)
+
+
+@pytest.mark.parametrize("processes", [0, 1])
+def test_body_validated_in_pool(monkeypatch, processes):
+    monkeypatch.setattr(settings, "VALIDATION_PROCESSES", processes)
+    crud = get_crud()
+
+    with get_client(crud) as client:
+        response = client.put(
+            LOCATION_URL, json=LOCATIONS[0], headers=AUTH_HEADERS
+        )
+
+    assert response.status_code == 200
+    assert response.json()["data"][0]["id"] == LOCATIONS[0]["id"]
+    data = crud.create.await_args.args[2]
+    assert data == Location(**LOCATIONS[0]).dict()
+
+
+def test_small_body_validated_on_event_loop(monkeypatch):
+    monkeypatch.setattr(settings, "VALIDATION_OFFLOAD_MIN_SIZE", 10**6)
+    run = AsyncMock()
+    monkeypatch.setattr(validation_pool, "run", run)
+
+    response = get_client(get_crud()).put(
+        LOCATION_URL, json=LOCATIONS[0], headers=AUTH_HEADERS
+    )
+
+    assert response.status_code == 200
+    run.assert_not_awaited()
+
+
+def test_validation_errors_as_without_offload():
+    location = copy.deepcopy(LOCATIONS[0])
+    del location["address"]
+
+    response = get_client(get_crud()).put(
+        LOCATION_URL, json=location, headers=AUTH_HEADERS
+    )
+    expected = get_client(get_crud(), offload_validation=False).put(
+        LOCATION_URL, json=location, headers=AUTH_HEADERS
+    )
+
+    assert response.status_code == 422
+    assert response.json() == expected.json()
+
+
+def test_invalid_json_body():
+    response = get_client(get_crud()).put(
+        LOCATION_URL,
+        content="not json",
+        headers={**AUTH_HEADERS, "Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 0]
+
+
+def test_openapi_keeps_request_body():
+    schema = get_client(get_crud()).app.openapi()
+
+    operation = schema["paths"][
+        "/ocpi/emsp/2.2.1/locations/{country_code}/{party_id}/{location_id}"
+    ]["put"]
+    assert "requestBody" in operation
+
+
+def test_missing_body_as_without_offload():
+    response = get_client(get_crud()).put(LOCATION_URL, headers=AUTH_HEADERS)
+    expected = get_client(get_crud(), offload_validation=False).put(
+        LOCATION_URL, headers=AUTH_HEADERS
+    )
+
+    assert response.status_code == 422
+    assert response.json() == expected.json()
+
+
+def test_fastapi_internals_supported():
+    client = get_client(get_crud())
+
+    wrapped = [
+        route
+        for route in client.app.routes
+        if getattr(route, "path", "").endswith("{location_id}")
+        and "PUT" in route.methods
+    ]
+    assert wrapped[0].dependant.body_params == []
+
+
+def test_unsupported_fastapi_validates_as_before(monkeypatch):
+    def get_request_handler(dependant, status_code=None):
+        raise AssertionError("route wrapped")
+
+    monkeypatch.setattr(validation, "get_request_handler", get_request_handler)
+    crud = get_crud()
+
+    response = get_client(crud).put(
+        LOCATION_URL, json=LOCATIONS[0], headers=AUTH_HEADERS
+    )
+
+    assert response.status_code == 200
+    assert crud.create.await_args.args[2] == Location(**LOCATIONS[0]).dict()
@@ -0,0 +1,234 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from py_ocpi import get_application
+from py_ocpi.core import enums, schemas
+from py_ocpi.core.config import settings
+from py_ocpi.core.http_client import HTTPClientManager
+from py_ocpi.core.outbox import (
+    InMemoryOutboxBackend,
+    Outbox,
+    OutboxJob,
+    SQLiteOutboxBackend,
+)
+from py_ocpi.modules.locations.v_2_2_1.schemas import Location
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_modules.utils import (
+    AUTH_TOKEN_V_2_2_1,
+    ClientAuthenticator,
+    ENCODED_AUTH_TOKEN,
+)
+from tests.test_push import LOCATIONS, get_push_client
+
+
+def get_push(*hosts: str) -> schemas.Push:
+    return schemas.Push(
+        module_id=enums.ModuleID.locations,
+        object_id="1",
+        receivers=[
+            schemas.Receiver(
+                endpoints_url=f"http://{host}/details", auth_token="token"
+            )
+            for host in hosts
+        ],
+    )
+
+
+def get_outbox(backend, http_client=None):
+    crud = AsyncMock()
+    crud.get.return_value = LOCATIONS[0]
+    adapter = MagicMock()
+    adapter.location_adapter.return_value = Location(**LOCATIONS[0])
+    if http_client is None:
+        http_client = get_push_client({}, {"current": 0, "max": 0})
+    return Outbox(backend, crud, adapter, HTTPClientManager(http_client))
+
+
+def get_job(host: str = "a.com") -> OutboxJob:
+    return OutboxJob(
+        version=VersionNumber.v_2_2_1,
+        module_id=enums.ModuleID.locations,
+        object_id="1",
+        receiver=get_push(host).receivers[0],
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryOutboxBackend()
+    return SQLiteOutboxBackend(str(tmp_path / "outbox.sqlite3"))
+
+
+def test_outbox_coalesces_updates(backend):
+    outbox = get_outbox(backend)
+
+    async def run():
+        for _ in range(3):
+            await outbox.enqueue(VersionNumber.v_2_2_1, get_push("a.com"))
+        await outbox.enqueue(VersionNumber.v_2_2_1, get_push("b.com"))
+        assert await backend.size() == 2
+        assert await outbox.process() == 2
+        return await outbox.stats()
+
+    stats = asyncio.run(run())
+
+    # object is loaded once for both receivers
+    outbox.crud.get.assert_awaited_once()
+    assert stats["enqueued"] == 4
+    assert stats["coalesced"] == 2
+    assert stats["delivered"] == 2
+    assert stats["waiting"] == 0
+
+
+def test_outbox_loads_object_with_requester_token(backend):
+    outbox = get_outbox(backend)
+
+    async def run():
+        await outbox.enqueue(
+            VersionNumber.v_2_2_1, get_push("a.com"), "requester"
+        )
+        await outbox.process()
+
+    asyncio.run(run())
+
+    assert outbox.crud.get.await_args.kwargs["auth_token"] == "requester"
+
+
+def test_outbox_coalesced_job_takes_new_tokens(backend):
+    job = get_job()
+    updated = get_job()
+    updated.receiver = schemas.Receiver(
+        endpoints_url=job.receiver.endpoints_url, auth_token="rotated"
+    )
+    updated.auth_token = "requester"
+
+    async def run():
+        await backend.put(job)
+        assert await backend.put(updated) is True
+        return await backend.lease(10, time.time(), time.time() + 60)
+
+    leased = asyncio.run(run())
+
+    assert leased[0].receiver.auth_token == "rotated"
+    assert leased[0].auth_token == "requester"
+
+
+def test_outbox_retries_with_backoff(backend, monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "OUTBOX_RETRY_BASE_DELAY", 10.0)
+    outbox = get_outbox(backend)
+
+    async def run():
+        await outbox.enqueue(VersionNumber.v_2_2_1, get_push("broken.com"))
+        assert await outbox.process() == 1
+        # job isn't due until backoff delay passes
+        assert await outbox.process() == 0
+        jobs = await backend.lease(10, time.time() + 11, time.time() + 60)
+        assert len(jobs) == 1
+        assert jobs[0].attempts == 1
+        assert "502" in jobs[0].last_error
+        await outbox.deliver(jobs)
+        return await outbox.stats()
+
+    stats = asyncio.run(run())
+
+    assert stats["retried"] == 1
+    assert stats["discarded"] == 1
+    assert stats["waiting"] == 0
+
+
+def test_outbox_keeps_job_updated_during_delivery(backend):
+    async def run():
+        now = time.time()
+        await backend.put(get_job())
+        leased = await backend.lease(10, now, now + 60)
+        assert await backend.lease(10, now, now + 60) == []
+        assert await backend.put(get_job()) is True
+        await backend.complete(leased[0], now)
+        assert await backend.size() == 1
+
+        leased = await backend.lease(10, now, now + 60)
+        await backend.complete(leased[0], now)
+        return await backend.size()
+
+    assert asyncio.run(run()) == 0
+
+
+def test_sqlite_outbox_is_durable(tmp_path):
+    path = str(tmp_path / "outbox.sqlite3")
+
+    async def run():
+        backend = SQLiteOutboxBackend(path)
+        await backend.put(get_job())
+        await backend.close()
+
+        backend = SQLiteOutboxBackend(path)
+        jobs = await backend.lease(10, time.time(), time.time() + 60)
+        await backend.close()
+        return jobs
+
+    jobs = asyncio.run(run())
+
+    assert len(jobs) == 1
+    assert jobs[0].key == get_job().key
+
+
+def test_http_push_to_outbox():
+    crud = AsyncMock()
+    crud.get.return_value = LOCATIONS[0]
+    adapter = MagicMock()
+    adapter.location_adapter.return_value = Location(**LOCATIONS[0])
+    backend = InMemoryOutboxBackend()
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=crud,
+        adapter=adapter,
+        authenticator=ClientAuthenticator,
+        modules=[],
+        http_push=True,
+        http_client=get_push_client({}, {"current": 0, "max": 0}),
+        push_outbox=backend,
+    )
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/push/2.2.1/outbox",
+            json=get_push("a.com", "b.com").dict(),
+            headers={"Authorization": f"Token {ENCODED_AUTH_TOKEN}"},
+        )
+        for _ in range(100):
+            if app.state.outbox.delivered == 2:
+                break
+            time.sleep(0.01)
+
+    assert response.status_code == 202
+    assert response.json() == {"queued": 2, "coalesced": 0}
+    assert app.state.outbox.delivered == 2
+    assert crud.get.await_args.kwargs["auth_token"] == AUTH_TOKEN_V_2_2_1
+    assert backend.jobs == {}
+
+
+def test_http_push_to_outbox_disabled():
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=AsyncMock(),
+        authenticator=ClientAuthenticator,
+        modules=[],
+        http_push=True,
+    )
+
+    response = TestClient(app).post(
+        "/push/2.2.1/outbox",
+        json=get_push("a.com").dict(),
+        headers={"Authorization": f"Token {ENCODED_AUTH_TOKEN}"},
+    )
+
+    assert response.status_code == 404
@@ -1,9 +1,11 @@
 from unittest.mock import AsyncMock, MagicMock
+from urllib.parse import parse_qs, urlparse
 
 from fastapi.testclient import TestClient
 
 from py_ocpi import get_application
 from py_ocpi.core import enums
+from py_ocpi.core.utils import decode_cursor, encode_cursor
 from py_ocpi.modules.versions.enums import VersionNumber
 
 from tests.test_modules.utils import (
@@ -63,3 +65,92 @@ def test_inject_dependency_v_2_1_1():
     assert response.headers.get("X-Total-Count") == "0"
     assert response.headers.get("X-Limit") == "50"
     assert response.headers.get("Link") == ""
+
+
+def get_cursor_client(crud) -> TestClient:
+    adapter = MagicMock()
+
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=crud,
+        adapter=adapter,
+        authenticator=ClientAuthenticator,
+        modules=[enums.ModuleID.locations],
+        pagination_mode=enums.PaginationMode.cursor,
+    )
+    return TestClient(app)
+
+
+def test_cursor_pagination_link():
+    crud = AsyncMock()
+    crud.list.return_value = (
+        [
+            {"id": "1", "last_updated": "2024-01-01T00:00:00Z"},
+            {"id": "2", "last_updated": "2024-01-02T00:00:00Z"},
+        ],
+        5,
+        False,
+    )
+
+    client = get_cursor_client(crud)
+    response = client.get(
+        "/ocpi/cpo/2.2.1/locations",
+        params={"limit": 2},
+        headers={"Authorization": f"Token {ENCODED_AUTH_TOKEN}"},
+    )
+
+    assert crud.list.call_args.args[2]["cursor"] is None
+    link = response.headers.get("Link")
+    assert "offset" not in link
+    cursor = parse_qs(urlparse(link[1:].split(">")[0]).query)["cursor"][0]
+    assert decode_cursor(cursor) == {
+        "last_updated": "2024-01-02T00:00:00Z",
+        "id": "2",
+    }
+
+    client.get(
+        "/ocpi/cpo/2.2.1/locations",
+        params={"limit": 2, "cursor": cursor},
+        headers={"Authorization": f"Token {ENCODED_AUTH_TOKEN}"},
+    )
+
+    assert crud.list.call_args.args[2]["cursor"] == {
+        "last_updated": "2024-01-02T00:00:00Z",
+        "id": "2",
+    }
+
+
+def test_cursor_pagination_last_page():
+    crud = AsyncMock()
+    crud.list.return_value = [], 0, True
+
+    response = get_cursor_client(crud).get(
+        "/ocpi/cpo/2.2.1/locations",
+        headers={"Authorization": f"Token {ENCODED_AUTH_TOKEN}"},
+    )
+
+    assert response.headers.get("Link") == ""
+
+
+def test_cursor_pagination_invalid_cursor():
+    crud = AsyncMock()
+    crud.list.return_value = [], 0, True
+
+    response = get_cursor_client(crud).get(
+        "/ocpi/cpo/2.2.1/locations",
+        params={"cursor": "foo"},
+        headers={"Authorization": f"Token {ENCODED_AUTH_TOKEN}"},
+    )
+
+    assert response.status_code == 400
+    crud.list.assert_not_called()
+
+
+def test_cursor_encoding():
+    cursor = encode_cursor("2024-01-01T00:00:00Z", "id/1")
+
+    assert decode_cursor(cursor) == {
+        "last_updated": "2024-01-01T00:00:00Z",
+        "id": "id/1",
+    }
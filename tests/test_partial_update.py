@@ -0,0 +1,127 @@
+import copy
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.adapter import BaseAdapter
+from py_ocpi.core.config import settings
+from py_ocpi.core.crud import Crud
+from py_ocpi.core.utils import apply_partial_update
+from py_ocpi.modules.sessions.v_2_2_1.schemas import (
+    Session,
+    SessionPartialUpdate,
+)
+
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_modules.test_v_2_2_1.test_sessions.utils import (
+    AUTH_HEADERS,
+    EMSP_BASE_URL,
+    SESSIONS,
+)
+from tests.test_modules.utils import ClientAuthenticator
+
+
+def test_partial_update_merges_into_adapted_object():
+    data = copy.deepcopy(SESSIONS[0])
+    adapted = Session(**data)
+    adapt = MagicMock(return_value=adapted)
+    patch = SessionPartialUpdate(kwh=150, status="COMPLETED")
+
+    new_data = apply_partial_update(data, patch, adapt)
+
+    adapt.assert_called_once_with(data)
+    assert new_data == {**adapted.dict(), "kwh": 150, "status": "COMPLETED"}
+    # neither stored nor adapted data is changed
+    assert data["kwh"] == 100
+    assert adapted.kwh == 100
+
+
+def test_partial_update_skips_unset_fields():
+    data = copy.deepcopy(SESSIONS[0])
+    patch = SessionPartialUpdate(**{"kwh": 150, "currency": None})
+
+    new_data = apply_partial_update(data, patch, Session.parse_obj)
+
+    assert new_data["kwh"] == 150
+    assert new_data["currency"] == data["currency"]
+
+
+def test_partial_update_of_model_data():
+    session = Session(**SESSIONS[0])
+    patch = SessionPartialUpdate(kwh=150)
+
+    new_data = apply_partial_update(session, patch, lambda data: data)
+
+    assert new_data == {**session.dict(), "kwh": 150}
+    assert session.kwh == 100
+
+
+class SessionCrud(Crud):
+    stored: Any = None
+    updated: list = []
+
+    @classmethod
+    async def get(cls, module, role, id, *args, **kwargs):
+        return cls.stored
+
+    @classmethod
+    async def update(cls, module, role, data, id, *args, **kwargs):
+        cls.updated.append(data)
+        return data
+
+
+class ModelAdapter(BaseAdapter):
+    @classmethod
+    def session_adapter(cls, data, version=VersionNumber.latest):
+        if isinstance(data, Session):
+            return data
+        return super().session_adapter(data, version)
+
+
+def patch_session(stored: Any) -> dict:
+    SessionCrud.stored, SessionCrud.updated = stored, []
+    client = TestClient(
+        get_application(
+            version_numbers=[VersionNumber.v_2_2_1],
+            roles=[enums.RoleEnum.emsp],
+            crud=SessionCrud,
+            adapter=ModelAdapter,
+            authenticator=ClientAuthenticator,
+            modules=[enums.ModuleID.sessions],
+        )
+    )
+
+    response = client.patch(
+        f"{EMSP_BASE_URL}{settings.COUNTRY_CODE}/{settings.PARTY_ID}/"
+        f"{SESSIONS[0]['id']}",
+        json={"kwh": 150, "last_updated": "2022-01-03T00:00:00Z"},
+        headers=AUTH_HEADERS,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["status_code"] == 1000
+    return SessionCrud.updated[0]
+
+
+def test_partial_update_crud_update_gets_adapted_object():
+    stored_dict = copy.deepcopy(SESSIONS[0])
+    stored_model = Session(**SESSIONS[0])
+    last_updated = SessionPartialUpdate(
+        last_updated="2022-01-03T00:00:00Z"
+    ).last_updated
+
+    from_dict = patch_session(stored_dict)
+    from_model = patch_session(stored_model)
+
+    expected = {
+        **stored_model.dict(),
+        "kwh": 150,
+        "last_updated": last_updated,
+    }
+    assert from_dict == expected
+    assert from_model == expected
@@ -0,0 +1,447 @@
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from py_ocpi.modules.cdrs.v_2_2_1.schemas import Cdr
+from py_ocpi.modules.tariffs.v_2_1_1.schemas import Tariff as Tariff_2_1_1
+from py_ocpi.modules.tariffs.v_2_2_1.schemas import Tariff
+from py_ocpi.pricing import (
+    ChargingPeriods,
+    CdrReconciler,
+    CompiledTariff,
+    Discrepancy,
+    RunningCost,
+    RunningCosts,
+)
+
+from tests.test_modules.test_v_2_2_1.test_cdrs.utils import CDRS
+
+
+def get_tariff(elements: list, **kwargs) -> dict:
+    return {
+        "country_code": "us",
+        "party_id": "AAA",
+        "id": "TARIFF",
+        "currency": "EUR",
+        "elements": elements,
+        "last_updated": "2022-01-02T00:00:00Z",
+        **kwargs,
+    }
+
+
+def component(type_: str, price: float, step_size: int = 1, vat=None):
+    return {"type": type_, "price": price, "vat": vat, "step_size": step_size}
+
+
+def period(start: str, **volumes) -> dict:
+    return {
+        "start_date_time": start,
+        "dimensions": [
+            {"type": type_.upper(), "volume": volume}
+            for type_, volume in volumes.items()
+        ],
+    }
+
+
+def session(*periods: dict) -> dict:
+    start = periods[0]["start_date_time"] if periods else "2022-01-03T00:00:00Z"
+    return {"start_date_time": start, "charging_periods": list(periods)}
+
+
+def rate(tariff: dict, *sessions: dict, tz=None):
+    periods = ChargingPeriods.from_sessions(
+        sessions, **({"tz": tz} if tz else {})
+    )
+    return CompiledTariff(Tariff(**tariff)).rate(periods)
+
+
+def test_energy_with_vat():
+    tariff = get_tariff(
+        [{"price_components": [component("ENERGY", 0.25, vat=20)]}]
+    )
+
+    costs = rate(
+        tariff,
+        session(
+            period("2022-01-03T10:00:00Z", energy=10),
+            period("2022-01-03T11:00:00Z", energy=5.5),
+        ),
+    )
+
+    totals = costs.totals(0)
+    assert totals["total_energy"] == 15.5
+    assert totals["total_energy_cost"] == {"excl_vat": 3.875, "incl_vat": 4.65}
+    assert totals["total_cost"] == {"excl_vat": 3.875, "incl_vat": 4.65}
+
+
+@pytest.mark.parametrize(
+    "start, price",
+    [
+        # monday
+        ("2022-01-03T10:00:00Z", 2.0),
+        ("2022-01-03T19:00:00Z", 1.0),
+        # saturday
+        ("2022-01-08T10:00:00Z", 1.0),
+        # restriction spans over midnight
+        ("2022-01-04T01:00:00Z", 0.5),
+    ],
+)
+def test_time_of_day_and_day_of_week(start, price):
+    tariff = get_tariff(
+        [
+            {
+                "price_components": [component("TIME", 2.0)],
+                "restrictions": {
+                    "start_time": "09:00",
+                    "end_time": "18:00",
+                    "day_of_week": ["MONDAY", "TUESDAY", "WEDNESDAY"],
+                },
+            },
+            {
+                "price_components": [component("TIME", 0.5)],
+                "restrictions": {"start_time": "23:00", "end_time": "06:00"},
+            },
+            {"price_components": [component("TIME", 1.0)]},
+        ]
+    )
+
+    costs = rate(tariff, session(period(start, time=1)))
+
+    assert costs.totals(0)["total_time_cost"]["excl_vat"] == price
+
+
+def test_local_time_of_location():
+    tariff = get_tariff(
+        [
+            {
+                "price_components": [component("TIME", 2.0)],
+                "restrictions": {"start_time": "10:00", "end_time": "11:00"},
+            },
+            {"price_components": [component("TIME", 1.0)]},
+        ]
+    )
+    # 10:30 in Amsterdam, summer and winter time
+    summer = session(period("2022-07-04T08:30:00Z", time=1))
+    winter = session(period("2022-01-03T09:30:00Z", time=1))
+
+    costs = rate(tariff, summer, winter, tz=ZoneInfo("Europe/Amsterdam"))
+
+    assert costs.total_time_cost[0].tolist() == [2.0, 2.0]
+
+
+def test_step_size_of_last_element():
+    tariff = get_tariff(
+        [{"price_components": [component("PARKING_TIME", 1.2, 300)]}]
+    )
+
+    costs = rate(
+        tariff,
+        session(
+            period("2022-01-03T10:00:00Z", parking_time=0.05),
+            period("2022-01-03T10:03:00Z", parking_time=0.05),
+        ),
+    )
+
+    # 6 minutes are billed as 10
+    assert costs.totals(0)["total_parking_cost"]["excl_vat"] == 0.2
+    assert costs.totals(0)["total_parking_time"] == 0.1
+    assert costs.totals(0)["total_time"] == 0.1
+
+
+def test_energy_and_duration_restrictions():
+    tariff = get_tariff(
+        [
+            {
+                "price_components": [component("ENERGY", 0.3)],
+                "restrictions": {"max_kwh": 10},
+            },
+            {
+                "price_components": [component("PARKING_TIME", 6.0)],
+                "restrictions": {"min_duration": 7200},
+            },
+            {"price_components": [component("ENERGY", 0.2)]},
+        ]
+    )
+
+    costs = rate(
+        tariff,
+        session(
+            period("2022-01-03T10:00:00Z", energy=10),
+            period("2022-01-03T11:00:00Z", energy=5),
+            period("2022-01-03T12:00:00Z", parking_time=0.5),
+        ),
+    )
+
+    totals = costs.totals(0)
+    assert totals["total_energy_cost"]["excl_vat"] == 4.0
+    assert totals["total_parking_cost"]["excl_vat"] == 3.0
+
+
+def test_unknown_power_uses_unrestricted_element():
+    tariff = get_tariff(
+        [
+            {
+                "price_components": [component("ENERGY", 0.5)],
+                "restrictions": {"min_power": 50},
+            },
+            {"price_components": [component("ENERGY", 0.3)]},
+        ]
+    )
+
+    costs = rate(
+        tariff,
+        session(period("2022-01-03T10:00:00Z", energy=1, max_power=100)),
+        session(period("2022-01-03T10:00:00Z", energy=1)),
+    )
+
+    assert costs.total_energy_cost[0].tolist() == [0.5, 0.3]
+
+
+def test_flat_fee_and_price_limits():
+    tariff = get_tariff(
+        [
+            {
+                "price_components": [
+                    component("FLAT", 1.0, vat=10),
+                    component("ENERGY", 0.5, vat=10),
+                ]
+            }
+        ],
+        min_price={"excl_vat": 2.0, "incl_vat": 2.2},
+        max_price={"excl_vat": 10.0, "incl_vat": 11.0},
+    )
+
+    costs = rate(
+        tariff,
+        session(period("2022-01-03T10:00:00Z", energy=1)),
+        session(period("2022-01-03T10:00:00Z", energy=30)),
+        session(),
+    )
+
+    assert costs.totals(0)["total_fixed_cost"] == {
+        "excl_vat": 1.0,
+        "incl_vat": 1.1,
+    }
+    assert costs.totals(0)["total_cost"] == {"excl_vat": 2.0, "incl_vat": 2.2}
+    assert costs.totals(1)["total_cost"] == {"excl_vat": 10.0, "incl_vat": 11.0}
+    assert costs.totals(2)["total_fixed_cost"]["excl_vat"] == 0
+
+
+def test_tariff_2_1_1():
+    tariff = Tariff_2_1_1(
+        id="TARIFF",
+        currency="EUR",
+        elements=[
+            {
+                "price_components": [
+                    {"type": "TIME", "price": 2.0, "step_size": 60}
+                ],
+                "restrictions": {"day_of_week": ["MONDAY"]},
+            }
+        ],
+        last_updated="2022-01-02T00:00:00Z",
+    )
+    periods = ChargingPeriods.from_sessions(
+        [session(period("2022-01-03T10:00:00Z", time=1.5))]
+    )
+
+    costs = CompiledTariff(tariff).rate(periods)
+
+    assert costs.totals(0)["total_time_cost"]["excl_vat"] == 3.0
+
+
+def get_running_tariff() -> CompiledTariff:
+    return CompiledTariff(
+        Tariff(
+            **get_tariff(
+                [
+                    {
+                        "price_components": [
+                            component("FLAT", 1.0, vat=10),
+                            component("ENERGY", 0.3, 100, vat=10),
+                        ],
+                        "restrictions": {"max_kwh": 10},
+                    },
+                    {
+                        "price_components": [
+                            component("ENERGY", 0.2, 100, vat=10),
+                            component("TIME", 1.0, 300, vat=10),
+                        ]
+                    },
+                ]
+            )
+        )
+    )
+
+
+def get_running_periods(amount: int) -> list:
+    return [
+        period(f"2022-01-03T10:{minute:02}:00Z", energy=0.77, time=0.0166)
+        for minute in range(amount)
+    ]
+
+
+def test_running_cost_equals_rating_whole_session():
+    tariff = get_running_tariff()
+    periods = get_running_periods(20)
+    running = RunningCost(tariff, "2022-01-03T10:00:00Z")
+
+    for amount in (1, 2, 7, 8, 20):
+        costs = running.update(periods[:amount])
+        expected = tariff.rate(
+            ChargingPeriods.from_sessions([session(*periods[:amount])])
+        )
+        for name, value in expected.totals(0).items():
+            assert costs.totals(0)[name] == pytest.approx(value)
+    assert running.periods == 20
+
+
+def test_running_cost_rates_only_new_periods():
+    tariff = get_running_tariff()
+    periods = get_running_periods(3)
+    running = RunningCost(tariff, "2022-01-03T10:00:00Z")
+    running.update(periods[:2])
+
+    with patch.object(running, "rate", wraps=running.rate) as rate_period:
+        running.update(periods)
+
+    rate_period.assert_called_once_with(periods[2])
+
+
+def test_running_cost_starts_over_with_less_periods():
+    tariff = get_running_tariff()
+    periods = get_running_periods(5)
+    running = RunningCost(tariff, "2022-01-03T10:00:00Z")
+    running.update(periods)
+
+    costs = running.update(periods[:1])
+
+    assert running.periods == 1
+    assert costs.totals(0)["total_energy"] == 0.77
+
+
+def test_running_costs_of_sessions():
+    tariff = get_running_tariff()
+    running_costs = RunningCosts()
+    active = {
+        **session(*get_running_periods(2)),
+        "country_code": "us",
+        "party_id": "AAA",
+        "id": "SESSION",
+        "status": "ACTIVE",
+    }
+
+    first = running_costs.update(active, tariff)
+    second = running_costs.update(
+        {**active, "charging_periods": get_running_periods(3)}, tariff
+    )
+    assert len(running_costs) == 1
+    assert second.totals(0)["total_energy"] > first.totals(0)["total_energy"]
+
+    running_costs.update({**active, "status": "COMPLETED"}, tariff)
+    assert len(running_costs) == 0
+
+
+def get_cdr(id_: str, total_cost: float, **kwargs) -> dict:
+    return {
+        **CDRS[0],
+        "id": id_,
+        "tariffs": [
+            get_tariff(
+                [
+                    {
+                        "price_components": [
+                            component("ENERGY", 0.5, vat=10),
+                            component("TIME", 2.0, vat=10),
+                        ]
+                    }
+                ]
+            )
+        ],
+        "charging_periods": [
+            period("2022-01-02T00:00:00Z", energy=10, time=0.5, max_power=20),
+            period("2022-01-02T00:30:00Z", parking_time=0.25),
+        ],
+        "total_cost": {
+            "excl_vat": total_cost,
+            "incl_vat": round(total_cost * 1.1, 4),
+        },
+        "total_energy": 10,
+        "total_time": 0.75,
+        "total_parking_time": 0.25,
+        **kwargs,
+    }
+
+
+def test_reconcile_cdrs_in_chunks():
+    cdrs = [
+        Cdr(**get_cdr("CDR1", 6.0)),
+        get_cdr("CDR2", 6.0, total_energy_cost={"excl_vat": 5.0}),
+        get_cdr("CDR3", 7.0),
+        get_cdr("CDR4", 6.0, total_energy=11),
+        {**get_cdr("CDR5", 6.0, total_energy=11), "tariffs": []},
+    ]
+
+    report = CdrReconciler(chunk_size=2).reconcile(iter(cdrs))
+
+    assert report.checked == 5
+    assert report.mismatched == 3
+    assert report.unpriced == 1
+    assert report.fields == {
+        "total_cost.excl_vat": 1,
+        "total_cost.incl_vat": 1,
+        "total_energy": 2,
+    }
+    assert (
+        Discrepancy("CDR3", "total_cost.excl_vat", 7.0, 6.0)
+        in report.discrepancies
+    )
+    assert {item.cdr_id for item in report.discrepancies} == {
+        "CDR3",
+        "CDR4",
+        "CDR5",
+    }
+
+
+def test_reconcile_keeps_first_discrepancies():
+    cdrs = (get_cdr(f"CDR{index}", 1.0) for index in range(10))
+
+    report = CdrReconciler(max_discrepancies=3).reconcile(cdrs)
+
+    assert report.mismatched == 10
+    assert report.fields["total_cost.excl_vat"] == 10
+    assert len(report.discrepancies) == 3
+    assert report.dict()["checked"] == 10
+
+
+def test_reconcile_tariff_of_charging_periods_and_reservation():
+    cdr = get_cdr("CDR", 7.0, total_reservation_cost={"excl_vat": 1.0})
+    other = {**cdr["tariffs"][0], "id": "OTHER", "elements": []}
+    cdr["tariffs"] = [other, cdr["tariffs"][0]]
+    cdr["charging_periods"][0]["tariff_id"] = "TARIFF"
+
+    report = CdrReconciler().reconcile([cdr])
+
+    assert report.fields == {"total_cost.incl_vat": 1}
+
+
+def test_reconcile_total_time_of_energy_only_cdr():
+    tariff = get_tariff(
+        [{"price_components": [component("ENERGY", 0.5, vat=10)]}]
+    )
+    cdr = get_cdr(
+        "CDR",
+        5.0,
+        start_date_time="2022-01-02T00:00:00Z",
+        end_date_time="2022-01-02T01:00:00Z",
+        tariffs=[tariff],
+        charging_periods=[period("2022-01-02T00:00:00Z", energy=10)],
+        total_time=1.0,
+        total_parking_time=None,
+    )
+
+    assert CdrReconciler().reconcile([cdr]).mismatched == 0
+    assert CdrReconciler().reconcile([{**cdr, "total_time": 2.0}]).fields == {
+        "total_time": 1
+    }
@@ -0,0 +1,249 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from py_ocpi.core.crud import Crud
+from py_ocpi.core.enums import ModuleID
+from py_ocpi.core.exceptions import PullError
+from py_ocpi.core.pull import PageDecoder, PullClient, PullWatermarks
+from py_ocpi.core.utils import encode_string_base64
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_modules.test_v_2_2_1.test_locations.utils import LOCATIONS
+
+URL = "https://cpo.example.com/ocpi/2.2.1/locations/"
+OBJECTS = [
+    {**LOCATIONS[0], "id": str(index), "name": "ÄÖÜ ✓"} for index in range(7)
+]
+
+
+class PullCrud(Crud):
+    batches: list = []
+
+    @classmethod
+    async def bulk_upsert(cls, module, role, data, *args, **kwargs):
+        cls.batches.append(data)
+        return {
+            index: "rejected"
+            for index, location in enumerate(data)
+            if location["id"] == "rejected"
+        }
+
+
+class Partner:
+    """List endpoint of the other party returning 2 objects per page."""
+
+    def __init__(self, objects: list, total: bool = True) -> None:
+        self.objects = objects
+        self.total = total
+        self.requests: list = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_offset = None
+        self.fail_status_offset = None
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        offset = int(request.url.params["offset"])
+        limit = min(int(request.url.params["limit"]), 2)
+        if offset == self.fail_offset:
+            return httpx.Response(500, text="error")
+        status_code = 1000
+        if offset == self.fail_status_offset:
+            status_code = 2001
+        headers = {}
+        if self.total:
+            headers["X-Total-Count"] = str(len(self.objects))
+        if offset + limit < len(self.objects):
+            next_offset = offset + limit
+            headers[
+                "Link"
+            ] = f'<{URL}?offset={next_offset}&limit={limit}>; rel="next"'
+        return httpx.Response(
+            200,
+            json={
+                "data": self.objects[offset:][:limit],
+                "status_code": status_code,
+                "status_message": "Generic success code",
+                "timestamp": "2022-01-02T00:00:00Z",
+            },
+            headers=headers,
+        )
+
+    def client(self) -> PullClient:
+        return PullClient(
+            http_client=httpx.AsyncClient(
+                transport=httpx.MockTransport(self.handle)
+            ),
+            page_limit=10,
+            concurrency=2,
+            batch_size=3,
+        )
+
+
+@pytest.fixture(autouse=True)
+def clear_batches():
+    PullCrud.batches = []
+
+
+def pull(client: PullClient, **kwargs):
+    return asyncio.run(
+        client.pull(
+            URL,
+            "token",
+            ModuleID.locations,
+            VersionNumber.v_2_2_1,
+            PullCrud,
+            **kwargs,
+        )
+    )
+
+
+def test_pull_pages_planned_from_total():
+    partner = Partner(OBJECTS)
+    client = partner.client()
+
+    result = pull(client)
+
+    assert result.received == result.stored == 7
+    assert result.pages == 4
+    assert sorted(
+        int(request.url.params["offset"]) for request in partner.requests
+    ) == [0, 2, 4, 6]
+    assert partner.max_in_flight == 2
+    assert sorted(
+        item["id"] for batch in PullCrud.batches for item in batch
+    ) == [item["id"] for item in OBJECTS]
+    assert max(len(batch) for batch in PullCrud.batches) == 3
+    assert partner.requests[0].headers["Authorization"] == (
+        f"Token {encode_string_base64('token')}"
+    )
+
+
+def test_pull_incremental_since_previous_pull():
+    partner = Partner(OBJECTS)
+    client = partner.client()
+
+    first = pull(client)
+    first_request = partner.requests[0]
+    partner.requests = []
+    pull(client)
+    second_request = partner.requests[0]
+    pull(client, incremental=False)
+
+    assert "date_from" not in first_request.url.params
+    assert first_request.url.params["date_to"] == first.date_to
+    assert second_request.url.params["date_from"] == first.date_to
+    assert "date_from" not in partner.requests[-1].url.params
+
+
+def test_pull_follows_link_without_total():
+    partner = Partner(OBJECTS, total=False)
+
+    result = pull(partner.client())
+
+    assert result.received == 7
+    assert [request.url.params["offset"] for request in partner.requests] == [
+        "0",
+        "2",
+        "4",
+        "6",
+    ]
+    assert partner.max_in_flight == 1
+
+
+def test_pull_failure_keeps_watermark():
+    partner = Partner(OBJECTS)
+    partner.fail_offset = 4
+    watermarks = PullWatermarks()
+    client = partner.client()
+    client.watermarks = watermarks
+
+    with pytest.raises(PullError):
+        pull(client)
+
+    assert asyncio.run(watermarks.get(URL, ModuleID.locations)) is None
+
+
+def test_pull_objects_not_stored():
+    partner = Partner([*OBJECTS, {**OBJECTS[0], "id": "rejected"}])
+
+    result = pull(partner.client())
+
+    assert result.received == 8
+    assert result.stored == 7
+    assert result.errors == {"rejected": "rejected"}
+    assert result.date_to is None
+
+
+def test_pull_invalid_objects_not_stored():
+    partner = Partner([*OBJECTS, {"id": "invalid", "name": "name"}])
+
+    result = pull(partner.client())
+
+    assert result.received == 8
+    assert result.stored == 7
+    assert "country_code: field required" in result.errors["invalid"]
+    assert "invalid" not in [
+        item["id"] for batch in PullCrud.batches for item in batch
+    ]
+    assert result.date_to is None
+
+
+def test_pull_objects_of_failed_page_not_stored():
+    partner = Partner(OBJECTS, total=False)
+    partner.fail_status_offset = 2
+    client = partner.client()
+    client.batch_size = 1
+
+    with pytest.raises(PullError):
+        pull(client)
+
+    assert [item["id"] for batch in PullCrud.batches for item in batch] == [
+        "0",
+        "1",
+    ]
+
+
+def test_page_decoder_byte_by_byte():
+    body = json.dumps(
+        {
+            "status_message": "ok",
+            "data": OBJECTS,
+            "status_code": 1000,
+            "timestamp": "2022-01-02T00:00:00Z",
+        },
+        ensure_ascii=False,
+        indent=1,
+    ).encode()
+    decoder = PageDecoder()
+
+    items = []
+    for byte in body:
+        items.extend(decoder.feed(bytes([byte])))
+    items.extend(decoder.close())
+
+    assert items == OBJECTS
+    assert decoder.envelope == {
+        "status_message": "ok",
+        "status_code": 1000,
+        "timestamp": "2022-01-02T00:00:00Z",
+    }
+
+
+@pytest.mark.parametrize(
+    "body", [b'{"data": [{"id": "1"}', b'{"data": [}', b"[1, 2]"]
+)
+def test_page_decoder_invalid_response(body):
+    decoder = PageDecoder()
+
+    with pytest.raises(ValueError):
+        decoder.feed(body)
+        decoder.close()
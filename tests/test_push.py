@@ -1,14 +1,19 @@
+import asyncio
 from uuid import uuid4
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 from fastapi.testclient import TestClient
 
 from py_ocpi import get_application
 from py_ocpi.core import enums, schemas
+from py_ocpi.core.config import settings
+from py_ocpi.core.push import push_object
+from py_ocpi.core.dependencies import get_http_client
 from py_ocpi.modules.locations.v_2_2_1.schemas import Location
 from py_ocpi.modules.versions.enums import VersionNumber
 from tests.test_modules.mocks.async_client import (
-    MockAsyncClientGeneratorVersionsAndEndpoints,
+    MockAsyncClientVersionsAndEndpoints,
 )
 
 from tests.test_modules.utils import (
@@ -190,11 +195,7 @@ LOCATIONS = [
 ]
 
 
-@patch(
-    "py_ocpi.core.push.httpx.AsyncClient",
-    side_effect=MockAsyncClientGeneratorVersionsAndEndpoints,
-)
-def test_push(async_client):
+def test_push():
     crud = AsyncMock()
     adapter = MagicMock()
 
@@ -210,6 +211,9 @@ def test_push(async_client):
         modules=[],
         http_push=True,
     )
+    app.dependency_overrides[
+        get_http_client
+    ] = lambda: MockAsyncClientVersionsAndEndpoints
 
     client = TestClient(app)
     data = schemas.Push(
@@ -229,3 +233,81 @@ def test_push(async_client):
 
     crud.get.assert_awaited_once()
     adapter.location_adapter.assert_called_once()
+
+
+def get_push_client(delays: dict, active: dict) -> httpx.AsyncClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active["current"] += 1
+        active["max"] = max(active["max"], active["current"])
+        try:
+            if host == "broken.com":
+                raise httpx.ConnectError("Connection refused")
+            await asyncio.sleep(delays.get(host, 0))
+            if request.method == "GET":
+                return httpx.Response(
+                    200,
+                    json={
+                        "data": {
+                            "endpoints": [
+                                {
+                                    "identifier": "locations",
+                                    "role": "RECEIVER",
+                                    "url": f"http://{host}/locations/",
+                                }
+                            ]
+                        }
+                    },
+                )
+            return httpx.Response(200, json={"host": host})
+        finally:
+            active["current"] -= 1
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_push_object_concurrent_receivers(monkeypatch):
+    monkeypatch.setattr(settings, "PUSH_CONCURRENCY", 2)
+    monkeypatch.setattr(settings, "PUSH_RECEIVER_TIMEOUT", 0.5)
+    crud = AsyncMock()
+    crud.get.return_value = LOCATIONS[0]
+    adapter = MagicMock()
+    adapter.location_adapter.return_value = Location(**LOCATIONS[0])
+    active = {"current": 0, "max": 0}
+    http_client = get_push_client({"slow.com": 2}, active)
+    hosts = ["a.com", "slow.com", "b.com", "broken.com", "c.com"]
+    push = schemas.Push(
+        module_id=enums.ModuleID.locations,
+        object_id="1",
+        receivers=[
+            schemas.Receiver(
+                endpoints_url=f"http://{host}/details", auth_token="token"
+            )
+            for host in hosts
+        ],
+    )
+
+    result = asyncio.run(
+        push_object(
+            VersionNumber.v_2_2_1,
+            push,
+            crud,
+            adapter,
+            http_client=http_client,
+        )
+    )
+
+    crud.get.assert_awaited_once()
+    adapter.location_adapter.assert_called_once()
+    assert active["max"] <= 2
+    assert [
+        response.endpoints_url for response in result.receiver_responses
+    ] == [f"http://{host}/details" for host in hosts]
+    assert [response.status_code for response in result.receiver_responses] == [
+        200,
+        504,
+        200,
+        502,
+        200,
+    ]
+    assert result.receiver_responses[0].response == {"host": "a.com"}
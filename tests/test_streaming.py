@@ -0,0 +1,111 @@
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+
+from py_ocpi import get_application
+from py_ocpi.core import enums
+from py_ocpi.core.crud import Crud
+from py_ocpi.modules.locations.v_2_2_1.schemas import Location
+from py_ocpi.modules.versions.enums import VersionNumber
+
+from tests.test_modules.utils import ClientAuthenticator, ENCODED_AUTH_TOKEN
+from tests.test_push import LOCATIONS
+
+
+class StreamingCrud(Crud):
+    @classmethod
+    async def list(cls, module, role, filters, *args, **kwargs):
+        return LOCATIONS * 3, 10, False
+
+    @classmethod
+    async def list_iter(cls, module, role, filters, *args, **kwargs):
+        async def iterate():
+            for data in LOCATIONS * 3:
+                yield data
+
+        return iterate(), 10, False
+
+
+def get_client(list_streaming: bool, crud=StreamingCrud) -> TestClient:
+    adapter = MagicMock()
+    adapter.location_adapter.side_effect = lambda data: Location(**data)
+
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=crud,
+        adapter=adapter,
+        authenticator=ClientAuthenticator,
+        modules=[enums.ModuleID.locations],
+        list_streaming=list_streaming,
+    )
+    return TestClient(app)
+
+
+def get_locations(client: TestClient):
+    return client.get(
+        "/ocpi/cpo/2.2.1/locations",
+        params={"limit": 3},
+        headers={"Authorization": f"Token {ENCODED_AUTH_TOKEN}"},
+    )
+
+
+def test_streaming_list_matches_default_response():
+    default, streamed = (
+        get_locations(get_client(list_streaming))
+        for list_streaming in (False, True)
+    )
+    default_json, streamed_json = default.json(), streamed.json()
+    default_json.pop("timestamp")
+    streamed_json.pop("timestamp")
+
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"] == "application/json"
+    assert len(streamed_json["data"]) == 3
+    assert streamed_json == default_json
+    for header in ("Link", "X-Total-Count", "X-Limit"):
+        assert streamed.headers[header] == default.headers[header]
+    assert streamed.headers["X-Total-Count"] == "10"
+    assert "offset=3" in streamed.headers["Link"]
+
+
+def test_streaming_list_default_list_iter():
+    class ListCrud(Crud):
+        list = StreamingCrud.list
+
+    response = get_locations(get_client(True, ListCrud))
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 3
+    assert response.json()["status_code"] == 1000
+
+
+def test_streaming_list_crud_without_list_iter():
+    class DuckCrud:
+        list = StreamingCrud.list
+
+    response = get_locations(get_client(True, DuckCrud))
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 3
+
+
+def test_streaming_list_cursor_pagination():
+    adapter = MagicMock()
+    adapter.location_adapter.side_effect = lambda data: Location(**data)
+    app = get_application(
+        version_numbers=[VersionNumber.v_2_2_1],
+        roles=[enums.RoleEnum.cpo],
+        crud=StreamingCrud,
+        adapter=adapter,
+        authenticator=ClientAuthenticator,
+        modules=[enums.ModuleID.locations],
+        list_streaming=True,
+        pagination_mode=enums.PaginationMode.cursor,
+    )
+
+    response = get_locations(TestClient(app))
+
+    assert len(response.json()["data"]) == 3
+    assert "cursor=" in response.headers["Link"]
+    assert "offset" not in response.headers["Link"]